@@ -1,15 +1,22 @@
-import sublime, sublime_plugin, re, json
+import sublime, sublime_plugin, copy, json, time
 from os import path
 from .lib.interpreters import *
 from .lib.interpreter.SImport import SImport
-from .lib.interpreter.Interpreted import Interpreted
 from .lib.interpreter.PendingImport import PendingImport
 from .lib.interpreters import __all__ as InterpretersNames
 from .lib.SIMode import SIMode
+from .lib.utils import orderEdits
+from .lib.ProjectSettings import ProjectSettings
+from .lib.index import FileIndex, ModuleCache, Profiler, SearchToken, Stats, WorkerPool
 
 class SimpleImportCommand(sublime_plugin.TextCommand):
-  SETTINGS_FILE = ".simple-import.json"
+  SETTINGS_FILE = ProjectSettings.FILE_NAME
   interpreters = {}
+  # view id -> ((change count, syntax), [(begin, end, text)])
+  imports_cache = {}
+  settings_cache = {}
+  # The search still running, of any view
+  search_token = None
 
   @staticmethod
   def loadInterpreters():
@@ -37,30 +44,18 @@ class SimpleImportCommand(sublime_plugin.TextCommand):
     elif panel_mode:
       self.mode = SIMode.PANEL_MODE
 
-    # paths
-    self.view_path = path.dirname(self.view.file_name())
-    self.project_path = self.getProjectFolder()
-    self.view_dir_relpath = path.relpath(self.view_path, self.project_path)
-    self.view_filename = path.basename(self.view.file_name())
-    self.view_relpath = path.join(self.view_dir_relpath, self.view_filename)
-    view_syntax = path.basename(self.view.settings().get('syntax')).lower()
-
-    self.interpreter = SimpleImportCommand.getInterpreter(
-      view_syntax,
-      self.view_filename
-    )
-
-    if not self.interpreter:
-      print("Simple import does not support '.{0}' syntax yet".format(view_syntax))
-      return
-
-    self.loadSettings()
+    Stats.start()
+    with Stats.timer("prepare"):
+      if not self.prepare():
+        return
 
     selections = self.view.sel()
-    self.view_imports = self.findAllImports()
+    with Stats.timer("find_imports"):
+      self.view_imports = self.findAllImports()
     self.interpreted_list = []
     self.pending_imports = []
     self.imports_to_insert = []
+    queries = []
 
     for selection in selections:
       if selection.end() == selection.begin():
@@ -84,40 +79,180 @@ class SimpleImportCommand(sublime_plugin.TextCommand):
 
       interpreted = self.interpreter.interprete(simport, mode=self.mode)
       self.interpreted_list.append(interpreted)
-      pending_import = None
 
       if self.isPanelMode():
-        pending_import = PendingImport(
-          interpreted,
-          self.interpreter.findByValue(
-            '',
-            self.project_path,
-            omit_files=[path.join(self.view_relpath)]
-          )
-        )
+        queries.append((interpreted, ''))
+        break
+
+      queryValue = self.interpreter.getQueryValue(interpreted)
+
+      if queryValue != False:
+        queries.append((interpreted, queryValue))
 
-        self.view.window().show_quick_panel(
-          pending_import.getOptionsAsList(),
-          self.onOptionSelected
+    if not queries:
+      return
+
+    self.startSearch(queries)
+
+  def prepare(self):
+    # paths
+    self.view_path = path.dirname(self.view.file_name())
+    self.project_path = self.getProjectFolder()
+    self.view_dir_relpath = path.relpath(self.view_path, self.project_path)
+    self.view_filename = path.basename(self.view.file_name())
+    self.view_relpath = path.join(self.view_dir_relpath, self.view_filename)
+    view_syntax = path.basename(self.view.settings().get('syntax')).lower()
+
+    interpreter = SimpleImportCommand.getInterpreter(
+      view_syntax,
+      self.view_filename
+    )
+
+    if not interpreter:
+      print("Simple import does not support '.{0}' syntax yet".format(view_syntax))
+      return False
+
+    # Interpreters are shared by every view. Each invocation sets the
+    # settings of its view on a copy, which the search in the background
+    # and the options chosen later keep using
+    self.interpreter = copy.copy(interpreter)
+
+    self.loadSettings()
+    return True
+
+  def startSearch(self, queries):
+    # Search on a worker so the UI stays responsive. A newer invocation,
+    # in any view, cancels the search that is still running
+    if SimpleImportCommand.search_token:
+      SimpleImportCommand.search_token.cancel()
+
+    token = SearchToken(self.interpreter.getSetting("search_time_budget", 0))
+    SimpleImportCommand.search_token = token
+    self.search_token = token
+    # The profiler goes along with this search, so a newer search can not
+    # drop it
+    profiler = Profiler.start(self.interpreter.getSetting("profile", False))
+    self.view.set_status("simple_import", "Simple Import: searching...")
+    change_count = self.view.change_count()
+
+    sublime.set_timeout_async(
+      lambda: self.profile(
+        profiler,
+        self.search,
+        token,
+        profiler,
+        change_count,
+        queries
+      ),
+      0
+    )
+
+  def profile(self, profiler, fn, *args):
+    if profiler:
+      return profiler.runcall(fn, *args)
+    return fn(*args)
+
+  def saveProfile(self, profiler, query_values, cancelled=False):
+    if not profiler or not ModuleCache.cache_dir:
+      return
+
+    prof_path = profiler.save(
+      ModuleCache.cache_dir,
+      self.project_path,
+      ", ".join(query_values),
+      self.interpreter.syntax,
+      self.interpreter.getSetting("profile_top", Profiler.TOP)
+    )
+    if prof_path:
+      message = "profile {0}written to {1}".format(
+        "of a cancelled search " if cancelled else "",
+        prof_path
+      )
+      print("SimpleImport: " + message)
+      sublime.status_message("Simple Import: " + message)
+
+  def finishProfile(self):
+    # Saves the profile of the invocation whose options were chosen
+    profiler, self.profiler = getattr(self, "profiler", None), None
+    if profiler:
+      self.saveProfile(profiler, self.query_values)
+
+  def search(self, token, profiler, change_count, queries):
+    pending_imports = None
+    try:
+      # Every selection is resolved in the same pass
+      with Stats.timer("search"):
+        results = self.interpreter.findByValues(
+          [ queryValue for interpreted, queryValue in queries ],
+          self.project_path,
+          omit_files=[path.join(self.view_relpath)],
+          token=token
         )
-      else:
-        queryValue = self.interpreter.getQueryValue(interpreted)
-
-        if queryValue != False:
-          pending_import = PendingImport(
-            interpreted,
-            self.interpreter.findByValue(
-              queryValue,
-              self.project_path,
-              omit_files=[path.join(self.view_relpath)]
-            )
-          )
 
-      if pending_import:
-        self.pending_imports.append(pending_import)
+      pending_imports = [
+        PendingImport(interpreted, results[queryValue])
+        for interpreted, queryValue in queries
+      ]
+    finally:
+      sublime.set_timeout(
+        lambda: self.onSearchDone(
+          token,
+          profiler,
+          change_count,
+          queries,
+          pending_imports
+        ),
+        0
+      )
+
+  def onSearchDone(self, token, profiler, change_count, queries, pending_imports):
+    query_values = [ queryValue for interpreted, queryValue in queries ]
 
-      if self.isPanelMode():
-        return
+    if token is not SimpleImportCommand.search_token or token.cancelled:
+      # A newer search replaced this one. It may be of another view
+      if token is self.search_token:
+        self.view.erase_status("simple_import")
+      self.saveProfile(profiler, query_values, cancelled=True)
+      return
+
+    self.view.erase_status("simple_import")
+
+    if pending_imports is None:
+      self.saveProfile(profiler, query_values)
+      return
+
+    if self.view.change_count() != change_count:
+      sublime.status_message(
+        "Simple Import: the file changed while searching, run it again"
+      )
+      self.saveProfile(profiler, query_values)
+      return
+
+    if token.isExpired():
+      sublime.status_message(
+        "Simple Import: search time budget exceeded, results may be incomplete"
+      )
+
+    # The time spent choosing options is not part of the total
+    Stats.mark("total")
+    self.choosing_since = time.perf_counter()
+
+    # Choosing and inserting are profiled with the search. An invocation
+    # whose options were never chosen is saved as it is
+    self.finishProfile()
+    self.profiler = profiler
+    self.query_values = query_values
+
+    self.pending_imports = pending_imports
+    self.choosePendingImports()
+
+  def choosePendingImports(self):
+    if self.isPanelMode():
+      self.view.window().show_quick_panel(
+        self.pending_imports[0].getOptionsAsList(),
+        self.onOptionSelected
+      )
+      return
 
     for pending_import in self.pending_imports:
       options_arr = pending_import.getOptionsAsList(include_keys=True)
@@ -153,54 +288,81 @@ class SimpleImportCommand(sublime_plugin.TextCommand):
         break
 
     if False not in [ pending.resolved for pending in self.pending_imports ]:
-      self.onPendingImportsResolved()
+      self.profile(self.profiler, self.onPendingImportsResolved)
+      self.finishProfile()
 
   def onPendingImportsResolved(self):
-    for interpreted in self.interpreted_list:
-      resolved = self.interpreter.parseBeforeInsert(
-        interpreted,
-        self.view_imports,
-        mode=self.mode
-      )
-
-      if isinstance(resolved, list):
-        for vimport in resolved:
-          if vimport not in self.imports_to_insert:
-            self.imports_to_insert.append(vimport)
-      elif resolved not in self.imports_to_insert:
-        self.imports_to_insert.append(resolved)
+    Stats.add("choose", time.perf_counter() - self.choosing_since)
 
-    for interpreted in self.imports_to_insert:
-      self.handleInsertion(interpreted)
+    with Stats.timer("insert"), Stats.timer("total"):
+      for interpreted in self.interpreter.mergeInterpreted(
+        self.interpreted_list,
+        mode=self.mode
+      ):
+        resolved = self.interpreter.parseBeforeInsert(
+          interpreted,
+          self.view_imports,
+          mode=self.mode
+        )
 
-  def handleInsertion(self, interpreted):
-    if interpreted.insert_type == Interpreted.IT_INSERT:
-      self.view.run_command("insert_at", {
-        "characters": interpreted.__str__()
-      })
-    else:
-      self.view.run_command("replace", {
-        "characters": interpreted.__str__(),
-        "start": interpreted.simport.region.begin(),
-        "end": interpreted.simport.region.end()
+        if isinstance(resolved, list):
+          for vimport in resolved:
+            if vimport not in self.imports_to_insert:
+              self.imports_to_insert.append(vimport)
+        elif resolved not in self.imports_to_insert:
+          self.imports_to_insert.append(resolved)
+
+      # A single command applies every edit: one undo step
+      self.view.run_command("simple_import_apply_edits", {
+        "edits": [
+          interpreted.getEdit() for interpreted in self.imports_to_insert
+        ]
       })
 
+    Stats.finish(
+      {
+        "project": self.project_path,
+        "query": ", ".join(self.query_values),
+        "interpreter": self.interpreter.syntax
+      },
+      self.interpreter.getSetting("slow_query_threshold", 0)
+    )
+
   def findAllImports(self):
     if not self.interpreter.find_imports_regex:
       return []
 
-    regions = self.view.find_all(self.interpreter.find_imports_regex)
+    # Parsed imports are kept until the view changes. Interpreted imports
+    # are rebuilt every time since inserting modifies them
+    key = (self.view.change_count(), self.interpreter.syntax)
+    cached = SimpleImportCommand.imports_cache.get(self.view.id())
+
+    if cached and cached[0] == key:
+      imports = cached[1]
+    elif self.interpreter.find_imports_skip_regex:
+      imports = self.interpreter.findImportsInHeader(
+        lambda size: self.view.substr(sublime.Region(0, size)),
+        self.view.size()
+      )
+    else:
+      imports = [
+        (region.begin(), region.end(), self.view.substr(region))
+        for region in self.view.find_all(self.interpreter.find_imports_regex)
+      ]
+
+    SimpleImportCommand.imports_cache[self.view.id()] = (key, imports)
+
     return [
       self.interpreter.interprete(
         SImport(
-          self.view.substr(region),
-          self.view.substr(region),
-          region,
-          region
+          text,
+          text,
+          sublime.Region(begin, end),
+          sublime.Region(begin, end)
         ),
         mode=self.mode
       )
-      for region in regions
+      for begin, end, text in imports
     ]
 
   def isPanelMode(self):
@@ -214,37 +376,57 @@ class SimpleImportCommand(sublime_plugin.TextCommand):
     return folders[0]
 
   def getProjectSettings(self):
-    SETTINGS_FILE = SimpleImportCommand.SETTINGS_FILE
-
-    if path.isfile(path.join(self.project_path, SETTINGS_FILE)):
-      with open(path.join(self.project_path, SETTINGS_FILE)) as raw_json:
-        try:
-          settings_json = json.load(raw_json)
-          if self.interpreter.syntax in settings_json:
-            settings = settings_json[self.interpreter.syntax]
-            if "$path" in settings:
-              settings_on_file = {}
-              for match in settings["$path"]:
-                if len(match) == 1:
-                  settings_on_file.update(match[0])
-                else:
-                  pattern = '|'.join(match[:-1])
-                  if re.search("^{0}".format(pattern), self.view_relpath):
-                    settings_on_file.update(match[-1])
-              return settings_on_file
-            else:
-              return settings_json[self.interpreter.syntax]
-        except ValueError:
-          print("Failed to load .simple-import.json at {0}".format(self.project_path))
+    return ProjectSettings.get(self.project_path).getSettings(
+      self.interpreter.syntax,
+      self.view_relpath
+    )
 
   def loadSettings(self):
-    settings = {}
-
     view_settings = self.view.settings().get("simple-import")
     if view_settings and self.interpreter.syntax in view_settings:
-      settings.update(view_settings[self.interpreter.syntax])
+      view_settings = view_settings[self.interpreter.syntax]
+    else:
+      view_settings = None
 
     project_settings = self.getProjectSettings()
+    settings_version = ProjectSettings.get(self.project_path).version
+    rulers = self.view.settings().get("rulers") or []
+    # Folders and files hidden in the sidebar are not searched either
+    exclude_patterns = dict(
+      (name, self.view.settings().get(name) or [])
+      for name in ["folder_exclude_patterns", "file_exclude_patterns"]
+    )
+
+    # Merged settings are reused while none of their sources change
+    key = (
+      self.interpreter.syntax,
+      self.project_path,
+      self.view_relpath,
+      settings_version,
+      json.dumps(view_settings, sort_keys=True),
+      json.dumps(rulers),
+      json.dumps(exclude_patterns, sort_keys=True)
+    )
+
+    if key not in SimpleImportCommand.settings_cache:
+      if len(SimpleImportCommand.settings_cache) > 256:
+        SimpleImportCommand.settings_cache = {}
+
+      SimpleImportCommand.settings_cache[key] = self.mergeSettings(
+        view_settings,
+        project_settings,
+        rulers,
+        exclude_patterns
+      )
+
+    self.interpreter.setSettings(SimpleImportCommand.settings_cache[key])
+
+  def mergeSettings(self, view_settings, project_settings, rulers, exclude_patterns=None):
+    settings = {}
+
+    if view_settings:
+      settings.update(view_settings)
+
     if project_settings:
       settings.update(project_settings)
 
@@ -253,7 +435,8 @@ class SimpleImportCommand(sublime_plugin.TextCommand):
     obj = self.interpreter.settings.copy()
     obj.update(settings)
 
-    rulers = self.view.settings().get("rulers") or []
+    for name, patterns in (exclude_patterns or {}).items():
+      obj.setdefault(name, patterns)
 
     # Find the smallest ruler
     for x in rulers:
@@ -263,7 +446,83 @@ class SimpleImportCommand(sublime_plugin.TextCommand):
       else:
         obj['ruler'] = x
 
-    self.interpreter.setSettings(obj)
+    return obj
+
+class SimpleImportMissingCommand(SimpleImportCommand):
+  # Imports every name the file uses without declaring or importing it.
+  # All of them are searched at once and only the ambiguous ones prompt
+  def run(self, edit):
+    self.mode = SIMode.PUSH_MODE
+
+    Stats.start()
+    with Stats.timer("prepare"):
+      if not self.prepare():
+        return
+
+    with Stats.timer("find_imports"):
+      self.view_imports = self.findAllImports()
+    self.interpreted_list = []
+    self.pending_imports = []
+    self.imports_to_insert = []
+    queries = []
+
+    with Stats.timer("find_missing"):
+      identifiers = self.interpreter.findMissingIdentifiers(
+        self.view.substr(sublime.Region(0, self.view.size()))
+      )
+
+    for identifier in identifiers:
+      region = sublime.Region(0, len(identifier))
+      interpreted = self.interpreter.interprete(
+        SImport(identifier, identifier, region, region),
+        mode=self.mode
+      )
+      queryValue = self.interpreter.getQueryValue(interpreted)
+
+      if queryValue != False:
+        self.interpreted_list.append(interpreted)
+        queries.append((interpreted, queryValue))
+
+    if not queries:
+      sublime.status_message("Simple Import: no missing imports found")
+      return
+
+    self.startSearch(queries)
+
+  def choosePendingImports(self):
+    # Names nothing matches are left alone
+    self.pending_imports = [
+      pending_import for pending_import in self.pending_imports
+        if pending_import.getOptionsAsList()
+    ]
+    self.interpreted_list = [
+      pending_import.interpreted for pending_import in self.pending_imports
+    ]
+
+    if not self.pending_imports:
+      sublime.status_message("Simple Import: no missing imports found")
+      self.finishProfile()
+      return
+
+    self.chooseNext()
+
+  def chooseNext(self):
+    # onOptionSelected resolves the first pending import left, so they are
+    # chosen in order. The ones with a single option are taken right away
+    for pending_import in self.pending_imports:
+      if pending_import.resolved:
+        continue
+
+      options = pending_import.getOptionsAsList(include_keys=True)
+      if len(options) > 1:
+        self.view.window().show_quick_panel(options, self.onChosen)
+        return
+
+      self.onOptionSelected(0)
+
+  def onChosen(self, index):
+    self.onOptionSelected(index)
+    self.chooseNext()
 
 class ReplaceCommand(sublime_plugin.TextCommand):
   def run(self, edit, characters, start=0, end=False):
@@ -275,4 +534,101 @@ class InsertAtCommand(sublime_plugin.TextCommand):
   def run(self, edit, characters, start=0):
     self.view.insert(edit, start, characters)
 
+class SimpleImportApplyEditsCommand(sublime_plugin.TextCommand):
+  def run(self, edit, edits):
+    for start, end, characters in orderEdits(edits, self.view.size()):
+      self.view.replace(edit, sublime.Region(start, end), characters)
+
+class SimpleImportCacheStatsCommand(sublime_plugin.WindowCommand):
+  def run(self):
+    stats = JavascriptInterpreter.cachedModules.stats()
+    lines = [
+      "Simple Import module cache: {0} modules, {1:.1f} KB".format(
+        stats["entries"],
+        stats["size"] / 1024.0
+      ),
+      "Budget: {0} modules, {1:.1f} KB".format(
+        stats["max_entries"] or "unlimited",
+        (stats["max_size"] or 0) / 1024.0
+      ),
+      ""
+    ]
+
+    for project in stats["projects"]:
+      lines.append("{0}: {1} modules, {2:.1f} KB".format(
+        project["project"],
+        project["entries"],
+        project["size"] / 1024.0
+      ))
+
+    panel = self.window.create_output_panel("simple_import_cache_stats")
+    panel.run_command("append", { "characters": "\n".join(lines) + "\n" })
+    self.window.run_command("show_panel", {
+      "panel": "output.simple_import_cache_stats"
+    })
+
+class SimpleImportStatsCommand(sublime_plugin.WindowCommand):
+  def run(self):
+    report = Stats.report()
+    lines = [
+      "Simple Import: {0} invocations, percentiles of the last {1}".format(
+        report["invocations"],
+        Stats.HISTORY_SIZE
+      ),
+      "",
+      "{0:<20}{1:>10}{2:>10}{3:>10}".format("Phase (ms)", "last", "p50", "p95")
+    ]
+
+    for phase in report["timings"]:
+      lines.append("{0:<20}{1:>10.1f}{2:>10.1f}{3:>10.1f}".format(
+        phase["name"],
+        phase["last"] * 1000,
+        phase["p50"] * 1000,
+        phase["p95"] * 1000
+      ))
+
+    lines.extend([
+      "",
+      "{0:<20}{1:>10}{2:>10}{3:>10}".format("Counter", "last", "p50", "p95")
+    ])
+    for counter in report["counters"]:
+      lines.append("{0:<20}{1:>10}{2:>10}{3:>10}".format(
+        counter["name"],
+        counter["last"],
+        counter["p50"],
+        counter["p95"]
+      ))
+
+    if report["slow"]:
+      lines.extend(["", "Slow queries:"])
+      for invocation in reversed(report["slow"]):
+        lines.append("{0} {1}".format(
+          time.strftime("%H:%M:%S", time.localtime(invocation["time"])),
+          Stats.format(invocation)
+        ))
+
+    panel = self.window.create_output_panel("simple_import_stats")
+    panel.run_command("append", { "characters": "\n".join(lines) + "\n" })
+    self.window.run_command("show_panel", { "panel": "output.simple_import_stats" })
+
+class SimpleImportProfileNextCommand(sublime_plugin.WindowCommand):
+  def run(self):
+    Profiler.arm()
+    sublime.status_message("Simple Import: the next import will be profiled")
+
+class SimpleImportListener(sublime_plugin.EventListener):
+  def on_post_save_async(self, view):
+    if view.file_name():
+      FileIndex.onFileChanged(view.file_name())
+      ProjectSettings.onFileChanged(view.file_name())
+
+  def on_close(self, view):
+    SimpleImportCommand.imports_cache.pop(view.id(), None)
+
+def plugin_loaded():
+  ModuleCache.setCacheDir(path.join(sublime.cache_path(), "SimpleImport"))
+
+def plugin_unloaded():
+  WorkerPool.shutdown()
+
 SimpleImportCommand.loadInterpreters()
@@ -0,0 +1,187 @@
+from os import path
+from .interpreters import *
+from .interpreters import __all__ as InterpretersNames
+from .interpreter import Interpreter
+from .interpreter.SImport import SImport
+from .interpreter.PendingImport import PendingImport
+from .ProjectSettings import ProjectSettings
+from .SIMode import SIMode
+from .Region import Region
+from .utils import applyEdits
+
+class BatchResolver:
+  # Resolves symbols to import statements in many files of a project,
+  # outside Sublime. The interpreters and the project indexes are shared
+  # by every file, so only the first one waits for the project scan
+  MODE = SIMode.PUSH_MODE
+
+  def __init__(self, project_path, settings=None):
+    self.project_path = path.abspath(project_path)
+    # Applied over the settings of .simple-import.json
+    self.settings = settings or {}
+    self.interpreters = [globals()[name]() for name in InterpretersNames]
+
+  def getInterpreter(self, file_path):
+    filename = path.basename(file_path)
+    for interpreter in self.interpreters:
+      if interpreter.isCompatibleView(filename, ""):
+        return interpreter
+    return None
+
+  def loadSettings(self, interpreter, relpath):
+    settings = interpreter.settings.copy()
+    settings.update(
+      ProjectSettings.get(self.project_path).getSettings(
+        interpreter.syntax,
+        relpath
+      ) or {}
+    )
+    settings.update(self.settings)
+    interpreter.setSettings(settings)
+
+  def readFile(self, file_path):
+    # newline="" keeps the line endings of the file
+    with open(file_path, encoding="utf-8", newline="") as file:
+      return file.read()
+
+  def writeFile(self, file_path, text):
+    with open(file_path, "w", encoding="utf-8", newline="") as file:
+      file.write(text)
+
+  def findImports(self, interpreter, text):
+    return [
+      interpreter.interprete(
+        SImport(
+          import_text,
+          import_text,
+          Region(begin, end),
+          Region(begin, end)
+        ),
+        mode=BatchResolver.MODE
+      )
+      for begin, end, import_text in interpreter.findImportsInText(text)
+    ]
+
+  def getInsertEdits(self, resolved, view_imports):
+    # Interpreters without their own insert logic replace the selection
+    # with the statement. There is none here, so the statements go on
+    # their own lines after the last import, or at the top of the file
+    statements = []
+    for interpreted in resolved:
+      statement = str(interpreted)
+      if statement not in statements:
+        statements.append(statement)
+
+    if not statements:
+      return []
+
+    if view_imports:
+      end = view_imports[-1].simport.context_region.end()
+      return [[end, end, "".join("\n" + statement for statement in statements)]]
+
+    return [[0, 0, "".join(statement + "\n" for statement in statements)]]
+
+  def resolve(self, file_path, symbols, choose_first=False, write=False):
+    # Returns what was resolved in the file, and the edits that add the
+    # imports. Symbols matching more than one option are left out unless
+    # choose_first is set
+    file_path = path.abspath(file_path)
+    relpath = path.relpath(file_path, self.project_path)
+    result = {
+      "file": relpath,
+      "imports": [],
+      "ambiguous": {},
+      "unresolved": [],
+      "edits": []
+    }
+
+    interpreter = self.getInterpreter(file_path)
+    if not interpreter:
+      result["error"] = "Unsupported file"
+      return result
+
+    self.loadSettings(interpreter, relpath)
+    try:
+      text = self.readFile(file_path)
+    except (IOError, UnicodeDecodeError) as error:
+      result["error"] = str(error)
+      return result
+
+    queries = []
+    for symbol in symbols:
+      interpreted = interpreter.interprete(
+        SImport(symbol, symbol, Region(0, len(symbol)), Region(0, len(symbol))),
+        mode=BatchResolver.MODE
+      )
+      value = interpreter.getQueryValue(interpreted)
+      if value is False:
+        result["unresolved"].append(symbol)
+      else:
+        queries.append((symbol, interpreted, value))
+
+    results = interpreter.findByValues(
+      [ value for symbol, interpreted, value in queries ],
+      self.project_path,
+      omit_files=[relpath]
+    )
+
+    view_dir_relpath = path.dirname(relpath) or "."
+    resolved = []
+    for symbol, interpreted, value in queries:
+      pending_import = PendingImport(interpreted, results[value])
+      options = pending_import.getOptionsAsList(include_keys=True)
+
+      if not options:
+        result["unresolved"].append(symbol)
+        continue
+
+      if len(options) > 1 and not choose_first:
+        result["ambiguous"][symbol] = options
+        continue
+
+      option = interpreter.parseOptionItem(
+        pending_import.getOptionByIndex(0),
+        view_dir_relpath
+      )
+      if not option:
+        result["unresolved"].append(symbol)
+        continue
+
+      interpreter.onSearchResultChosen(
+        interpreted,
+        option["key"],
+        option["value"],
+        mode=BatchResolver.MODE
+      )
+      resolved.append(interpreted)
+      result["imports"].append({
+        "symbol": symbol,
+        "key": option["key"],
+        "module": interpreted.statements["module"]
+      })
+
+    view_imports = self.findImports(interpreter, text)
+    resolved = interpreter.mergeInterpreted(resolved, mode=BatchResolver.MODE)
+    if type(interpreter).parseBeforeInsert is Interpreter.parseBeforeInsert:
+      result["edits"] = self.getInsertEdits(resolved, view_imports)
+    else:
+      imports_to_insert = []
+      for interpreted in resolved:
+        modified = interpreter.parseBeforeInsert(
+          interpreted,
+          view_imports,
+          mode=BatchResolver.MODE
+        )
+        if not isinstance(modified, list):
+          modified = [modified]
+
+        for vimport in modified:
+          if vimport not in imports_to_insert:
+            imports_to_insert.append(vimport)
+
+      result["edits"] = [ vimport.getEdit() for vimport in imports_to_insert ]
+
+    if write and result["edits"]:
+      self.writeFile(file_path, applyEdits(text, result["edits"]))
+
+    return result
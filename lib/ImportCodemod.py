@@ -0,0 +1,219 @@
+import copy, difflib, json, posixpath, re
+from os import path
+from .BatchResolver import BatchResolver
+from .lexers import JavascriptExportLexer
+from .utils import applyEdits
+
+def rewriteFile(codemod, relpath):
+  return codemod.rewrite(relpath)
+
+class ImportCodemod:
+  # Rewrites the imports of modules that moved, in every file of a
+  # project. A move is an (old, new) pair of project paths, like
+  # "src/components" or "src/Button.js", or of package names. Files may
+  # be moved before or after running it: their own relative imports are
+  # fixed either way. Instances are sent to worker processes, so only
+  # plain values are kept on them
+  RELATIVE_REGEX = re.compile(r"""['"](?:\.\.?/)*\.\.?/?['"]""")
+  MODULE_REGEX = re.compile(
+    r"""(?:(?<![\w$.])from\s*|(?<![\w$.])import\s*\(?\s*|"""
+    r"""(?<![\w$.])require\s*\(\s*)(['"])([^'"\n]+)\1"""
+  )
+
+  # (project path, settings) -> BatchResolver, in each process
+  resolvers = {}
+
+  def __init__(self, project_path, moves, settings=None, syntax="javascript", write=False):
+    self.project_path = path.abspath(project_path)
+    self.settings = settings or {}
+    self.key = (self.project_path, json.dumps(self.settings, sort_keys=True))
+    self.syntax = syntax
+    self.write = write
+    # [(old, new, is path)]
+    self.moves = []
+    for old, new in moves:
+      old = self.normalize(old)
+      new = self.normalize(new)
+      self.moves.append((old, new, self.isProjectPath(old) or self.isProjectPath(new)))
+
+    # Moved files still at their old path, or already at their new one
+    self.moved = not any(
+      is_path and self.isProjectPath(old) for old, new, is_path in self.moves
+    )
+    # Files containing none of these are not parsed
+    index_names = set(
+      interpreter.index_file_name
+      for interpreter in self.getResolver().interpreters
+    )
+    self.needles = set()
+    for old, new, is_path in self.moves:
+      name = posixpath.basename(old).split(".")[0]
+      # "folder/index.js" is imported as "folder"
+      if name in index_names:
+        name = posixpath.basename(posixpath.dirname(old)) or name
+      self.needles.add(name)
+
+  def normalize(self, value):
+    value = value.replace("\\", "/")
+    if value.startswith("./"):
+      value = value[2:]
+    return posixpath.normpath(value) if value else value
+
+  def isProjectPath(self, value):
+    full_path = path.join(self.project_path, value)
+    if path.exists(full_path):
+      return True
+    resolver = self.getResolver()
+    return any(
+      path.exists(full_path + extension)
+      for interpreter in resolver.interpreters
+      for extension in interpreter.getSetting("extensions", [])
+    )
+
+  def getResolver(self):
+    if self.key not in ImportCodemod.resolvers:
+      ImportCodemod.resolvers[self.key] = BatchResolver(self.project_path, self.settings)
+    return ImportCodemod.resolvers[self.key]
+
+  def listFiles(self):
+    # Project relative paths of the files the codemod reads
+    resolver = self.getResolver()
+    files = []
+    for interpreter in resolver.interpreters:
+      if interpreter.syntax != self.syntax:
+        continue
+
+      resolver.loadSettings(interpreter, ".")
+      index = interpreter.getFileIndex(self.project_path)
+      for relative_dir, filename in index.iterFiles():
+        if interpreter.isValidFile(filename):
+          files.append(path.normpath(path.join(relative_dir, filename)))
+    return files
+
+  def stripExtension(self, interpreter, value):
+    for extension in interpreter.getSetting("extensions", []):
+      if value.endswith(extension):
+        return value[:-len(extension)]
+    return value
+
+  def mapPath(self, interpreter, target, reverse=False):
+    # New project path of target, or None when it did not move
+    for old, new, is_path in self.moves:
+      if not is_path:
+        continue
+      if reverse:
+        old, new = new, old
+      if not target.startswith(posixpath.dirname(old)):
+        continue
+
+      if target == old or target.startswith(old + "/"):
+        return new + target[len(old):]
+
+      old_module = self.stripExtension(interpreter, old)
+      new_module = self.stripExtension(interpreter, new)
+      if target == old_module:
+        return new_module
+
+      # "folder" stands for "folder/index.js"
+      if posixpath.basename(old_module) == interpreter.index_file_name:
+        if target == posixpath.dirname(old_module):
+          if posixpath.basename(new_module) == interpreter.index_file_name:
+            return posixpath.dirname(new_module)
+          return new_module
+    return None
+
+  def mapPackage(self, module):
+    for old, new, is_path in self.moves:
+      if not is_path and (module == old or module.startswith(old + "/")):
+        return new + module[len(old):]
+    return None
+
+  def isRelative(self, module):
+    return module in (".", "..") or module.startswith(("./", "../"))
+
+  def rewriteModule(self, interpreter, module, old_dir, new_dir):
+    # The module to import from new_dir, or None when it stays the same
+    if self.isRelative(module):
+      target = posixpath.normpath(posixpath.join(old_dir, module))
+      if target.startswith("../"):
+        return None
+
+      target = self.mapPath(interpreter, target) or target
+      value = posixpath.relpath(target, new_dir)
+      value = value if value.startswith("../") else "./" + value
+      if value == "./.":
+        value = "."
+    else:
+      value = self.mapPackage(module) or self.mapPath(interpreter, module)
+      if not value:
+        return None
+
+    # Keep the extension and index style of the original import
+    if interpreter.parseModuleKey(module) == module:
+      value = interpreter.parseModuleKey(value)
+
+    return value if value != module else None
+
+  def getLocations(self, interpreter, relpath):
+    # (dir the imports were written from, dir the file ends up in)
+    if self.moved:
+      old_path = self.mapPath(interpreter, relpath, reverse=True)
+      return posixpath.dirname(old_path or relpath), posixpath.dirname(relpath)
+
+    new_path = self.mapPath(interpreter, relpath)
+    return posixpath.dirname(relpath), posixpath.dirname(new_path or relpath)
+
+  def rewrite(self, relpath):
+    # Returns (relpath, rewritten imports, unified diff)
+    resolver = self.getResolver()
+    file_path = path.join(self.project_path, relpath)
+    relpath = relpath.replace("\\", "/")
+
+    interpreter = resolver.getInterpreter(file_path)
+    if not interpreter:
+      return relpath, 0, ""
+    # Files may be rewritten in threads, each with its own settings
+    interpreter = copy.copy(interpreter)
+
+    try:
+      text = resolver.readFile(file_path)
+    except (IOError, UnicodeDecodeError):
+      return relpath, 0, ""
+
+    resolver.loadSettings(interpreter, relpath)
+    old_dir, new_dir = self.getLocations(interpreter, relpath)
+    if old_dir == new_dir and not (
+      any(needle in text for needle in self.needles) or
+      (("'." in text or '".' in text) and ImportCodemod.RELATIVE_REGEX.search(text))
+    ):
+      return relpath, 0, ""
+
+    # Every module in the file: imports, exports from other modules,
+    # side effect imports, require() and import(). Only the module
+    # changes, the rest of the statement is kept as is. Comments and
+    # strings are skipped
+    edits = []
+    lexer = JavascriptExportLexer()
+    for match in lexer.iterCode(ImportCodemod.MODULE_REGEX, text):
+      module = match.group(2)
+      value = self.rewriteModule(interpreter, module, old_dir, new_dir)
+      if value:
+        edits.append([match.start(2), match.end(2), value])
+
+    if not edits:
+      return relpath, 0, ""
+
+    rewritten = applyEdits(text, edits)
+    if self.write:
+      resolver.writeFile(file_path, rewritten)
+      return relpath, len(edits), ""
+
+    # Edits never add lines, so the diff stops after the last one
+    end = text.count("\n", 0, max(edit[1] for edit in edits)) + 4
+    diff = "".join(difflib.unified_diff(
+      text.splitlines(True)[:end],
+      rewritten.splitlines(True)[:end],
+      "a/" + relpath,
+      "b/" + relpath
+    ))
+    return relpath, len(edits), diff
@@ -0,0 +1,112 @@
+import re, json, sys, threading, time
+from os import path, stat
+
+class ProjectSettings:
+  FILE_NAME = ".simple-import.json"
+  # Seconds between two checks of the settings file mtime. Saving it in
+  # Sublime reloads it right away
+  CHECK_INTERVAL = 2
+
+  projects = {}
+  lock = threading.Lock()
+
+  @staticmethod
+  def get(project_path):
+    with ProjectSettings.lock:
+      if project_path not in ProjectSettings.projects:
+        ProjectSettings.projects[project_path] = ProjectSettings(project_path)
+      return ProjectSettings.projects[project_path]
+
+  @staticmethod
+  def onFileChanged(file_path):
+    if path.basename(file_path) != ProjectSettings.FILE_NAME:
+      return
+
+    with ProjectSettings.lock:
+      project = ProjectSettings.projects.get(path.dirname(file_path))
+
+    if project:
+      project.checked_at = 0
+
+  def __init__(self, project_path):
+    self.project_path = project_path
+    self.file_path = path.join(project_path, ProjectSettings.FILE_NAME)
+    self.mtime = None
+    self.checked_at = 0
+    # Increased every time the file is loaded again
+    self.version = 0
+    # syntax -> settings, or [(compiled pattern or None, settings)]
+    # for syntaxes using "$path"
+    self.syntaxes = {}
+    # (syntax, view relpath) -> settings
+    self.resolved = {}
+    self.lock = threading.Lock()
+
+  def load(self):
+    now = time.time()
+    if now - self.checked_at < ProjectSettings.CHECK_INTERVAL:
+      return
+
+    self.checked_at = now
+    try:
+      mtime = stat(self.file_path).st_mtime
+    except OSError:
+      mtime = None
+
+    if mtime == self.mtime and self.version:
+      return
+
+    self.mtime = mtime
+    self.version += 1
+    self.syntaxes = {}
+    self.resolved = {}
+
+    if mtime is None:
+      return
+
+    with open(self.file_path) as raw_json:
+      try:
+        settings_json = json.load(raw_json)
+      except ValueError:
+        print(
+          "Failed to load .simple-import.json at {0}".format(self.project_path),
+          file=sys.stderr
+        )
+        return
+
+    for syntax in settings_json:
+      settings = settings_json[syntax]
+      if isinstance(settings, dict) and "$path" in settings:
+        rules = []
+        for match in settings["$path"]:
+          if len(match) == 1:
+            rules.append((None, match[0]))
+          else:
+            rules.append((
+              re.compile("^{0}".format('|'.join(match[:-1]))),
+              match[-1]
+            ))
+        self.syntaxes[syntax] = rules
+      else:
+        self.syntaxes[syntax] = settings
+
+  def getSettings(self, syntax, view_relpath):
+    with self.lock:
+      self.load()
+
+      if syntax not in self.syntaxes:
+        return None
+
+      settings = self.syntaxes[syntax]
+      if not isinstance(settings, list):
+        return settings
+
+      key = (syntax, view_relpath)
+      if key not in self.resolved:
+        settings_on_file = {}
+        for pattern, match_settings in settings:
+          if not pattern or pattern.search(view_relpath):
+            settings_on_file.update(match_settings)
+        self.resolved[key] = settings_on_file
+
+      return self.resolved[key]
@@ -0,0 +1,27 @@
+# sublime.Region inside the editor. Outside of it, as in the command
+# line resolver, the few methods the interpreters use
+try:
+  from sublime import Region
+except ImportError:
+  class Region:
+    def __init__(self, a, b=None):
+      self.a = a
+      self.b = a if b is None else b
+
+    def begin(self):
+      return min(self.a, self.b)
+
+    def end(self):
+      return max(self.a, self.b)
+
+    def size(self):
+      return self.end() - self.begin()
+
+    def empty(self):
+      return self.a == self.b
+
+    def __eq__(self, other):
+      return isinstance(other, Region) and (self.a, self.b) == (other.a, other.b)
+
+    def __repr__(self):
+      return "Region({0}, {1})".format(self.a, self.b)
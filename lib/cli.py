@@ -0,0 +1,186 @@
+import argparse, json, sys, time
+from functools import partial
+from multiprocessing import cpu_count
+from os import getcwd
+from .BatchResolver import BatchResolver
+from .ImportCodemod import ImportCodemod, rewriteFile
+from .index import ModuleCache, WorkerPool
+
+# Command line entry point, run from the package folder:
+#
+#   python3 -m lib.cli resolve --project ~/app src/App.js:connect,Button
+#
+# Prints one JSON object per file with what each symbol resolved to and
+# the edits adding the imports. --write applies them
+#
+#   python3 -m lib.cli move --project ~/app src/components src/ui
+#
+# Prints the diff fixing the imports of moved modules in every file of
+# the project. --write applies it
+
+def parseSpec(spec):
+  # "path/to/file.js:symbol,other" -> ("path/to/file.js", ["symbol", "other"])
+  file_path, _, symbols = spec.strip().rpartition(":")
+  if not file_path:
+    return None
+  return file_path, [ symbol for symbol in symbols.split(",") if symbol ]
+
+def readSpecs(args):
+  specs = list(args.specs)
+  if args.specs_file:
+    stream = sys.stdin if args.specs_file == "-" else open(args.specs_file)
+    try:
+      specs.extend(line for line in stream if line.strip())
+    finally:
+      if stream is not sys.stdin:
+        stream.close()
+  return specs
+
+def resolve(args):
+  resolver = BatchResolver(
+    args.project,
+    json.loads(args.settings) if args.settings else None
+  )
+  failed = False
+
+  for spec in readSpecs(args):
+    parsed = parseSpec(spec)
+    if not parsed:
+      print("SimpleImport: expected file:symbol[,symbol], got {0}".format(
+        spec.strip()
+      ), file=sys.stderr)
+      failed = True
+      continue
+
+    result = resolver.resolve(
+      parsed[0],
+      parsed[1],
+      choose_first=args.first,
+      write=args.write
+    )
+    if result["unresolved"] or result["ambiguous"] or "error" in result:
+      failed = True
+
+    print(json.dumps(result, sort_keys=True))
+    sys.stdout.flush()
+
+  return 1 if failed else 0
+
+def move(args):
+  if len(args.paths) % 2:
+    print("SimpleImport: expected OLD NEW pairs", file=sys.stderr)
+    return 2
+
+  start = time.time()
+  codemod = ImportCodemod(
+    args.project,
+    list(zip(args.paths[0::2], args.paths[1::2])),
+    json.loads(args.settings) if args.settings else None,
+    syntax=args.syntax,
+    write=args.write
+  )
+  files = codemod.listFiles()
+
+  changed = 0
+  rewritten = 0
+  pool = WorkerPool.get(args.workers, "process")
+  for relpath, count, diff in pool.map(partial(rewriteFile, codemod), files, 256):
+    if not count:
+      continue
+    changed += 1
+    rewritten += count
+    sys.stdout.write(relpath + "\n" if args.write else diff)
+
+  print("SimpleImport: {0} imports in {1} of {2} files {3} in {4:.2f}s".format(
+    rewritten,
+    changed,
+    len(files),
+    "rewritten" if args.write else "to rewrite",
+    time.time() - start
+  ), file=sys.stderr)
+  return 0
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(prog="python3 -m lib.cli")
+  commands = parser.add_subparsers(dest="command")
+
+  resolve_parser = commands.add_parser(
+    "resolve",
+    help="Resolve symbols to import statements"
+  )
+  resolve_parser.add_argument(
+    "specs",
+    nargs="*",
+    metavar="FILE:SYMBOL[,SYMBOL]",
+  )
+  resolve_parser.add_argument(
+    "--from",
+    dest="specs_file",
+    metavar="FILE",
+    help="Read more FILE:SYMBOL lines from a file, - for stdin"
+  )
+  resolve_parser.add_argument("--project", default=getcwd())
+  resolve_parser.add_argument(
+    "--first",
+    action="store_true",
+    help="Use the first option when a symbol matches more than one"
+  )
+  resolve_parser.add_argument(
+    "--write",
+    action="store_true",
+    help="Add the imports to the files"
+  )
+  resolve_parser.add_argument(
+    "--settings",
+    metavar="JSON",
+    help="Settings applied over .simple-import.json"
+  )
+  resolve_parser.add_argument(
+    "--cache-dir",
+    help="Keep scanned dependencies in this folder between runs"
+  )
+
+  move_parser = commands.add_parser(
+    "move",
+    help="Fix the imports of modules moved or renamed"
+  )
+  move_parser.add_argument(
+    "paths",
+    nargs="+",
+    metavar="OLD NEW",
+    help="Project paths or package names, before and after the move"
+  )
+  move_parser.add_argument("--project", default=getcwd())
+  move_parser.add_argument(
+    "--write",
+    action="store_true",
+    help="Rewrite the files instead of printing a diff"
+  )
+  move_parser.add_argument(
+    "--workers",
+    type=int,
+    default=cpu_count(),
+    help="Processes rewriting files, 0 to run serially"
+  )
+  move_parser.add_argument("--syntax", default="javascript")
+  move_parser.add_argument(
+    "--settings",
+    metavar="JSON",
+    help="Settings applied over .simple-import.json"
+  )
+
+  args = parser.parse_args(argv)
+  if not args.command:
+    parser.print_help()
+    return 2
+
+  if getattr(args, "cache_dir", None):
+    ModuleCache.setCacheDir(args.cache_dir)
+
+  try:
+    return move(args) if args.command == "move" else resolve(args)
+  finally:
+    WorkerPool.shutdown()
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,111 @@
+import sys, threading, time
+from os import path
+from .WorkerPool import WorkerPool
+from .Stats import Stats
+
+class ExportIndex:
+  # Maps every exported name to the files exporting it. Files are only
+  # parsed when they are added to or changed in the FileIndex. extract
+  # takes the full path of a file and returns its exported names, or None
+  # when the file can not be read. With a ParseCache, files edited
+  # outside of Sublime are found by their mtime and size, and files
+  # parsed before are not read again
+
+  @staticmethod
+  def get(file_index, key, extract, isValidFile, cache=None):
+    return file_index.attach(
+      ("exports",) + tuple(key),
+      lambda index: ExportIndex(index, extract, isValidFile, cache)
+    )
+
+  def __init__(self, file_index, extract, isValidFile, cache=None):
+    self.file_index = file_index
+    self.extract = extract
+    self.isValidFile = isValidFile
+    self.cache = cache
+    self.checked_at = time.time()
+    # name -> { file_path: [values] }
+    self.names = {}
+    # file_path -> [names]
+    self.files = {}
+    self.pending = set()
+    self.lock = threading.RLock()
+
+  def onFilesChanged(self, added, removed, changed):
+    with self.lock:
+      for relative_dir, filename in removed:
+        file_path = path.join(relative_dir, filename)
+        self.pending.discard(file_path)
+        self.removeFile(file_path)
+        if self.cache:
+          self.cache.discard(self.getFullPath(file_path))
+
+      for relative_dir, filename in added + changed:
+        if self.isValidFile(filename):
+          self.pending.add(path.join(relative_dir, filename))
+
+  def removeFile(self, file_path):
+    for name in self.files.pop(file_path, []):
+      if name in self.names:
+        self.names[name].pop(file_path, None)
+        if not self.names[name]:
+          del self.names[name]
+
+  def addFile(self, file_path, names):
+    self.files[file_path] = names
+    for name in names:
+      if name not in self.names:
+        self.names[name] = {}
+
+      if file_path not in self.names[name]:
+        self.names[name][file_path] = []
+
+      self.names[name][file_path].append(name)
+
+  def getFullPath(self, file_path):
+    return path.join(self.file_index.project_path, file_path)
+
+  def checkFiles(self):
+    # Files changed since they were parsed have to be parsed again
+    now = time.time()
+    if now - self.checked_at < self.file_index.refresh_interval:
+      return
+
+    self.checked_at = now
+    for file_path in self.files:
+      if not self.cache.isFresh(self.getFullPath(file_path)):
+        self.pending.add(file_path)
+
+  def update(self, token=None, pool=None):
+    with self.lock, Stats.timer("exports"):
+      if self.cache:
+        self.checkFiles()
+
+      files = sorted(self.pending)
+      full_paths = [self.getFullPath(file_path) for file_path in files]
+      pool = pool or WorkerPool.get()
+
+      if self.cache:
+        results = self.cache.map(pool, self.extract, full_paths, token=token)
+      else:
+        results = pool.map(self.extract, full_paths, token=token)
+
+      for file_path, names in zip(files, results):
+        self.pending.discard(file_path)
+        self.removeFile(file_path)
+        if names is None:
+          print("SimpleImport: Could not read", file_path, file=sys.stderr)
+          continue
+
+        self.addFile(file_path, names)
+
+  def find(self, value, omit_files=None, token=None, pool=None):
+    self.update(token, pool)
+
+    with self.lock:
+      files = self.names.get(value, {})
+      return [
+        (file_path, list(files[file_path]))
+        for file_path in sorted(files)
+        if not omit_files or file_path not in omit_files
+      ]
@@ -0,0 +1,384 @@
+import threading, time
+from os import path, stat
+from .Walker import Walker
+from .GitFiles import GitFiles
+from .Stats import Stats
+
+class FileIndex:
+  # Indexes are shared by every interpreter using the same project
+  # folder and the same ignored paths. Files are listed by git when the
+  # source is "git" and the project is in a work tree, and by walking
+  # the project folders otherwise
+  SOURCES = ("git", "walker")
+  indexes = {}
+  lock = threading.Lock()
+
+  @staticmethod
+  def get(
+    project_path,
+    ignore=None,
+    refresh_interval=5,
+    exclude=None,
+    file_source="walker"
+  ):
+    # exclude holds the other arguments of Walker
+    ignored_paths = tuple(sorted(set(
+      path.normpath(epath) for epath in ignore or []
+    )))
+    exclude = exclude or {}
+    key = (
+      path.normpath(project_path),
+      ignored_paths,
+      tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in exclude.items()
+      )),
+      file_source
+    )
+
+    with FileIndex.lock:
+      if key not in FileIndex.indexes:
+        FileIndex.indexes[key] = FileIndex(
+          project_path,
+          ignored_paths,
+          exclude,
+          file_source
+        )
+      index = FileIndex.indexes[key]
+
+    index.refresh_interval = refresh_interval
+    return index
+
+  @staticmethod
+  def onFileChanged(file_path):
+    with FileIndex.lock:
+      indexes = list(FileIndex.indexes.values())
+
+    for index in indexes:
+      index.touch(file_path)
+
+  @staticmethod
+  def clear():
+    with FileIndex.lock:
+      FileIndex.indexes = {}
+
+  def __init__(
+    self,
+    project_path,
+    ignored_paths=(),
+    exclude=None,
+    file_source="walker"
+  ):
+    self.project_path = project_path
+    self.walker = Walker(project_path, ignored_paths, **(exclude or {}))
+    # git applies the ignore rules itself, so it is only asked when they
+    # are used
+    self.git = None
+    if file_source == "git" and self.walker.use_gitignore:
+      self.git = GitFiles(project_path)
+    self.git_index_mtime = None
+    self.refresh_interval = 5
+    # relative dir -> { "mtime", "dirs", "files" }
+    self.dirs = {}
+    self.dirty_dirs = set()
+    self.dirty_files = set()
+    # Folders whose .gitignore changed, listed again with every subfolder
+    self.dirty_trees = set()
+    self.attached = {}
+    self.built = False
+    self.refreshed_at = 0
+    self.lock = threading.RLock()
+
+  def scanDir(self, relative_dir):
+    scanned = self.walker.scanDir(relative_dir)
+    if not scanned:
+      return None
+
+    previous = self.dirs.get(relative_dir)
+    mtime, dirs, files = scanned
+    entry = { "mtime": mtime, "dirs": dirs, "files": files }
+    self.dirs[relative_dir] = entry
+
+    if previous:
+      previous_files = set(previous["files"])
+      current_files = set(entry["files"])
+      self.notify(
+        [ (relative_dir, f) for f in entry["files"] if f not in previous_files ],
+        [ (relative_dir, f) for f in previous["files"] if f not in current_files ]
+      )
+    else:
+      self.notify([ (relative_dir, f) for f in entry["files"] ], [])
+
+    return entry
+
+  def build(self, relative_dir, token=None):
+    if token:
+      token.check()
+
+    # Folders listed by an interrupted build are reused
+    entry = self.dirs.get(relative_dir) or self.scanDir(relative_dir)
+    if entry:
+      for dirname in entry["dirs"]:
+        self.build(self.joinDir(relative_dir, dirname), token)
+
+  def drop(self, relative_dir):
+    entry = self.dirs.pop(relative_dir, None)
+    if entry:
+      self.notify([], [ (relative_dir, f) for f in entry["files"] ])
+      for dirname in entry["dirs"]:
+        self.drop(self.joinDir(relative_dir, dirname))
+
+  def revalidate(self, relative_dir, token=None):
+    if token:
+      token.check()
+
+    entry = self.dirs.get(relative_dir)
+    if not entry:
+      return self.build(relative_dir, token)
+
+    try:
+      mtime = stat(path.join(self.project_path, relative_dir)).st_mtime
+    except OSError:
+      return self.drop(relative_dir)
+
+    if mtime != entry["mtime"] or relative_dir in self.dirty_dirs:
+      self.dirty_dirs.discard(relative_dir)
+      previous_dirs = entry["dirs"]
+      entry = self.scanDir(relative_dir)
+      if not entry:
+        return self.drop(relative_dir)
+
+      for dirname in previous_dirs:
+        if dirname not in entry["dirs"]:
+          self.drop(self.joinDir(relative_dir, dirname))
+
+    for dirname in entry["dirs"]:
+      self.revalidate(self.joinDir(relative_dir, dirname), token)
+
+  def getListedDir(self, dirs, relative_dir):
+    # Entry of a folder listed by git, added with its parents. None when
+    # the folder is excluded
+    if relative_dir in dirs:
+      return dirs[relative_dir]
+
+    parent_dir, dirname = path.split(relative_dir)
+    parent = self.getListedDir(dirs, parent_dir or ".")
+    entry = None
+    if parent is not None and not self.walker.isExcluded(
+      relative_dir,
+      dirname,
+      True
+    ):
+      entry = { "mtime": None, "dirs": [], "files": [] }
+      parent["dirs"].append(dirname)
+
+    dirs[relative_dir] = entry
+    return entry
+
+  def groupFiles(self, file_paths):
+    dirs = { ".": { "mtime": None, "dirs": [], "files": [] } }
+    for file_path in file_paths:
+      relative_dir, filename = path.split(file_path)
+      entry = self.getListedDir(dirs, relative_dir or ".")
+      if entry is None or self.walker.isExcluded(file_path, filename, False):
+        continue
+
+      # Files with merge conflicts are listed once per stage, in a row
+      if not entry["files"] or entry["files"][-1] != filename:
+        entry["files"].append(filename)
+
+    return dict(
+      (relative_dir, entry) for relative_dir, entry in dirs.items() if entry
+    )
+
+  def getDirMtime(self, relative_dir):
+    try:
+      return stat(path.join(self.project_path, relative_dir)).st_mtime
+    except OSError:
+      return None
+
+  def hasChangedDirs(self):
+    # Files created, deleted or renamed outside Sublime change the mtime
+    # of their folder, as with the walker
+    for relative_dir, entry in self.dirs.items():
+      if self.getDirMtime(relative_dir) != entry["mtime"]:
+        return True
+    return False
+
+  def setDirs(self, dirs):
+    previous = self.dirs
+    self.dirs = dirs
+
+    added = []
+    for relative_dir, entry in dirs.items():
+      previous_entry = previous.get(relative_dir)
+      previous_files = set(previous_entry["files"] if previous_entry else [])
+      added.extend(
+        (relative_dir, f) for f in entry["files"] if f not in previous_files
+      )
+
+    removed = []
+    for relative_dir, previous_entry in previous.items():
+      entry = dirs.get(relative_dir)
+      current_files = set(entry["files"] if entry else [])
+      removed.extend(
+        (relative_dir, f) for f in previous_entry["files"]
+          if f not in current_files
+      )
+
+    self.notify(added, removed)
+
+  def refreshFromGit(self, force, now, token=None):
+    # Files are listed again when the git index changed, which happens
+    # when files are added, removed or committed, when a listed folder
+    # changed or when a file that is not listed yet is saved. Returns
+    # False when git can not list them
+    unknown = [
+      (relative_dir, filename)
+      for relative_dir, filename in self.dirty_files
+      if relative_dir not in self.dirs or
+        filename not in self.dirs[relative_dir]["files"]
+    ]
+    relist = not self.built or force or unknown or self.dirty_trees
+    if not relist and now - self.refreshed_at >= self.refresh_interval:
+      index_mtime = self.git.getIndexMtime()
+      if index_mtime is None:
+        return False
+      relist = index_mtime != self.git_index_mtime or self.hasChangedDirs()
+
+    if relist:
+      if token:
+        token.check()
+
+      # Read first, changes made while listing are picked up next time
+      index_mtime = self.git.getIndexMtime()
+      mtimes = dict(
+        (relative_dir, self.getDirMtime(relative_dir))
+        for relative_dir in self.dirs
+      )
+      file_paths = None
+      if index_mtime is not None:
+        file_paths = self.git.listFiles()
+      if file_paths is None:
+        return False
+
+      dirs = self.groupFiles(file_paths)
+      for relative_dir, entry in dirs.items():
+        if relative_dir in mtimes:
+          entry["mtime"] = mtimes[relative_dir]
+        else:
+          entry["mtime"] = self.getDirMtime(relative_dir)
+      self.setDirs(dirs)
+      self.git_index_mtime = index_mtime
+      self.built = True
+
+    changed = [
+      (relative_dir, filename)
+      for relative_dir, filename in self.dirty_files
+      if relative_dir in self.dirs and
+        filename in self.dirs[relative_dir]["files"]
+    ]
+    self.dirty_dirs = set()
+    self.dirty_files = set()
+    self.dirty_trees = set()
+    self.notify([], [], changed)
+    return True
+
+  def refresh(self, force=False, token=None):
+    with self.lock, Stats.timer("file_index"):
+      now = time.time()
+      if self.git:
+        if self.refreshFromGit(force, now, token):
+          self.refreshed_at = now
+          return
+
+        # Not a work tree: folders listed by git are walked again, git
+        # does not list the ones without files
+        self.git = None
+        self.dirty_dirs.update(self.dirs)
+
+      if not self.built:
+        self.build(".", token)
+        self.built = True
+      elif (
+        force or
+        self.dirty_dirs or
+        self.dirty_trees or
+        now - self.refreshed_at >= self.refresh_interval
+      ):
+        for relative_dir in sorted(self.dirty_trees):
+          if relative_dir in self.dirs:
+            self.drop(relative_dir)
+        self.dirty_trees = set()
+
+        self.revalidate(".", token)
+        self.dirty_dirs = set()
+
+        changed = [
+          (relative_dir, filename)
+          for relative_dir, filename in self.dirty_files
+          if relative_dir in self.dirs and
+            filename in self.dirs[relative_dir]["files"]
+        ]
+        self.dirty_files = set()
+        self.notify([], [], changed)
+
+      self.refreshed_at = now
+
+  def touch(self, file_path):
+    relative_path = path.relpath(file_path, self.project_path)
+    if relative_path.startswith(".."):
+      return
+
+    with self.lock:
+      relative_dir = self.joinDir(".", path.dirname(relative_path))
+      # Only rescan the folder on next refresh
+      self.dirty_dirs.add(relative_dir)
+      self.dirty_files.add((relative_dir, path.basename(relative_path)))
+      if path.basename(relative_path) == Walker.GITIGNORE:
+        self.dirty_trees.add(relative_dir)
+
+  def attach(self, key, factory):
+    # Attach an object that follows every file added, removed or changed
+    # through onFilesChanged(added, removed, changed)
+    with self.lock:
+      if key not in self.attached:
+        listener = factory(self)
+        listener.onFilesChanged(list(self.iterFiles()), [], [])
+        self.attached[key] = listener
+      return self.attached[key]
+
+  def notify(self, added, removed, changed=None):
+    if not self.attached or not (added or removed or changed):
+      return
+
+    for listener in list(self.attached.values()):
+      listener.onFilesChanged(added, removed, changed or [])
+
+  def joinDir(self, relative_dir, dirname):
+    if relative_dir == ".":
+      return dirname or "."
+    return path.join(relative_dir, dirname)
+
+  def iterDirs(self, relative_dir="."):
+    # Same order as os.walk(topdown=True)
+    entry = self.dirs.get(relative_dir)
+    if not entry:
+      return
+
+    yield relative_dir, entry["files"]
+    for dirname in entry["dirs"]:
+      for item in self.iterDirs(self.joinDir(relative_dir, dirname)):
+        yield item
+
+  def listDirs(self):
+    with self.lock:
+      return [
+        (relative_dir, list(filenames))
+        for relative_dir, filenames in self.iterDirs()
+      ]
+
+  def iterFiles(self):
+    for relative_dir, filenames in self.listDirs():
+      for filename in filenames:
+        yield relative_dir, filename
@@ -0,0 +1,53 @@
+import hashlib, threading
+from os import path, stat
+
+class Fingerprint:
+  # Fingerprint of a set of files. Files are only hashed again when their
+  # mtime or size changed, so checking an unchanged set costs a few stats
+  fingerprints = {}
+  lock = threading.Lock()
+
+  @staticmethod
+  def get(root, filenames):
+    key = (path.normpath(root), tuple(filenames))
+    with Fingerprint.lock:
+      if key not in Fingerprint.fingerprints:
+        Fingerprint.fingerprints[key] = Fingerprint(root, filenames)
+      return Fingerprint.fingerprints[key]
+
+  def __init__(self, root, filenames):
+    self.root = root
+    self.filenames = filenames
+    self.stats = None
+    self.value = None
+    self.lock = threading.Lock()
+
+  def readStats(self):
+    stats = []
+    for filename in self.filenames:
+      try:
+        st = stat(path.join(self.root, filename))
+        stats.append((filename, st.st_mtime, st.st_size))
+      except OSError:
+        stats.append((filename, None, None))
+    return stats
+
+  def hashFiles(self):
+    digest = hashlib.sha1()
+    for filename in self.filenames:
+      digest.update(filename.encode("utf-8"))
+      try:
+        with open(path.join(self.root, filename), "rb") as file:
+          for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+      except (IOError, OSError):
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+  def check(self):
+    with self.lock:
+      stats = self.readStats()
+      if stats != self.stats:
+        self.stats = stats
+        self.value = self.hashFiles()
+      return self.value
@@ -0,0 +1,93 @@
+import os, subprocess, sys
+from os import path, stat
+from .Stats import Stats
+
+class GitFiles:
+  # Lists the files of a git work tree from its index: tracked files and
+  # untracked ones that are not ignored, like git status shows them.
+  # Every method returns None when the folder is not in a work tree or
+  # git can not be run
+  TIMEOUT = 30
+
+  def __init__(self, root):
+    self.root = root
+    self.index_path = None
+
+  def run(self, args):
+    startupinfo = None
+    if os.name == "nt":
+      # Do not flash a console window
+      startupinfo = subprocess.STARTUPINFO()
+      startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+    try:
+      process = subprocess.Popen(
+        ["git"] + args,
+        cwd=self.root,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        startupinfo=startupinfo
+      )
+      output, error = process.communicate(timeout=GitFiles.TIMEOUT)
+    except subprocess.TimeoutExpired:
+      process.kill()
+      process.communicate()
+      print(
+        "SimpleImport: git timed out listing {0}".format(self.root),
+        file=sys.stderr
+      )
+      return None
+    except OSError:
+      return None
+
+    if process.returncode != 0:
+      return None
+    return output
+
+  def getIndexPath(self):
+    if not self.index_path:
+      output = self.run(["rev-parse", "--git-dir"])
+      if output is None:
+        return None
+      self.index_path = path.join(
+        self.root,
+        output.decode("utf-8", "surrogateescape").strip(),
+        "index"
+      )
+    return self.index_path
+
+  def getIndexMtime(self):
+    # Changes when files are added, removed, committed or checked out
+    index_path = self.getIndexPath()
+    if not index_path:
+      return None
+
+    try:
+      return stat(index_path).st_mtime
+    except OSError:
+      # A repository without any commit or staged file
+      return 0
+
+  def listFiles(self):
+    # Paths relative to the root, with os.sep. Tracked files deleted from
+    # the work tree are still in the index, -t tags them with "R"
+    output = self.run([
+      "ls-files", "-z", "-t", "-c", "-o", "-d", "--exclude-standard"
+    ])
+    if output is None:
+      return None
+
+    entries = [
+      (entry[:1], entry[2:])
+      for entry in output.decode("utf-8", "surrogateescape").split("\0")
+      if entry
+    ]
+    deleted = set(file_path for tag, file_path in entries if tag == "R")
+    files = [
+      path.normpath(file_path)
+      for tag, file_path in entries
+      if tag != "R" and file_path not in deleted
+    ]
+    Stats.count("files_visited", len(files))
+    return files
@@ -0,0 +1,111 @@
+import re
+
+class GitIgnore:
+  # Rules of one .gitignore file. Paths are relative to the folder of the
+  # file and use "/". When no rule is negated every rule is matched with a
+  # single regex, otherwise the last matching rule wins, like in git
+
+  @staticmethod
+  def load(file_path):
+    try:
+      with open(file_path, encoding="utf-8", errors="replace") as file:
+        return GitIgnore(file.read().splitlines())
+    except (IOError, OSError):
+      return None
+
+  @staticmethod
+  def translate(pattern):
+    regex = ""
+    pos = 0
+    end = len(pattern)
+
+    while pos < end:
+      char = pattern[pos]
+      if pattern.startswith("**/", pos) and (pos == 0 or pattern[pos - 1] == "/"):
+        regex += "(?:.*/)?"
+        pos += 3
+        continue
+      elif pattern.startswith("**", pos) and pos + 2 == end and (
+        pos == 0 or pattern[pos - 1] == "/"
+      ):
+        regex += ".*"
+        pos += 2
+        continue
+
+      if char == "*":
+        regex += "[^/]*"
+      elif char == "?":
+        regex += "[^/]"
+      elif char == "[":
+        close = pattern.find("]", pos + 2)
+        if close < 0:
+          regex += "\\["
+        else:
+          chars = pattern[pos + 1:close]
+          if chars[0] == "!":
+            chars = "^" + chars[1:]
+          regex += "[" + chars.replace("\\", "\\\\") + "]"
+          pos = close
+      elif char == "\\" and pos + 1 < end:
+        pos += 1
+        regex += re.escape(pattern[pos])
+      else:
+        regex += re.escape(char)
+      pos += 1
+
+    return regex
+
+  def __init__(self, lines):
+    # [(compiled regex, negated, only matches folders)]
+    self.rules = []
+
+    for line in lines:
+      line = line.rstrip()
+      if not line or line.startswith("#"):
+        continue
+
+      negated = line.startswith("!")
+      if negated:
+        line = line[1:]
+      elif line.startswith("\\"):
+        line = line[1:]
+
+      dir_only = line.endswith("/")
+      if dir_only:
+        line = line[:-1]
+
+      # Patterns with a "/" are relative to the folder of the file,
+      # others match a name at any depth
+      if "/" in line:
+        regex = GitIgnore.translate(line.lstrip("/"))
+      else:
+        regex = "(?:.*/)?" + GitIgnore.translate(line)
+
+      try:
+        self.rules.append((re.compile("\\A" + regex + "\\Z"), negated, dir_only))
+      except re.error:
+        continue
+
+    self.negated = any(rule[1] for rule in self.rules)
+    if not self.negated:
+      self.dirs_regex = self.combine(self.rules)
+      self.files_regex = self.combine(
+        [rule for rule in self.rules if not rule[2]]
+      )
+
+  def combine(self, rules):
+    if not rules:
+      return None
+    return re.compile("|".join("(?:" + rule[0].pattern + ")" for rule in rules))
+
+  def match(self, relative_path, is_dir):
+    # True when ignored, False when included again by a negated rule and
+    # None when no rule matches
+    if not self.negated:
+      regex = self.dirs_regex if is_dir else self.files_regex
+      return True if regex and regex.match(relative_path) else None
+
+    for regex, negated, dir_only in reversed(self.rules):
+      if (is_dir or not dir_only) and regex.match(relative_path):
+        return not negated
+    return None
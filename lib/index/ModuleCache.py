@@ -0,0 +1,111 @@
+import json, sys, threading, time
+from os import path, makedirs, replace, remove
+
+class ModuleCache:
+  # Scanned dependencies stored on disk by package name and version so
+  # they survive editor restarts and plugin reloads
+  FORMAT_VERSION = 1
+  MAX_VERSIONS = 3
+
+  cache_dir = None
+  caches = {}
+  lock = threading.Lock()
+
+  @staticmethod
+  def setCacheDir(cache_dir):
+    with ModuleCache.lock:
+      ModuleCache.cache_dir = cache_dir
+      ModuleCache.caches = {}
+
+  @staticmethod
+  def get(name):
+    with ModuleCache.lock:
+      if not ModuleCache.cache_dir:
+        return None
+
+      file_path = path.join(ModuleCache.cache_dir, name + ".json")
+      if file_path not in ModuleCache.caches:
+        ModuleCache.caches[file_path] = ModuleCache(file_path)
+
+      return ModuleCache.caches[file_path]
+
+  def __init__(self, file_path):
+    self.file_path = file_path
+    # name -> version -> { "signature", "stored_at", "module" }
+    self.entries = None
+    self.dirty = False
+    self.lock = threading.RLock()
+
+  def load(self):
+    if self.entries is not None:
+      return
+
+    self.entries = {}
+    if not path.isfile(self.file_path):
+      return
+
+    try:
+      with open(self.file_path) as raw_json:
+        data = json.load(raw_json)
+
+      if data.get("format") == ModuleCache.FORMAT_VERSION:
+        self.entries = data.get("modules", {})
+    except (IOError, ValueError):
+      print(
+        "SimpleImport: Failed to load module cache at",
+        self.file_path,
+        file=sys.stderr
+      )
+
+  def lookup(self, name, version, signature):
+    with self.lock:
+      self.load()
+      entry = self.entries.get(name, {}).get(version)
+
+      if entry and entry.get("signature") == signature:
+        module = dict(entry["module"])
+        module["version"] = version
+        return module
+
+  def store(self, name, version, signature, module):
+    with self.lock:
+      self.load()
+      versions = self.entries.setdefault(name, {})
+      versions[version] = {
+        "signature": signature,
+        "stored_at": time.time(),
+        "module": module
+      }
+
+      # Keep only the most recent versions of each package
+      while len(versions) > ModuleCache.MAX_VERSIONS:
+        del versions[min(versions, key=lambda v: versions[v]["stored_at"])]
+
+      self.dirty = True
+
+  def save(self):
+    with self.lock:
+      if not self.dirty:
+        return
+
+      tmp_path = self.file_path + ".tmp"
+      try:
+        if not path.isdir(path.dirname(self.file_path)):
+          makedirs(path.dirname(self.file_path))
+
+        with open(tmp_path, "w") as raw_json:
+          json.dump({
+            "format": ModuleCache.FORMAT_VERSION,
+            "modules": self.entries
+          }, raw_json)
+
+        replace(tmp_path, self.file_path)
+        self.dirty = False
+      except (IOError, OSError):
+        print(
+          "SimpleImport: Failed to save module cache at",
+          self.file_path,
+          file=sys.stderr
+        )
+        if path.isfile(tmp_path):
+          remove(tmp_path)
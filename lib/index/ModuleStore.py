@@ -0,0 +1,134 @@
+import threading
+from collections import OrderedDict
+
+class ModuleStore:
+  # In-memory scanned modules, scoped by project folder. Projects and
+  # the modules inside them are kept in least recently used order so the
+  # oldest ones are evicted first when the budget is exceeded
+  ENTRY_OVERHEAD = 64
+
+  @staticmethod
+  def estimateSize(module):
+    size = ModuleStore.ENTRY_OVERHEAD
+    for key in module:
+      value = module[key]
+      if isinstance(value, list):
+        size += sum(len(item) + ModuleStore.ENTRY_OVERHEAD for item in value)
+      else:
+        size += len(str(value))
+    return size
+
+  def __init__(self, max_entries=None, max_size=None):
+    self.max_entries = max_entries
+    self.max_size = max_size
+    # project -> OrderedDict(module name -> (module, size))
+    self.projects = OrderedDict()
+    # project -> fingerprint of the modules stored for it
+    self.fingerprints = {}
+    # project -> number of modules evicted from it
+    self.evictions = {}
+    self.entries = 0
+    self.size = 0
+    self.lock = threading.RLock()
+
+  def setBudget(self, max_entries=None, max_size=None):
+    with self.lock:
+      self.max_entries = max_entries
+      self.max_size = max_size
+      self.evict()
+
+  def getProject(self, project_path):
+    if project_path not in self.projects:
+      self.projects[project_path] = OrderedDict()
+    else:
+      self.projects.move_to_end(project_path)
+    return self.projects[project_path]
+
+  def get(self, project_path, name):
+    with self.lock:
+      modules = self.getProject(project_path)
+      if name in modules:
+        modules.move_to_end(name)
+        return modules[name][0]
+
+  def set(self, project_path, name, module):
+    with self.lock:
+      self.remove(project_path, name)
+
+      size = ModuleStore.estimateSize(module)
+      self.getProject(project_path)[name] = (module, size)
+      self.entries += 1
+      self.size += size
+      self.evict()
+
+  def remove(self, project_path, name):
+    with self.lock:
+      modules = self.projects.get(project_path)
+      if modules and name in modules:
+        size = modules.pop(name)[1]
+        self.entries -= 1
+        self.size -= size
+
+  def modules(self, project_path):
+    with self.lock:
+      modules = self.getProject(project_path)
+      return [ (name, modules[name][0]) for name in modules ]
+
+  def isOverBudget(self):
+    return (
+      (self.max_entries and self.entries > self.max_entries) or
+      (self.max_size and self.size > self.max_size)
+    )
+
+  def evict(self):
+    while self.isOverBudget() and self.projects:
+      project_path = next(iter(self.projects))
+      modules = self.projects[project_path]
+
+      if modules:
+        name = next(iter(modules))
+        self.remove(project_path, name)
+
+      if not modules:
+        del self.projects[project_path]
+
+      # The project has to be checked again on the next lookup
+      self.fingerprints.pop(project_path, None)
+      self.evictions[project_path] = self.evictions.get(project_path, 0) + 1
+
+  def getEvictions(self, project_path):
+    with self.lock:
+      return self.evictions.get(project_path, 0)
+
+  def getFingerprint(self, project_path):
+    with self.lock:
+      return self.fingerprints.get(project_path)
+
+  def setFingerprint(self, project_path, fingerprint):
+    with self.lock:
+      self.fingerprints[project_path] = fingerprint
+
+  def clear(self):
+    with self.lock:
+      self.projects = OrderedDict()
+      self.fingerprints = {}
+      self.evictions = {}
+      self.entries = 0
+      self.size = 0
+
+  def stats(self):
+    with self.lock:
+      return {
+        "entries": self.entries,
+        "size": self.size,
+        "max_entries": self.max_entries,
+        "max_size": self.max_size,
+        "projects": [
+          {
+            "project": project_path,
+            "entries": len(modules),
+            "size": sum(modules[name][1] for name in modules)
+          }
+          for project_path, modules in reversed(list(self.projects.items()))
+        ]
+      }
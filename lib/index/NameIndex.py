@@ -0,0 +1,135 @@
+import bisect, threading
+from os import path
+from ..utils import extract_suffix
+
+class NameIndex:
+  # Normalized file names of a FileIndex. A query matches the files whose
+  # normalized path (without extension, and without a trailing index
+  # file name) ends with the normalized value. Equal names are found in
+  # a dict, suffixes by bisecting the sorted reversed paths
+  MAX_CHAR = u"\U0010ffff"
+
+  @staticmethod
+  def get(file_index, extensions, extra_extensions, index_name, normalize):
+    key = ("names", tuple(extensions), tuple(extra_extensions), index_name)
+    return file_index.attach(
+      key,
+      lambda index: NameIndex(extensions, extra_extensions, index_name, normalize)
+    )
+
+  def __init__(self, extensions, extra_extensions, index_name, normalize):
+    self.groups = {
+      "files": NameIndexGroup(extensions, index_name, normalize),
+      "extra_files": NameIndexGroup(extra_extensions, None, normalize)
+    }
+    self.lock = threading.Lock()
+
+  def onFilesChanged(self, added, removed, changed):
+    with self.lock:
+      for group in self.groups.values():
+        for relative_dir, filename in removed:
+          group.remove(relative_dir, filename)
+
+        for relative_dir, filename in added:
+          group.add(relative_dir, filename)
+
+  def find(self, group, key):
+    with self.lock:
+      return self.groups[group].find(key)
+
+  def matches(self, group, relative_dir, filename, key):
+    # Whether find would return this file if it was in the index, for
+    # files that are not, like the ones of cached modules
+    return self.groups[group].matches(relative_dir, filename, key)
+
+class NameIndexGroup:
+  def __init__(self, extensions, index_name, normalize):
+    self.extensions = extensions
+    self.index_suffix = "/" + index_name if index_name else None
+    self.normalize = normalize
+    # normalized name -> set of file paths
+    self.names = {}
+    # sorted (reversed normalized path, file path)
+    self.suffixes = []
+    self.pending = []
+    # file path -> keys
+    self.files = {}
+
+  def getKeys(self, relative_dir, filename):
+    extension = extract_suffix(self.extensions, filename)
+    if not extension:
+      return None
+
+    normalized = self.normalize(
+      path.join(relative_dir, filename[:len(extension) * -1])
+    ).replace("\\", "/")
+    keys = [normalized]
+    if self.index_suffix and normalized.endswith(self.index_suffix):
+      keys.append(normalized[:-len(self.index_suffix)])
+    return keys
+
+  def matches(self, relative_dir, filename, key):
+    keys = self.getKeys(relative_dir, filename)
+    return bool(keys) and any(indexed.endswith(key) for indexed in keys)
+
+  def add(self, relative_dir, filename):
+    keys = self.getKeys(relative_dir, filename)
+    if not keys:
+      return
+
+    file_path = path.join(relative_dir, filename)
+    self.files[file_path] = keys
+    for key in keys:
+      name = key.rsplit("/", 1)[-1]
+      self.names.setdefault(name, set()).add(file_path)
+      self.pending.append((key[::-1], file_path))
+
+  def remove(self, relative_dir, filename):
+    file_path = path.join(relative_dir, filename)
+    keys = self.files.pop(file_path, None)
+    if not keys:
+      return
+
+    self.flush()
+    for key in keys:
+      name = key.rsplit("/", 1)[-1]
+      if name in self.names:
+        self.names[name].discard(file_path)
+        if not self.names[name]:
+          del self.names[name]
+
+      item = (key[::-1], file_path)
+      position = bisect.bisect_left(self.suffixes, item)
+      if position < len(self.suffixes) and self.suffixes[position] == item:
+        del self.suffixes[position]
+
+  def flush(self):
+    # Additions are sorted in one go before the next lookup
+    if not self.pending:
+      return
+
+    if len(self.pending) > 64:
+      self.suffixes = sorted(self.suffixes + self.pending)
+    else:
+      for item in self.pending:
+        bisect.insort(self.suffixes, item)
+    self.pending = []
+
+  def find(self, key):
+    self.flush()
+
+    # Files named exactly as the value come first
+    exact = sorted(self.names.get(key, [])) if "/" not in key else []
+    result = list(exact)
+    seen = set(exact)
+
+    reversed_key = key[::-1]
+    start = bisect.bisect_left(self.suffixes, (reversed_key,))
+    end = bisect.bisect_left(self.suffixes, (reversed_key + NameIndex.MAX_CHAR,))
+
+    for file_path in sorted(set(item[1] for item in self.suffixes[start:end])):
+      if file_path not in seen:
+        seen.add(file_path)
+        result.append(file_path)
+
+    return result
@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+from os import stat
+from .Stats import Stats
+
+class ParseCache:
+  # What was extracted from a file, kept while the file has the same
+  # mtime and size. There is one cache for each way of parsing files,
+  # shared by every project. Files removed from a FileIndex are dropped
+  # by the ExportIndex, the least recently used ones once there are more
+  # than max_entries
+  MAX_ENTRIES = 200000
+
+  caches = {}
+  lock = threading.Lock()
+
+  @staticmethod
+  def get(key):
+    with ParseCache.lock:
+      if key not in ParseCache.caches:
+        ParseCache.caches[key] = ParseCache()
+      return ParseCache.caches[key]
+
+  @staticmethod
+  def clear():
+    with ParseCache.lock:
+      ParseCache.caches = {}
+
+  def __init__(self, max_entries=None):
+    self.max_entries = max_entries or ParseCache.MAX_ENTRIES
+    # file path -> ((mtime, size), value), least recently used first
+    self.entries = OrderedDict()
+    self.lock = threading.Lock()
+
+  def statKey(self, file_path):
+    try:
+      file_stat = stat(file_path)
+    except OSError:
+      return None
+    return (file_stat.st_mtime, file_stat.st_size)
+
+  def isFresh(self, file_path):
+    with self.lock:
+      entry = self.entries.get(file_path)
+    return entry is not None and entry[0] == self.statKey(file_path)
+
+  def discard(self, file_path):
+    with self.lock:
+      self.entries.pop(file_path, None)
+
+  def map(self, pool, fn, file_paths, batch_size=64, token=None):
+    # Same as pool.map(fn, file_paths), but only the files that changed
+    # since they were parsed are sent to the pool
+    keys = [self.statKey(file_path) for file_path in file_paths]
+    with self.lock:
+      cached = [
+        key is not None and file_path in self.entries and
+          self.entries[file_path][0] == key
+        for file_path, key in zip(file_paths, keys)
+      ]
+      values = [
+        self.entries[file_path][1] if is_cached else None
+        for file_path, is_cached in zip(file_paths, cached)
+      ]
+      for file_path, is_cached in zip(file_paths, cached):
+        if is_cached:
+          self.entries.move_to_end(file_path)
+
+    hits = cached.count(True)
+    Stats.count("parse_cache_hits", hits)
+    Stats.count("parse_cache_misses", len(cached) - hits)
+
+    results = pool.map(
+      fn,
+      [
+        file_path
+        for file_path, is_cached in zip(file_paths, cached)
+        if not is_cached
+      ],
+      batch_size=batch_size,
+      token=token
+    )
+
+    for file_path, key, is_cached, value in zip(file_paths, keys, cached, values):
+      if not is_cached:
+        value = next(results)
+        if value is not None and key is not None:
+          with self.lock:
+            self.entries.pop(file_path, None)
+            self.entries[file_path] = (key, value)
+            while len(self.entries) > self.max_entries:
+              self.entries.popitem(last=False)
+
+      yield value
@@ -0,0 +1,97 @@
+import cProfile, io, pstats, re, sys, threading, time
+from os import path, makedirs
+
+class Profiler:
+  # Profiles the stages of one invocation with cProfile, the search on
+  # the worker thread as well as the insertion on the main thread, then
+  # writes the .prof file and a summary of the slowest functions
+  TOP = 40
+
+  armed = False
+  lock = threading.Lock()
+
+  @staticmethod
+  def arm():
+    # The next invocation is profiled
+    with Profiler.lock:
+      Profiler.armed = True
+
+  @staticmethod
+  def start(always=False):
+    # Returns a Profiler when the invocation has to be profiled
+    with Profiler.lock:
+      if not Profiler.armed and not always:
+        return None
+      Profiler.armed = False
+    return Profiler()
+
+  def __init__(self):
+    self.profile = cProfile.Profile()
+    self.started = time.time()
+    self.running = False
+
+  def runcall(self, fn, *args, **kwargs):
+    # Stages called from a stage that is already profiled, as when
+    # callbacks run right away, are part of it
+    if self.running:
+      return fn(*args, **kwargs)
+
+    try:
+      self.profile.enable()
+    except ValueError as error:
+      # Another profiler is running
+      print(
+        "SimpleImport: could not profile ({0})".format(error),
+        file=sys.stderr
+      )
+      return fn(*args, **kwargs)
+
+    self.running = True
+    try:
+      return fn(*args, **kwargs)
+    finally:
+      self.running = False
+      self.profile.disable()
+
+  def getSlug(self, value):
+    return re.sub(r"[^\w.-]+", "_", value).strip("_")[:40] or "empty"
+
+  def save(self, cache_dir, project, query, interpreter, top=TOP):
+    # Returns the path of the .prof file. The summary is written next to
+    # it with the .txt extension
+    folder = path.join(cache_dir, "profiles")
+    name = "{0}-{1}-{2}-{3}".format(
+      time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started)),
+      self.getSlug(path.basename(project)),
+      interpreter,
+      self.getSlug(query)
+    )
+    prof_path = path.join(folder, name + ".prof")
+
+    try:
+      if not path.isdir(folder):
+        makedirs(folder)
+
+      self.profile.dump_stats(prof_path)
+
+      stream = io.StringIO()
+      stream.write("Project: {0}\nQuery: {1}\nInterpreter: {2}\n".format(
+        project,
+        query,
+        interpreter
+      ))
+      stats = pstats.Stats(self.profile, stream=stream)
+      for sort in ("cumulative", "tottime"):
+        stream.write("\nTop {0} by {1} time\n".format(top, sort))
+        stats.sort_stats(sort).print_stats(top)
+
+      with open(path.join(folder, name + ".txt"), "w") as summary:
+        summary.write(stream.getvalue())
+    except (IOError, OSError) as error:
+      print(
+        "SimpleImport: could not write the profile ({0})".format(error),
+        file=sys.stderr
+      )
+      return None
+
+    return prof_path
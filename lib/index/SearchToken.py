@@ -0,0 +1,25 @@
+import time
+
+class SearchCancelled(Exception):
+  pass
+
+class SearchToken:
+  # Shared by every step of a search so it can be stopped when a newer
+  # search starts or when it runs out of time
+  def __init__(self, time_budget=None):
+    self.cancelled = False
+    self.started_at = time.time()
+    self.deadline = self.started_at + time_budget if time_budget else None
+
+  def cancel(self):
+    self.cancelled = True
+
+  def isExpired(self):
+    return self.deadline is not None and time.time() > self.deadline
+
+  def isStopped(self):
+    return self.cancelled or self.isExpired()
+
+  def check(self):
+    if self.isStopped():
+      raise SearchCancelled()
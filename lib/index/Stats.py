@@ -0,0 +1,150 @@
+import sys, threading, time
+from collections import deque
+from contextlib import contextmanager
+
+class Stats:
+  # Time spent in each phase of an invocation and counters of the work
+  # it did. start() begins an invocation and finish() adds it to the
+  # history the percentiles are computed from. Only the work done in
+  # this process is counted, not the one of process workers
+  HISTORY_SIZE = 100
+  SLOW_LOG_SIZE = 20
+
+  lock = threading.Lock()
+  started = None
+  # phase -> seconds, counter -> amount, of the current invocation
+  timings = {}
+  counters = {}
+  # phase or counter -> values of the last invocations
+  history = { "timings": {}, "counters": {} }
+  slow_log = deque(maxlen=SLOW_LOG_SIZE)
+  invocations = 0
+
+  @staticmethod
+  def start():
+    with Stats.lock:
+      Stats.started = time.perf_counter()
+      Stats.timings = {}
+      Stats.counters = {}
+
+  @staticmethod
+  def add(phase, seconds):
+    with Stats.lock:
+      Stats.timings[phase] = Stats.timings.get(phase, 0) + seconds
+
+  @staticmethod
+  def count(name, amount=1):
+    with Stats.lock:
+      Stats.counters[name] = Stats.counters.get(name, 0) + amount
+
+  @staticmethod
+  @contextmanager
+  def timer(phase):
+    # Nested and repeated phases add up, a phase counts the time of the
+    # phases it contains
+    start = time.perf_counter()
+    try:
+      yield
+    finally:
+      Stats.add(phase, time.perf_counter() - start)
+
+  @staticmethod
+  def mark(phase):
+    # Records the time elapsed since start()
+    with Stats.lock:
+      if Stats.started is not None:
+        Stats.timings[phase] = time.perf_counter() - Stats.started
+
+  @staticmethod
+  def finish(tags=None, slow_threshold=0):
+    # Returns the invocation, slow_threshold is in milliseconds
+    with Stats.lock:
+      if Stats.started is None:
+        return None
+
+      invocation = {
+        "time": time.time(),
+        "tags": tags or {},
+        "timings": Stats.timings,
+        "counters": Stats.counters
+      }
+      Stats.started = None
+      Stats.timings = {}
+      Stats.counters = {}
+      Stats.invocations += 1
+
+      # Phases and counters missing from the invocation count as 0
+      for kind, history in Stats.history.items():
+        for name in set(history) | set(invocation[kind]):
+          if name not in history:
+            history[name] = deque(maxlen=Stats.HISTORY_SIZE)
+          history[name].append(invocation[kind].get(name, 0))
+
+      total = invocation["timings"].get("total", 0) * 1000
+      if slow_threshold and total >= slow_threshold:
+        Stats.slow_log.append(invocation)
+        print(
+          "SimpleImport: slow query {0}".format(Stats.format(invocation)),
+          file=sys.stderr
+        )
+
+      return invocation
+
+  @staticmethod
+  def percentile(values, fraction):
+    values = sorted(values)
+    if not values:
+      return 0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+  @staticmethod
+  def format(invocation):
+    # "'value' in project (javascript): total 812ms, exports 640ms..."
+    tags = invocation["tags"]
+    parts = [
+      "{0} {1:.0f}ms".format(phase, seconds * 1000)
+      for phase, seconds in sorted(
+        invocation["timings"].items(),
+        key=lambda item: -item[1]
+      )
+    ] + [
+      "{0} {1}".format(name, amount)
+      for name, amount in sorted(invocation["counters"].items())
+    ]
+    return "{0} in {1} ({2}): {3}".format(
+      repr(tags.get("query", "")),
+      tags.get("project", ""),
+      tags.get("interpreter", ""),
+      ", ".join(parts)
+    )
+
+  @staticmethod
+  def report():
+    # Last value and percentiles of every phase and counter
+    with Stats.lock:
+      report = {
+        "invocations": Stats.invocations,
+        "slow": list(Stats.slow_log)
+      }
+      for kind, history in Stats.history.items():
+        report[kind] = [
+          {
+            "name": name,
+            "samples": len(values),
+            "last": values[-1],
+            "p50": Stats.percentile(values, 0.5),
+            "p95": Stats.percentile(values, 0.95)
+          }
+          for name, values in sorted(history.items())
+        ]
+      return report
+
+  @staticmethod
+  def clear():
+    with Stats.lock:
+      Stats.started = None
+      Stats.timings = {}
+      Stats.counters = {}
+      Stats.history = { "timings": {}, "counters": {} }
+      Stats.slow_log.clear()
+      Stats.invocations = 0
@@ -0,0 +1,197 @@
+import fnmatch, os, re, threading
+from os import path, stat
+from .GitIgnore import GitIgnore
+from .Stats import Stats
+
+class Walker:
+  # Lists project folders. Skipped are the ignored paths, the folders and
+  # files matching Sublime's folder_exclude_patterns and
+  # file_exclude_patterns and, with use_gitignore, what .gitignore files
+  # and .git/info/exclude ignore. Symlinked folders are only followed
+  # with follow_symlinks, and never when they point to a folder above
+  # them
+  GITIGNORE = ".gitignore"
+
+  def __init__(
+    self,
+    root,
+    ignored_paths=(),
+    folder_exclude_patterns=(),
+    file_exclude_patterns=(),
+    use_gitignore=False,
+    follow_symlinks=False
+  ):
+    self.root = root
+    self.ignored_paths = set(path.normpath(epath) for epath in ignored_paths)
+    self.folder_regex = self.compilePatterns(folder_exclude_patterns)
+    self.file_regex = self.compilePatterns(file_exclude_patterns)
+    self.use_gitignore = use_gitignore
+    self.follow_symlinks = follow_symlinks
+    # relative dir -> (mtime, GitIgnore)
+    self.gitignores = {}
+    # relative dir -> [(relative dir of a .gitignore, GitIgnore)]
+    self.rules = {}
+    self.lock = threading.Lock()
+
+  def compilePatterns(self, patterns):
+    if not patterns:
+      return None
+    return re.compile("|".join(
+      "(?:" + fnmatch.translate(pattern) + ")" for pattern in patterns
+    ))
+
+  def isExcluded(self, relative_path, name, is_dir):
+    # Ignored paths and exclude patterns, without the .gitignore rules
+    if is_dir:
+      return relative_path in self.ignored_paths or bool(
+        self.folder_regex and self.folder_regex.match(name)
+      )
+    return bool(self.file_regex and self.file_regex.match(name))
+
+  def loadGitIgnore(self, relative_dir, file_path):
+    try:
+      mtime = stat(file_path).st_mtime
+    except OSError:
+      return None
+
+    cached = self.gitignores.get(relative_dir)
+    if not cached or cached[0] != mtime:
+      cached = (mtime, GitIgnore.load(file_path))
+      self.gitignores[relative_dir] = cached
+    return cached[1]
+
+  def getRules(self, relative_dir, has_gitignore=None):
+    # Rules of the .gitignore files of the folder and of its parents,
+    # from the farthest to the closest
+    if relative_dir == ".":
+      rules = []
+      exclude = self.loadGitIgnore(
+        "$exclude",
+        path.join(self.root, ".git", "info", "exclude")
+      )
+      if exclude:
+        rules.append((".", exclude))
+    else:
+      parent = path.dirname(relative_dir) or "."
+      rules = self.rules.get(parent)
+      if rules is None:
+        rules = self.getRules(parent)
+
+    if has_gitignore is None:
+      has_gitignore = path.isfile(
+        path.join(self.root, relative_dir, Walker.GITIGNORE)
+      )
+
+    if has_gitignore:
+      gitignore = self.loadGitIgnore(
+        relative_dir,
+        path.join(self.root, relative_dir, Walker.GITIGNORE)
+      )
+      if gitignore:
+        rules = rules + [(relative_dir, gitignore)]
+
+    self.rules[relative_dir] = rules
+    return rules
+
+  def isGitIgnored(self, rules, relative_path, is_dir):
+    for base, gitignore in reversed(rules):
+      if base == ".":
+        key = relative_path
+      else:
+        key = relative_path[len(base) + 1:]
+
+      ignored = gitignore.match(key.replace("\\", "/"), is_dir)
+      if ignored is not None:
+        return ignored
+    return False
+
+  def isLoop(self, relative_path):
+    # A symlinked folder pointing to one of the folders above it, also
+    # through other symlinked folders, as in a/b -> ../b and b/a -> ../a
+    target = path.realpath(path.join(self.root, relative_path))
+    parent = path.realpath(path.dirname(path.join(self.root, relative_path)))
+    if parent == target or parent.startswith(target + os.sep):
+      return True
+
+    relative_dir = path.dirname(relative_path)
+    while True:
+      if path.realpath(path.join(self.root, relative_dir)) == target:
+        return True
+      if not relative_dir:
+        return False
+      relative_dir = path.dirname(relative_dir)
+
+  def listDir(self, dirpath):
+    # [(name, is_dir, is_symlink)], with os.scandir when there is one
+    if hasattr(os, "scandir"):
+      entries = []
+      for entry in os.scandir(dirpath):
+        try:
+          entries.append((entry.name, entry.is_dir(), entry.is_symlink()))
+        except OSError:
+          continue
+      return entries
+
+    return [
+      (
+        name,
+        path.isdir(path.join(dirpath, name)),
+        path.islink(path.join(dirpath, name))
+      )
+      for name in os.listdir(dirpath)
+    ]
+
+  def scanDir(self, relative_dir):
+    # Returns (mtime, folders, files) or None when it can not be read
+    dirpath = path.join(self.root, relative_dir)
+    try:
+      mtime = stat(dirpath).st_mtime
+      entries = self.listDir(dirpath)
+    except OSError:
+      return None
+
+    Stats.count("files_visited", len(entries))
+    with self.lock:
+      rules = None
+      if self.use_gitignore:
+        rules = self.getRules(
+          relative_dir,
+          any(name == Walker.GITIGNORE for name, _, _ in entries)
+        )
+
+    dirs = []
+    files = []
+    for name, is_dir, is_symlink in entries:
+      relative_path = name if relative_dir == "." else path.join(relative_dir, name)
+
+      if self.isExcluded(relative_path, name, is_dir) or (
+        rules and self.isGitIgnored(rules, relative_path, is_dir)
+      ):
+        continue
+
+      if is_dir:
+        if is_symlink and (
+          not self.follow_symlinks or self.isLoop(relative_path)
+        ):
+          continue
+
+        dirs.append(name)
+      else:
+        files.append(name)
+
+    return mtime, dirs, files
+
+  def walk(self, relative_dir="."):
+    # Like os.walk(topdown=True) with paths relative to the root. Folders
+    # removed from the yielded list are not visited
+    scanned = self.scanDir(relative_dir)
+    if not scanned:
+      return
+
+    mtime, dirs, files = scanned
+    yield relative_dir, dirs, files
+
+    for dirname in dirs:
+      child = dirname if relative_dir == "." else path.join(relative_dir, dirname)
+      for item in self.walk(child):
+        yield item
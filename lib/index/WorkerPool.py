@@ -0,0 +1,138 @@
+import sys, threading
+
+try:
+  from concurrent import futures
+except ImportError:
+  futures = None
+
+def runBatch(fn, items):
+  return [fn(item) for item in items]
+
+class WorkerPool:
+  # Runs a function over many items in a thread or process pool, in
+  # batches, and gives the results back in the order of the items. When a
+  # process pool can not be started or breaks, a thread pool takes over,
+  # and when a thread pool does, everything runs serially
+  pools = {}
+  # Backends that failed once are not tried again
+  broken = set()
+  lock = threading.Lock()
+
+  BACKENDS = ("thread", "process")
+
+  @staticmethod
+  def get(workers=0, backend="thread"):
+    if backend not in WorkerPool.BACKENDS:
+      print(
+        "SimpleImport: Unknown worker backend {0}".format(backend),
+        file=sys.stderr
+      )
+      backend = "thread"
+
+    if not futures or not workers or workers < 2:
+      workers = 0
+
+    key = (backend, workers)
+    with WorkerPool.lock:
+      if key not in WorkerPool.pools:
+        WorkerPool.pools[key] = WorkerPool(workers, backend)
+      return WorkerPool.pools[key]
+
+  @staticmethod
+  def shutdown():
+    with WorkerPool.lock:
+      pools = list(WorkerPool.pools.values())
+      WorkerPool.pools = {}
+
+    for pool in pools:
+      pool.close()
+
+  def __init__(self, workers, backend):
+    self.workers = workers
+    self.backend = backend
+    self.executor = None
+    self.lock = threading.Lock()
+
+  def isSerial(self):
+    return not self.workers or self.backend in WorkerPool.broken
+
+  def getExecutor(self):
+    with self.lock:
+      if not self.executor:
+        if self.backend == "process":
+          self.executor = futures.ProcessPoolExecutor(self.workers)
+        else:
+          self.executor = futures.ThreadPoolExecutor(self.workers)
+      return self.executor
+
+  def close(self):
+    with self.lock:
+      executor, self.executor = self.executor, None
+
+    if executor:
+      executor.shutdown(wait=False)
+
+  def fail(self, error):
+    print("SimpleImport: {0} workers failed, running {1} ({2})".format(
+      self.backend,
+      "in threads" if self.backend == "process" else "serially",
+      error
+    ), file=sys.stderr)
+    WorkerPool.broken.add(self.backend)
+    self.close()
+
+  def getFallback(self):
+    # The thread pool replacing a broken process pool
+    if self.backend == "process" and self.workers and (
+      self.backend in WorkerPool.broken
+    ):
+      return WorkerPool.get(self.workers, "thread")
+    return None
+
+  def map(self, fn, items, batch_size=64, token=None):
+    # Yields fn(item) for every item, in order. fn and the items have to
+    # be picklable for the process backend. The token is checked before
+    # every batch
+    batches = [
+      items[start:start + batch_size]
+      for start in range(0, len(items), batch_size)
+    ]
+
+    pending = []
+    if not self.isSerial() and len(batches) > 1:
+      try:
+        executor = self.getExecutor()
+        pending = [executor.submit(runBatch, fn, batch) for batch in batches]
+      except Exception as error:
+        self.fail(error)
+        pending = []
+
+    fallback = self.getFallback()
+    if fallback and not pending:
+      for result in fallback.map(fn, items, batch_size, token):
+        yield result
+      return
+
+    try:
+      for index, batch in enumerate(batches):
+        if token:
+          token.check()
+
+        results = None
+        if pending:
+          try:
+            results = pending[index].result()
+          except Exception as error:
+            self.fail(error)
+            for future in pending:
+              future.cancel()
+            pending = []
+
+        if results is None:
+          results = runBatch(fn, batch)
+
+        for result in results:
+          yield result
+    finally:
+      for future in pending:
+        future.cancel()
@@ -0,0 +1,32 @@
+from .FileIndex import FileIndex
+from .ExportIndex import ExportIndex
+from .NameIndex import NameIndex
+from .ModuleCache import ModuleCache
+from .ModuleStore import ModuleStore
+from .Fingerprint import Fingerprint
+from .SearchToken import SearchToken, SearchCancelled
+from .WorkerPool import WorkerPool
+from .ParseCache import ParseCache
+from .GitIgnore import GitIgnore
+from .Walker import Walker
+from .GitFiles import GitFiles
+from .Stats import Stats
+from .Profiler import Profiler
+
+__all__ = [
+  "FileIndex",
+  "ExportIndex",
+  "NameIndex",
+  "ModuleCache",
+  "ModuleStore",
+  "Fingerprint",
+  "SearchToken",
+  "SearchCancelled",
+  "WorkerPool",
+  "ParseCache",
+  "GitIgnore",
+  "Walker",
+  "GitFiles",
+  "Stats",
+  "Profiler"
+]
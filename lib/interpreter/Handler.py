@@ -27,14 +27,3 @@ class Handler:
     self.name = name
     self.matchers = self.createMatchers(matchers, keys)
     self.force = force
-
-  def match(self, simport):
-    for matcher in self.matchers:
-      match = re.search(matcher, simport.context)
-      if match:
-        return match
-
-  def getStatements(self, simport):
-    match = self.match(simport)
-
-    return match.groupdict() if match else {}
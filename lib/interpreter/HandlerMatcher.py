@@ -0,0 +1,61 @@
+import re
+
+class HandlerMatcher:
+  # Matches a context against the matchers of every handler with a single
+  # regex. Each matcher becomes a lookahead alternative, in handler order,
+  # so the result is the same as trying each matcher with re.search one
+  # after the other
+  NAMED_GROUP_REGEX = re.compile(r"\(\?P(<|=)(\w+)")
+
+  def __init__(self, handlers):
+    self.handlers = handlers
+    # (handler, matcher, wrapper group, { combined group: group })
+    self.alternatives = []
+    self.by_wrapper = {}
+    self.regex = None
+
+    patterns = []
+    for handler in handlers:
+      for matcher in handler.matchers:
+        index = len(self.alternatives)
+        prefix = "m{0}_".format(index)
+        groups = dict(
+          (prefix + name, name) for name in matcher.groupindex
+        )
+        wrapper = "m{0}".format(index)
+
+        patterns.append(r"(?=[\s\S]*?(?P<{0}>{1}))".format(
+          wrapper,
+          HandlerMatcher.NAMED_GROUP_REGEX.sub(
+            lambda match: "(?P" + match.group(1) + prefix + match.group(2),
+            matcher.pattern
+          )
+        ))
+        self.alternatives.append((handler, matcher, wrapper, groups))
+        self.by_wrapper[wrapper] = self.alternatives[-1]
+
+    if patterns:
+      try:
+        self.regex = re.compile(r"\A(?:{0})".format("|".join(patterns)))
+      except (re.error, AssertionError, OverflowError):
+        # Too many groups for this Python version, match one by one
+        self.regex = None
+
+  def match(self, context):
+    # Returns (handler, (start, end), statements) or None
+    if not self.regex:
+      for handler, matcher, wrapper, groups in self.alternatives:
+        match = matcher.search(context)
+        if match:
+          return handler, match.span(), match.groupdict()
+      return None
+
+    match = self.regex.match(context)
+    if not match:
+      return None
+
+    # The wrapper group of the alternative that matched closes last
+    handler, matcher, wrapper, groups = self.by_wrapper[match.lastgroup]
+    return handler, match.span(wrapper), dict(
+      (groups[name], match.group(name)) for name in groups
+    )
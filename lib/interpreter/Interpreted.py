@@ -13,6 +13,17 @@ class Interpreted:
     self.insert_type = Interpreted.IT_REPLACE
     self.removed = False
 
+  def getEdit(self):
+    # [start, end, characters] to apply to the file
+    if self.insert_type == Interpreted.IT_INSERT:
+      return [0, 0, self.__str__()]
+
+    return [
+      self.simport.region.begin(),
+      self.simport.region.end(),
+      self.__str__()
+    ]
+
   def remove(self):
     self.removed = True
 
@@ -1,8 +1,10 @@
 import re
-from sublime import Region
-from os import path, walk
+from ..Region import Region
+from os import path
 from ..utils import joinStr, ucfirst
+from ..index import FileIndex, NameIndex, SearchCancelled
 from .Interpreted import Interpreted
+from .HandlerMatcher import HandlerMatcher
 from ..utils import endswith
 from ..utils import extract_suffix
 from ..SIMode import SIMode
@@ -18,10 +20,15 @@ class Interpreter:
 
   def __init__(self):
     self.find_imports_regex = None
-    self.find_exports_regex = None
+    # What may appear between imports at the top of a file. Without it
+    # the whole file is searched for imports
+    self.find_imports_skip_regex = None
     self.defaultHandler = None
     self.syntax = Interpreter.parseInterpreterName(type(self).__name__)
     self.handlers = []
+    self.handler_matcher = None
+    # File name that stands for its folder, as in "folder/index.js"
+    self.index_file_name = "index"
     self.keys = {}
     self.settings = {}
     self.__settings = {}
@@ -43,6 +50,7 @@ class Interpreter:
 
   def afterRun(self):
     self.__settings = self.settings.copy()
+    self.handler_matcher = HandlerMatcher(self.handlers)
 
     if not self.syntax:
       print("Simple Import Error -> {0}".format(message))
@@ -74,19 +82,22 @@ class Interpreter:
     self.parseStatements(interpreted.statements)
 
   def getHandlerBySelection(self, simport):
-    handler = None
-    for n_handler in self.handlers:
-      match = n_handler.match(simport)
-      if match:
-        simport.region = Region(simport.context_region.end() - len(match.group(0)), simport.context_region.end())
-        return n_handler
+    return self.matchHandler(simport)[0]
 
-    return self.getDefaultHandler()
+  def matchHandler(self, simport):
+    # Returns the handler and its statements with a single match
+    match = self.handler_matcher.match(simport.context)
+    if match:
+      handler, span, statements = match
+      simport.region = Region(simport.context_region.end() - (span[1] - span[0]), simport.context_region.end())
+      return handler, statements
+
+    return self.getDefaultHandler(), {}
 
   def interprete(self, simport, mode=SIMode.REPLACE_MODE):
-    handler = self.getHandlerBySelection(simport)
+    handler, statements = self.matchHandler(simport)
     if handler:
-      interpreted = Interpreted(self, handler.getStatements(simport), handler.name, simport)
+      interpreted = Interpreted(self, statements, handler.name, simport)
     else:
       interpreted = Interpreted(self, {}, None, simport)
 
@@ -105,22 +116,13 @@ class Interpreter:
     interpreted.statements['module'] = value
     self.parseStatements(interpreted.statements)
 
+  def mergeInterpreted(self, interpreted_list, mode=SIMode.REPLACE_MODE):
+    # Imports of the same module to insert at once, as one import
+    return interpreted_list
+
   def parseBeforeInsert(self, interpreted, view_imports, mode=SIMode.REPLACE_MODE):
     return interpreted
 
-  def buildRegexForFiles(self, value):
-    return r"({0}|{1})(\/index)?({2})$".format(
-      value,
-      self.normalizeValue(value),
-      "|".join(self.getSetting('extensions', [])))
-
-  def buildRegexForExtraFiles(self, value):
-    return r"({0}|{1})({2})$".format(
-      value,
-      self.normalizeValue(value),
-      '|'.join(self.getSetting('extra_extensions', []))
-    )
-
   def isValidFile(self, filename):
     return endswith(self.getSetting('extensions', []), filename)
 
@@ -130,21 +132,6 @@ class Interpreter:
   def normalizeValue(self, value):
     return re.sub(r"-|\.", "", value).lower()
 
-  def matchFilePathWithRegex(self, filename, regex, dirpath=None, is_extra=False):
-    if dirpath:
-      extensions = self.getSetting('extensions' if not is_extra else 'extra_extensions', [])
-
-      extension = extract_suffix(extensions, filename)
-
-      if not extension:
-        return False
-
-      normalizedValued = self.normalizeValue(
-        path.join(dirpath, filename[:len(extension) * -1])
-      )
-      return re.search(regex, "{0}{1}".format(normalizedValued, extension), re.IGNORECASE)
-    return re.search(regex, filename, re.IGNORECASE)
-
   def getHandlerByName(self, handlerName):
     for handler in self.handlers:
       if handler.name == handlerName:
@@ -155,45 +142,211 @@ class Interpreter:
       return interpreted.statements['module']
     return False
 
+  def findImportsInHeader(self, read, size, chunk_size=16384):
+    # Returns (begin, end, text) for every import in the block at the top
+    # of the file. read(n) returns the first n characters; it is called
+    # with growing sizes until the end of the block is found. When the
+    # block has no import the whole file is searched
+    regex = re.compile(self.find_imports_regex)
+    skip_regex = re.compile(self.find_imports_skip_regex)
+    limit = chunk_size
+
+    while True:
+      text = read(min(limit, size))
+      imports = []
+      pos = 0
+
+      while pos < len(text):
+        match = regex.match(text, pos) or skip_regex.match(text, pos)
+        if not match or match.end() == pos:
+          break
+
+        if match.re is regex:
+          imports.append((match.start(), match.end(), match.group(0)))
+        pos = match.end()
+
+      # Stop when the block ended far enough from the end of the chunk
+      # not to be cut in the middle of a statement
+      if limit >= size or len(text) - pos > chunk_size / 4:
+        break
+
+      limit *= 4
+
+    if imports:
+      return imports
+
+    text = read(size)
+    if "import" not in text:
+      return []
+
+    return [
+      (match.start(), match.end(), match.group(0))
+      for match in regex.finditer(text)
+    ]
+
+  def findImportsInText(self, text):
+    # Same as the command does on a view, for text read from a file
+    if not self.find_imports_regex:
+      return []
+
+    if self.find_imports_skip_regex:
+      return self.findImportsInHeader(lambda size: text[:size], len(text))
+
+    return [
+      (match.start(), match.end(), match.group(0))
+      for match in re.finditer(self.find_imports_regex, text)
+    ]
+
+  def findMissingIdentifiers(self, text):
+    # Names used in the text that are neither declared nor imported
+    return []
+
   def findAllModules(self, project_path):
     return []
 
-  def findByValue(self, value, project_path, omit_files=None):
-    result = {}
-    regex_for_files = self.buildRegexForFiles(value)
-    regex_for_extra_files = self.buildRegexForExtraFiles(value)
-    ignored_paths = [
-      path.normpath(epath)
-      for epath in self.getSetting("ignore", [])
-    ]
+  def getFileIndex(self, project_path, token=None):
+    index = FileIndex.get(
+      project_path,
+      self.getSetting("ignore", []),
+      refresh_interval=self.getSetting("index_refresh_interval", 5),
+      exclude={
+        "folder_exclude_patterns": self.getSetting("folder_exclude_patterns", []),
+        "file_exclude_patterns": self.getSetting("file_exclude_patterns", []),
+        "use_gitignore": bool(self.getSetting("use_gitignore", True)),
+        "follow_symlinks": bool(self.getSetting("follow_symlinks", False))
+      },
+      file_source=self.getSetting("file_source", "git")
+    )
+    index.refresh(token=token)
+    return index
+
+  def findByValue(self, value, project_path, omit_files=None, token=None):
+    return self.findByValues(
+      [value],
+      project_path,
+      omit_files=omit_files,
+      token=token
+    )[value]
+
+  def findByValues(self, values, project_path, omit_files=None, token=None):
+    # Resolves every value in a single pass over the project
+    values = self.uniqueValues(values)
+    return self.collectResults(
+      values,
+      self.iterByValues(values, project_path, omit_files=omit_files, token=token)
+    )
 
+  def uniqueValues(self, values):
+    result = []
+    for value in values:
+      if value not in result:
+        result.append(value)
+    return result
 
-    for dirpath, dirnames, filenames in walk(project_path, topdown=True):
-      relative_dir = path.relpath(dirpath, project_path)
-      # Change excluding folders
-      dirnames[:] = [dirname for dirname in dirnames if path.normpath(path.join(relative_dir, dirname)) not in ignored_paths]
-      for filename in filenames:
-        if omit_files and path.join(relative_dir, filename) in omit_files:
-          continue
+  def iterByValues(self, values, project_path, omit_files=None, token=None):
+    # Yields (value, key, option) as soon as they are found. Options
+    # grouped by module or file are yielded as (name, [values])
+    names = self.getNameIndex(self.getFileIndex(project_path, token))
 
-        # Find files with name equal the value
-        if self.matchFilePathWithRegex(
-          filename, regex_for_files, dirpath=relative_dir
-        ):
-          if "files" not in result:
-            result["files"] = []
+    for value in values:
+      if token:
+        token.check()
 
-          result["files"].append(path.join(relative_dir, filename))
-        elif self.matchFilePathWithRegex(
-          filename, regex_for_extra_files, dirpath=relative_dir, is_extra=True
+      key = self.getFileQueryKey(value)
+      if key is None:
+        continue
+
+      files = names.find("files", key)
+      for file_path in files:
+        if not omit_files or file_path not in omit_files:
+          yield value, "files", file_path
+
+      for file_path in names.find("extra_files", key):
+        if file_path not in files and (
+          not omit_files or file_path not in omit_files
         ):
-          if "extra_files" not in result:
-            result["extra_files"] = []
+          yield value, "extra_files", file_path
+
+  def getNameIndex(self, file_index):
+    return NameIndex.get(
+      file_index,
+      self.getSetting('extensions', []),
+      self.getSetting('extra_extensions', []),
+      self.index_file_name,
+      self.normalizeValue
+    )
 
-          result["extra_files"].append(path.join(relative_dir, filename))
-          pass
+  def getFileQueryKey(self, value):
+    # Files match when their normalized path, without extension and
+    # without a trailing index file name, ends with this key. None
+    # matches nothing
+    return self.normalizeValue(value).replace("\\", "/")
+
+  def collectResults(self, values, results, results_by_value=None):
+    # Stops collecting a value once enough options match it exactly, and
+    # everything once the search token is stopped. Whatever was found
+    # until then is returned
+    if results_by_value is None:
+      results_by_value = {}
+
+    for value in values:
+      if value not in results_by_value:
+        results_by_value[value] = {}
+
+    max_exact_matches = self.getSetting("max_exact_matches", 0)
+    exact_matches = dict((value, 0) for value in values)
+    done = set()
+
+    try:
+      for value, key, option in results:
+        if value in done:
+          continue
 
-    return result
+        self.addResult(results_by_value[value], key, option)
+
+        if max_exact_matches and self.isExactMatch(value, key, option):
+          exact_matches[value] += 1
+          if exact_matches[value] >= max_exact_matches:
+            done.add(value)
+            if len(done) == len(values):
+              break
+    except SearchCancelled:
+      pass
+    finally:
+      results.close()
+
+    return results_by_value
+
+  def addResult(self, result, key, option):
+    if isinstance(option, tuple):
+      name, values = option
+      if key not in result:
+        result[key] = {}
+
+      if name not in result[key]:
+        result[key][name] = []
+
+      result[key][name] += values
+    else:
+      if key not in result:
+        result[key] = []
+
+      result[key].append(option)
+
+  def isExactMatch(self, value, key, option):
+    if isinstance(option, tuple):
+      return value in option[1]
+
+    name = path.basename(option)
+    extensions = self.getSetting('extensions', []) + self.getSetting('extra_extensions', [])
+    extension = extract_suffix(extensions, name)
+    if extension:
+      name = name[:-len(extension)]
+
+    if name == self.index_file_name:
+      name = path.basename(path.dirname(option))
+
+    return self.normalizeValue(name) == self.normalizeValue(value)
 
   def parsePath(self, path):
     if path[:2] == "./" or path[:3] == "../":
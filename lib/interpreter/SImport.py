@@ -1,13 +1,26 @@
-import re
-from sublime import Region
+from ..Region import Region
 class SImport:
+  SEPARATORS = "{}()<>.;"
+
   @staticmethod
   def getExpressionInContext(expression, context):
-    match = re.search(r"[^\{{\}}\(\)\<\>\.;\s]*{0}$".format(expression), context)
+    # Extend the expression backwards up to a separator or a whitespace.
+    # The selection is compared as plain text, never as a regex
+    if context.endswith("\n") and not expression.endswith("\n"):
+      context = context[:-1]
+
+    if not context.endswith(expression):
+      return expression
+
+    start = len(context) - len(expression)
+    while (
+      start > 0 and
+      context[start - 1] not in SImport.SEPARATORS and
+      not context[start - 1].isspace()
+    ):
+      start -= 1
 
-    if match:
-      return match.group(0)
-    return expression
+    return context[start:]
 
   def __init__(self, expression, context, region, context_region):
     self.expression = self.getExpressionInContext(expression, context)
@@ -1,19 +1,31 @@
-import re, json
-from sublime import Region
-from os import path, walk
-from ..utils import joinStr, endswith, extract_prefix
+import re, json, sys
+from functools import partial
+from ..Region import Region
+from os import path
+from ..utils import joinStr, endswith
 from ..interpreter import *
+from ..index import ExportIndex, ModuleCache, ModuleStore, Fingerprint, WorkerPool
+from ..index import NameIndex, ParseCache, Stats, Walker
+from ..lexers import readExports, readModuleExports, SourceReader
+from ..lexers import JavascriptIdentifierLexer
 from ..SIMode import SIMode
 
 class JavascriptInterpreter(Interpreter):
 
-  cachedModules = {}
+  cachedModules = ModuleStore()
+  # project path -> (fingerprint, modules)
+  projectModules = {}
 
   def run(self):
 
     self.find_imports_regex = r"(import[\s\n]+((?:(?!from|;)[\s\S])*)[\s\n]+from[\s]+[\"\']([^\"\']+)[\"\'](;?))"
-    self.find_exports_regex = r"(export\s+(?:const|let|var|function|class)\s+(?P<value>[\w]+)|exports\.(?P<value2>[\w]+)\s*=|module.exports\s*=\s*(?P<value3>[\w]+))"
-    self.find_exports_list_regex = r"export\s+(\{[^\}]+\})"
+    self.find_imports_skip_regex = (
+      r"\s+|//[^\n]*|/\*[\s\S]*?\*/|#![^\n]*|"
+      r"\"[^\"\n]*\";?|\'[^\'\n]*\';?|"
+      r"import\s+[\"\'][^\"\']+[\"\'];?|"
+      r"export\s+(?:\*|\{[^\}]*\})\s+from\s+[\"\'][^\"\']+[\"\'];?|"
+      r"(?:const|let|var)\s+[^;=\n]+=\s*require\([^\)]*\)[^;\n]*;?"
+    )
 
     keys = {
       "variable": "[^\s]+",
@@ -263,26 +275,43 @@ class JavascriptInterpreter(Interpreter):
 
     return import_str
 
+  def mergeInterpreted(self, interpreted_list, mode=SIMode.REPLACE_MODE):
+    # Only imports added at the top are merged, selections replaced by
+    # their import stay apart
+    if mode != SIMode.PUSH_MODE and mode != SIMode.PANEL_MODE:
+      return interpreted_list
+
+    merged = []
+    by_module = {}
+    for interpreted in interpreted_list:
+      module = interpreted.statements.get('module')
+      if not interpreted.handler_name.startswith('import') or not module:
+        merged.append(interpreted)
+      elif module in by_module:
+        Handler.joinStatements(
+          by_module[module].statements,
+          interpreted.statements
+        )
+      else:
+        by_module[module] = interpreted
+        merged.append(interpreted)
+
+    return merged
+
   def parseBeforeInsert(self, interpreted, view_imports, mode=SIMode.REPLACE_MODE):
+    # Regions are not adjusted here: every edit is applied at once, in
+    # reverse order, against the offsets of the untouched buffer
     modifiedImports = []
     shouldAppendInterpreted = True
 
     if interpreted.handler_name.startswith('import'):
-      regex = r"^{0}({1})?$".format(
-        interpreted.statements['module'],
-        "|".join(self.getSetting('remove_extensions'))
-      )
-
       for vimport in view_imports:
-        shouldAdjustRegion = False
-
         if vimport.statements['module'] == interpreted.statements['module']:
           Handler.joinStatements(vimport.statements, interpreted.statements)
           vimport.insert_type = Interpreted.IT_REPLACE_IMPORT
 
           modifiedImports.append(vimport)
           shouldAppendInterpreted = False
-          shouldAdjustRegion = True
         elif 'submodules' in interpreted.statements:
           for submodule in interpreted.statements['submodules']:
             if 'submodules' in vimport.statements:
@@ -294,62 +323,57 @@ class JavascriptInterpreter(Interpreter):
               ):
                 vimport.remove()
 
-              modifiedImports.append(vimport)
-              shouldAdjustRegion = True
-
-        if shouldAdjustRegion:
-          # Adjust region
-          for modifiedImport in modifiedImports:
-            context_region = modifiedImport.simport.context_region
-            if context_region.end() < vimport.simport.context_region.begin():
-              # New length minus initial length
-              import_text = modifiedImport.__str__()
-              newLength = len(import_text) + max(0, import_text.count("\n") - 1)
-              initialLength = context_region.end() - context_region.begin()
-              lengthDiff = newLength - initialLength
-
-              new_region = Region(
-                vimport.simport.context_region.begin() + lengthDiff,
-                vimport.simport.context_region.end() + lengthDiff
-              )
-
-              vimport.simport.context_region = new_region
-              vimport.simport.region = new_region
+              if vimport not in modifiedImports:
+                modifiedImports.append(vimport)
 
     if mode == SIMode.PUSH_MODE or mode == SIMode.PANEL_MODE:
       interpreted.insert_type = Interpreted.IT_INSERT
 
       if len(view_imports):
         lastImport = view_imports[-1]
+        region_end = lastImport.simport.context_region.end()
 
-        if lastImport:
-          context_region = vimport.simport.context_region
-          if vimport in modifiedImports:
-            # New length minus initial length
-            vimport_str = vimport.__str__()
-            newLength = len(vimport_str) + max(0, vimport_str.count("\n") - 1)
-            initialLength = context_region.end() - context_region.begin()
-            lengthDiff = newLength - initialLength
-
-            region_begin = context_region.end() + lengthDiff
-            region_end = region_begin
-          else:
-            region_begin = context_region.end()
-            region_end = region_begin
+        if lastImport.removed:
+          interpreted.insert_type = Interpreted.IT_REPLACE
+        else:
+          interpreted.insert_type = Interpreted.IT_INSERT_AFTER
 
-          if vimport.removed:
-            interpreted.insert_type = Interpreted.IT_REPLACE
-          else:
-            interpreted.insert_type = Interpreted.IT_INSERT_AFTER
-
-          interpreted.simport.region = Region(region_begin, region_end)
+        interpreted.simport.region = Region(region_end, region_end)
 
     if shouldAppendInterpreted:
       modifiedImports.append(interpreted)
 
     return modifiedImports
 
+  def findMissingIdentifiers(self, text):
+    known = self.getSetting("globals", [])
+    return [
+      name for name in JavascriptIdentifierLexer().findMissing(text)
+        if name not in known
+    ]
+
+  def getModulesFingerprint(self, project_path):
+    modules_folder = self.getSetting("modules_folder", "node_modules")
+    return Fingerprint.get(project_path, [
+      "package.json",
+      "package-lock.json",
+      "yarn.lock",
+      path.join(modules_folder, ".package-lock.json"),
+      path.join(modules_folder, ".yarn-integrity")
+    ]).check()
+
   def findAllModules(self, project_path):
+    fingerprint = self.getModulesFingerprint(project_path)
+    cached = JavascriptInterpreter.projectModules.get(project_path)
+
+    if cached and cached[0] == fingerprint:
+      return cached[1]
+
+    modules = self.readAllModules(project_path)
+    JavascriptInterpreter.projectModules[project_path] = (fingerprint, modules)
+    return modules
+
+  def readAllModules(self, project_path):
     modules = []
     if path.isfile(path.join(project_path, 'package.json')):
       packageJsonFile = open(path.join(project_path, 'package.json'))
@@ -365,9 +389,9 @@ class JavascriptInterpreter(Interpreter):
             modules += packageJson[key].keys()
 
       except ValueError:
-        SimpleImport.log_error("Failed to load package.json at {0}".format(
-          self.project_path
-        ))
+        print("SimpleImport: Failed to load package.json at {0}".format(
+          project_path
+        ), file=sys.stderr)
 
       # Close file
       packageJsonFile.close()
@@ -375,278 +399,307 @@ class JavascriptInterpreter(Interpreter):
     return modules
 
 
-  def buildRegexForModule(self, value):
-    return r"(^{0}$)".format(self.normalizeValue(value))
-
-  def findInDictionary(self, value, defaultResult={}):
-    result = defaultResult
+  def iterInDictionary(self, value):
     dictionary = self.getSetting('dictionary')
 
     if not dictionary:
-      return result
+      return
 
     for key in ["modules", "files"]:
       if key in dictionary:
         if value in dictionary[key]:
-          if key not in result:
-            result[key] = []
-          result[key].append(dictionary[key][value])
+          yield key, dictionary[key][value]
 
     for key in ["module_exports", "file_exports"]:
       if key in dictionary:
         for moduleName in dictionary[key]:
           if value in dictionary[key][moduleName]:
-            if key not in result:
-              result[key] = {}
-
-            if moduleName not in result[key]:
-              result[key][moduleName] = []
-
-            if value not in result[key][moduleName]:
-              result[key][moduleName].append(value)
+            yield key, (moduleName, [value])
 
-    return result
-
-  def findByValue(self, value, project_path, omit_files=None):
-    return self.findInCachedModules(
-      value,
+  def iterByValues(self, values, project_path, omit_files=None, token=None):
+    for item in self.iterByValuesInProject(
+      values,
       project_path,
-      defaultResult=self.findInDictionary(
-        value,
-        defaultResult=self.findByValueInProject(
-          value,
-          project_path,
-          omit_files=omit_files
-        )
-      )
-    )
+      omit_files=omit_files,
+      token=token
+    ):
+      yield item
 
-  def findByValueInProject(self, value, project_path, omit_files=None):
-    result = {}
-    regex_for_files = self.buildRegexForFiles(value)
-    regex_for_extra_files = self.buildRegexForExtraFiles(value)
-    ignored_paths = [
-      path.normpath(epath)
-      for epath in self.getSetting("ignore", [])
-    ]
+    for value in values:
+      for key, option in self.iterInDictionary(value):
+        yield value, key, option
 
+    for item in self.iterInCachedModules(values, project_path, token=token):
+      yield item
 
-    for dirpath, dirnames, filenames in walk(project_path, topdown=True):
-      relative_dir = path.relpath(dirpath, project_path)
-      # Change excluding folders
-      dirnames[:] = [dirname for dirname in dirnames if path.normpath(path.join(relative_dir, dirname)) not in ignored_paths]
-      for filename in filenames:
-        if omit_files and path.join(relative_dir, filename) in omit_files:
-          continue
-
-        # Find files with name equal the value
-        if self.matchFilePathWithRegex(
-          filename, regex_for_files, dirpath=relative_dir
-        ):
-          if "files" not in result:
-            result["files"] = []
-
-          result["files"].append(path.join(relative_dir, filename))
-        elif self.matchFilePathWithRegex(
-          filename, regex_for_extra_files, dirpath=relative_dir, is_extra=True
-        ):
-          if "extra_files" not in result:
-            result["extra_files"] = []
-
-          result["extra_files"].append(path.join(relative_dir, filename))
-          pass
-
-        # Find files that export the value
-        if self.isValidFile(filename):
-          try:
-            file = open(path.join(dirpath, filename))
-            body = file.read()
-            matches = re.findall(self.find_exports_regex, body)
-
-            if not self.getSetting("es5"):
-              listMatches = re.findall(self.find_exports_list_regex, body)
-              if listMatches:
-                listMatches = listMatches[0][1:-1].split(',')
-                matches += [ [x.strip(), x.strip()] for x in listMatches ]
-
-            # close file
-            del body
-            file.close()
-
-            for match in matches:
-              match_value = match[1] if match[1] else match[2]
-
-              if not match_value:
-                continue
-
-              if match_value == value:
-                file_path = path.join(relative_dir, filename)
+  def getWorkerPool(self):
+    return WorkerPool.get(
+      self.getSetting("extract_workers", 0),
+      self.getSetting("extract_backend", "thread")
+    )
 
-                if "exports" not in result:
-                  result["exports"] = {}
+  def getSourceReader(self, skip_generated=False, root=None):
+    return SourceReader(
+      self.getSetting("max_file_size", 1024) * 1024,
+      self.getSetting("mmap_threshold", 256) * 1024,
+      skip_generated and self.getSetting("skip_generated_files", True),
+      root
+    )
 
-                if file_path not in result["exports"]:
-                  result["exports"][file_path] = []
+  def getExportIndex(self, file_index):
+    # Minified and generated files of the project are not parsed, as
+    # nothing should be imported from them
+    es5 = bool(self.getSetting("es5"))
+    reader = self.getSourceReader(
+      skip_generated=True,
+      root=file_index.project_path
+    )
+    return ExportIndex.get(
+      file_index,
+      (
+        self.syntax,
+        es5,
+        tuple(self.getSetting("extensions", []))
+      ) + reader.getKey(),
+      partial(readExports, es5=es5, reader=reader),
+      self.isValidFile,
+      ParseCache.get(("exports", es5) + reader.getKey())
+    )
 
-                result["exports"][file_path].append(
-                  match_value
-                )
-          except IOError:
-            print("SimpleImport: Could not read", path.join(dirpath, filename))
+  def iterByValuesInProject(self, values, project_path, omit_files=None, token=None):
+    # Files matching the values
+    for item in super().iterByValues(
+      values,
+      project_path,
+      omit_files=omit_files,
+      token=token
+    ):
+      yield item
 
-    return result
+    # Files that export the values
+    exportIndex = self.getExportIndex(self.getFileIndex(project_path, token))
+    for value in values:
+      for file_path, exported in exportIndex.find(
+        value,
+        omit_files=omit_files,
+        token=token,
+        pool=self.getWorkerPool()
+      ):
+        yield value, "exports", (file_path, exported)
 
-  def findInCachedModules(self, value, project_path, defaultResult={}):
+  def iterInCachedModules(self, values, project_path, token=None):
     omitList = self.getSetting("omit", [])
-    regex_for_modules = self.buildRegexForModule(value)
-    regex_for_files = self.buildRegexForFiles(value)
-    regex_for_extra_files = self.buildRegexForExtraFiles(value)
+    # Files of modules match like the files of the project
+    names = NameIndex(
+      self.getSetting('extensions', []),
+      self.getSetting('extra_extensions', []),
+      self.index_file_name,
+      self.normalizeValue
+    )
+    queries = [
+      (
+        value,
+        self.normalizeValue(value),
+        self.getFileQueryKey(value)
+      )
+      for value in values
+    ]
 
-    result = defaultResult
     modules = self.findAllModules(project_path)
-    cachedModules = JavascriptInterpreter.cachedModules
-
-    for module in modules:
-      if re.search(regex_for_modules, self.normalizeValue(module)):
-        if "modules" not in result:
-          result["modules"] = []
 
-        result["modules"].append(module)
+    for value, normalized_value, file_key in queries:
+      for module in modules:
+        if self.normalizeValue(module) == normalized_value:
+          yield value, "modules", module
 
-    self.cacheModules(project_path)
+    with Stats.timer("cache_modules"):
+      self.cacheModules(project_path, token=token)
 
-    for moduleName in cachedModules:
-      module = cachedModules[moduleName]
-
-      if 'exports' in module and value in module['exports']:
-        if "module_exports" not in result:
-          result["module_exports"] = {}
-
-        if moduleName not in result["module_exports"]:
-          result["module_exports"][moduleName] = []
-
-        if "{0}.{1}".format(moduleName, value) not in omitList:
-          result["module_exports"][moduleName].append(value)
-
-      if 'files' in module:
-        for filename in module['files']:
-          if self.matchFilePathWithRegex(
-            filename, regex_for_files, dirpath=moduleName
-          ):
-            if "module_files" not in result:
-              result["module_files"] = []
+    for moduleName, module in JavascriptInterpreter.cachedModules.modules(
+      project_path
+    ):
+      if token:
+        token.check()
 
-            file_path = path.join(moduleName, filename)
-            if file_path in omitList:
-              continue
+      exports = set(module.get('exports', []))
 
-            result["module_files"].append(file_path)
+      for value, normalized_value, file_key in queries:
+        if value in exports:
+          if "{0}.{1}".format(moduleName, value) not in omitList:
+            yield value, "module_exports", (moduleName, [value])
+          else:
+            yield value, "module_exports", (moduleName, [])
 
-      if 'extra_files' in module:
-        for filename in module['extra_files']:
-          if self.matchFilePathWithRegex(
-            filename, regex_for_files, dirpath=moduleName, is_extra=True
-          ):
-            if "module_extra_files" not in result:
-              result["module_extra_files"] = []
+        if file_key is None:
+          continue
 
-            result["module_extra_files"].append(path.join(moduleName, filename))
+        if 'files' in module:
+          for filename in module['files']:
+            if names.matches("files", moduleName, filename, file_key):
+              file_path = path.join(moduleName, filename)
+              if file_path in omitList:
+                continue
 
-    return result
+              yield value, "module_files", file_path
 
+        if 'extra_files' in module:
+          for filename in module['extra_files']:
+            if names.matches("extra_files", moduleName, filename, file_key):
+              yield value, "module_extra_files", path.join(moduleName, filename)
 
-  def cacheModules(self, project_path):
+  def cacheModules(self, project_path, token=None):
     regex_endswith_index = r"index({0})$".format('|'.join(
       self.getSetting('extensions'))
     )
     cachedModules = JavascriptInterpreter.cachedModules
-    modules = self.findAllModules(project_path)
     settings = self.getSetting('cache', {})
+    cachedModules.setBudget(
+      self.getSetting('module_cache_max_entries', 20000),
+      self.getSetting('module_cache_max_size', 64) * 1024 * 1024
+    )
 
-    for moduleName in modules:
-      isCached = False
-      module_path = path.join(project_path, 'node_modules', moduleName)
-
-      if path.isfile(path.join(module_path, 'package.json')):
-        with open(path.join(module_path, 'package.json')) as raw_json:
-          try:
-            packageJson = json.load(raw_json)
-            if "version" in packageJson:
-              if (
-                moduleName not in cachedModules or
-                cachedModules[moduleName]["version"] != packageJson["version"]
-              ):
-                cachedModules[moduleName] = {
-                  "version": packageJson["version"]
-                }
-              else:
-                isCached = True
-
-
-            # Find exports in the main file
-            if not isCached and "main" in packageJson:
-              main_file_path = path.join(module_path, packageJson['main'])
-              exists = path.isfile(main_file_path)
-
-              # Try with first letter in uppercase
-              if not exists:
-                main_dir_path = path.dirname(packageJson['main'])
-                filename = path.basename(packageJson['main'])
+    # Skip everything while package.json, the lockfiles and the settings
+    # are the same as in the last run
+    fingerprint = self.getModulesFingerprint(project_path) + json.dumps(
+      [settings, self.getModuleCacheSignature([])],
+      sort_keys=True
+    )
+    if cachedModules.getFingerprint(project_path) == fingerprint:
+      return
 
-                main_file_path = path.join(
-                  module_path,
-                  main_dir_path,
-                  filename[0].upper() + filename[1:]
-                )
+    modules = self.findAllModules(project_path)
+    persistentCache = ModuleCache.get("javascript_modules")
+    evictions = cachedModules.getEvictions(project_path)
+
+    # Forget modules removed from package.json
+    for moduleName, module in cachedModules.modules(project_path):
+      if moduleName not in modules:
+        cachedModules.remove(project_path, moduleName)
+
+    # (name, module, path, version, signature, include, main file) of
+    # every module that has to be scanned
+    scans = []
+
+    try:
+      for moduleName in modules:
+        if token:
+          token.check()
+
+        isCached = False
+        moduleVersion = None
+        mainFilePath = None
+        module = cachedModules.get(project_path, moduleName)
+        module_path = path.join(project_path, 'node_modules', moduleName)
+        include = []
 
-                exists = path.isfile(main_file_path)
+        if moduleName in settings:
+          if "include" in settings[moduleName]:
+            include = settings[moduleName]["include"]
 
-              if exists:
-                module_file = open(main_file_path)
-                module_file_body = module_file.read()
-                module_file.close()
-
-                matches = re.findall(
-                  self.find_exports_regex,
-                  module_file_body
-                )
-                exported_main = None
-
-                for match in matches:
-                  match_value = match[1] if match[1] else match[2]
-
-                  if not match_value:
-                    if match[3]:
-                      exported_main = match[3]
-
-                  if match_value and match_value != 'default':
-                    if "exports" not in cachedModules[moduleName]:
-                      cachedModules[moduleName]["exports"] = []
-
-                    cachedModules[moduleName]["exports"].append(match_value)
-
-                if not "exports" in cachedModules[moduleName]:
-                  cachedModules[moduleName]["exports"] = (
-                    self.extractSubmodulesFromObjectInBody(
-                      module_file_body,
-                      exported_main,
-                      useDefault=(not exported_main)
-                    )
+        signature = self.getModuleCacheSignature(include)
+
+        if path.isfile(path.join(module_path, 'package.json')):
+          with open(path.join(module_path, 'package.json')) as raw_json:
+            try:
+              packageJson = json.load(raw_json)
+              if "version" in packageJson:
+                moduleVersion = packageJson["version"]
+                # Modules scanned with other settings, like another
+                # include, are scanned again
+                if (
+                  not module or
+                  module["version"] != moduleVersion or
+                  module.get("signature") != signature
+                ):
+                  module = persistentCache and persistentCache.lookup(
+                    moduleName,
+                    moduleVersion,
+                    signature
                   )
 
+                  if module:
+                    Stats.count("module_cache_hits")
+                    module["signature"] = signature
+                    cachedModules.set(project_path, moduleName, module)
+                    isCached = True
+                  else:
+                    Stats.count("module_cache_misses")
+                    module = {
+                      "version": moduleVersion,
+                      "signature": signature
+                    }
+                else:
+                  Stats.count("module_cache_hits")
+                  isCached = True
+
+              # Find the main file, its exports are read below
+              if not isCached and moduleVersion and "main" in packageJson:
+                main_file_path = path.join(module_path, packageJson['main'])
+                exists = path.isfile(main_file_path)
 
-          except FileNotFoundError:
-            print('Error')
-
-      if not isCached:
-        include = []
+                # Try with first letter in uppercase
+                if not exists:
+                  main_dir_path = path.dirname(packageJson['main'])
+                  filename = path.basename(packageJson['main'])
 
-        if moduleName in settings:
-          if "include" in settings[moduleName]:
-            include = settings[moduleName]["include"]
+                  main_file_path = path.join(
+                    module_path,
+                    main_dir_path,
+                    filename[0].upper() + filename[1:]
+                  )
 
-        for dirpath, dirnames, filenames in walk(module_path, topdown=True):
-          reldir = path.relpath(dirpath, module_path)
+                  exists = path.isfile(main_file_path)
+
+                if exists:
+                  mainFilePath = main_file_path
+
+            except FileNotFoundError:
+              print('Error', file=sys.stderr)
+
+        if not isCached and moduleVersion:
+          scans.append((
+            moduleName,
+            module,
+            module_path,
+            moduleVersion,
+            signature,
+            include,
+            mainFilePath
+          ))
+
+      Stats.count("modules_rescanned", len(scans))
+
+      # Main files are read in parallel when extract_workers is set, and
+      # only when they changed since they were last read
+      mainFiles = [scan[6] for scan in scans if scan[6]]
+      es5 = bool(self.getSetting("es5"))
+      reader = self.getSourceReader()
+      mainExports = dict(zip(mainFiles, ParseCache.get(
+        ("module_exports", es5) + reader.getKey()
+      ).map(
+        self.getWorkerPool(),
+        partial(readModuleExports, es5=es5, reader=reader),
+        mainFiles,
+        batch_size=8,
+        token=token
+      )))
+
+      for (
+        moduleName,
+        module,
+        module_path,
+        moduleVersion,
+        signature,
+        include,
+        mainFilePath
+      ) in scans:
+        if token:
+          token.check()
+
+        if mainFilePath:
+          module["exports"] = mainExports[mainFilePath] or []
+
+        for reldir, dirnames, filenames in Walker(module_path).walk():
           dirnames[:] = [
             dirname for dirname in dirnames
               if path.normpath(path.join(reldir, dirname)) in include
@@ -658,70 +711,35 @@ class JavascriptInterpreter(Interpreter):
               if re.search(regex_endswith_index, filename):
                 continue
 
-              if "files" not in cachedModules[moduleName]:
-                cachedModules[moduleName]["files"] = []
+              if "files" not in module:
+                module["files"] = []
 
-              cachedModules[moduleName]["files"].append(filename)
+              module["files"].append(filename)
             elif endswith(self.getSetting('extra_extensions'), filename):
-              if "extra_files" not in cachedModules[moduleName]:
-                cachedModules[moduleName]["extra_files"] = []
-
-              cachedModules[moduleName]["extra_files"].append(filename)
-
-  def extractSubmodulesFromObjectInBody(self, body, variableName, useDefault=False):
-    submodules = []
-
-    match = re.compile(
-      "{0}\s*=\s*".format(variableName)
-        if not useDefault else "export\s+default\s+"
-    ).search(body)
-
-    if match:
-      start = match.end()
-
-      # if it's not an object return
-      if body[start] != "{":
-        return submodules
-
-
-      end = len(body)
-      pos = start + 1
-      bracketsCount = 1
-
-      while(pos < end):
-        if body[pos] == "{":
-          bracketsCount += 1
-
-        if body[pos] == "}":
-          bracketsCount -= 1
-
-        if bracketsCount == 0:
-          end = pos + 1
-
-        pos += 1
-
-      # Remove every inner object to make it easier
-      body = re.sub(r"\{([^\{]+)\}|\[([^\[]+)\]|\(([^\(]+)\)", '', body[start+1:end-1])
-      strings = re.finditer(r"(\"([^\"\n]+)\"|\'([^\'\n]+)\'|\`([^\`]+)\`)", body)
-      removed_len = 0
-      # Remove all strings that contain a comma
-      for match in strings:
-        if "," in match.group(0):
-          body = (
-            body[0:match.start()-removed_len] + body[match.end()-removed_len:]
-          )
-          removed_len += match.end() - match.start()
-
-      splited = body.split(',')
-      for text in splited:
-        indexOfSeparator = text.find(':')
-        if indexOfSeparator:
-          key = text[:indexOfSeparator].strip()
-          if key:
-            quote = extract_prefix(["\"","'"], key)
-            if not quote and not " " in key:
-              submodules.append(key)
-            elif key[-1] == quote:
-              submodules.append(key[1:-1])
-
-    return submodules
+              if "extra_files" not in module:
+                module["extra_files"] = []
+
+              module["extra_files"].append(filename)
+
+        cachedModules.set(project_path, moduleName, module)
+
+        if persistentCache:
+          storedModule = dict(module)
+          del storedModule["version"]
+          del storedModule["signature"]
+          persistentCache.store(moduleName, moduleVersion, signature, storedModule)
+    finally:
+      if persistentCache:
+        persistentCache.save()
+
+    # Modules evicted while scanning have to be checked again next time
+    if cachedModules.getEvictions(project_path) == evictions:
+      cachedModules.setFingerprint(project_path, fingerprint)
+
+  def getModuleCacheSignature(self, include):
+    return json.dumps([
+      sorted(include),
+      self.getSetting('extensions', []),
+      self.getSetting('extra_extensions', []),
+      self.getSetting('max_file_size', 1024)
+    ])
@@ -6,6 +6,8 @@ from ..SIMode import SIMode
 class PythonInterpreter(Interpreter):
 
   def run(self):
+    self.index_file_name = "__init__"
+
     keys = {
       "module": "[^\s]+",
       "variable": "[^\s]+"
@@ -80,5 +82,7 @@ class PythonInterpreter(Interpreter):
 
     return "from {0} import {1}".format(statements['module'], statements['variable'])
 
-  def buildRegexForFiles(self, filename):
-    return r"({0}|{0}\/__init__)({1})$".format(filename, "|".join(self.getSetting('extensions')))
+  def getFileQueryKey(self, value):
+    # Dotted modules match as paths: foo.bar matches foo/bar.py and
+    # foo/bar/__init__.py
+    return Interpreter.getFileQueryKey(self, value.replace(".", "/"))
@@ -0,0 +1,273 @@
+import re
+from .SourceReader import SourceReader
+
+# Comments, strings and regex literals. They are matched whole so that
+# nothing in them is taken for code. A "/" starts a regex literal only
+# after an operator or an opening bracket
+SKIP_PATTERN = r"""
+  //[^\n]*
+  |/\*[^*]*\*+(?:[^/*][^*]*\*+)*/
+  |/(?:(?<=[=(,:;!&|?{}\[\n]/)|(?<=[=(,:;!&|?{}\[][ \t]/))
+    (?![*/])(?:[^/\\\n\[]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/
+  |'[^'\\\n]*(?:\\.[^'\\\n]*)*'
+  |"[^"\\\n]*(?:\\.[^"\\\n]*)*"
+  |`[^`\\]*(?:\\[\s\S][^`\\]*)*`
+"""
+
+class JavascriptExportLexer:
+  # Finds what a JavaScript file exports. The file is searched for export
+  # statements first, and only the code before each one is lexed, to tell
+  # whether it is in a comment, a string or a regex literal. Object
+  # literals are only read when their keys are needed
+
+  # Starts with a literal, which lets the regex engine jump from one
+  # "export" to the next. Word boundaries are checked after the fact
+  EXPORT_REGEX = re.compile(r"""
+    export(?:(?<![\w$.]export)|(?<=module\.export))(?:
+      \s+(?:
+        (?P<default>default\s*)\{
+        |(?:async\s+)?(?:(?:const|let|var|class)\s+|function\s*\*?\s*)
+          (?P<declared>[\w$]+)
+        |\{(?P<list>[^}]*)\}
+      )
+      |s\s*\.\s*(?P<property>[\w$]+)\s*=(?!=)
+      |s(?<=module\.exports)\s*=(?!=)\s*
+        (?:(?P<main_object>\{)|(?P<main>[\w$]+))
+    )
+  """, re.VERBOSE)
+
+  SKIP_REGEX = re.compile(SKIP_PATTERN, re.VERBOSE)
+
+  # Code up to a position. The last comment, string or regex literal
+  # matched is kept in the group
+  CODE_REGEX = re.compile(r"(?:[^/'\"`]+|(" + SKIP_PATTERN + r"))*", re.VERBOSE)
+
+  KEY_TOKEN_REGEX = re.compile(r"""
+    (?P<skip>\s+|//[^\n]*|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/)
+    |'(?P<single>[^'\\\n]*(?:\\.[^'\\\n]*)*)'
+    |"(?P<double>[^"\\\n]*(?:\\.[^"\\\n]*)*)"
+    |(?P<name>[\w$]+)
+    |(?P<spread>\.\.\.)
+    |(?P<punctuation>[{}\[\]():,])
+    |[\s\S]
+  """, re.VERBOSE)
+
+  # In the value of a key only brackets, and the comma that ends it, matter
+  VALUE_TOKEN_REGEX = re.compile(r"""
+    [^{}\[\]()'"`/,]*
+    (?:
+      (?P<open>[{\[(])
+      |(?P<close>[}\])])
+      |(?P<comma>,)
+      |""" + SKIP_PATTERN + r"""
+      |/
+    )
+  """, re.VERBOSE)
+
+  # Deeper than that, commas do not matter either
+  NESTED_TOKEN_REGEX = re.compile(r"""
+    [^{}\[\]()'"`/]*
+    (?:
+      (?P<open>[{\[(])
+      |(?P<close>[}\])])
+      |""" + SKIP_PATTERN + r"""
+      |/
+    )
+  """, re.VERBOSE)
+
+  # Words that may come before the name of a method
+  KEY_MODIFIERS = ("get", "set", "async", "static")
+
+  def __init__(self, es5=False):
+    self.es5 = es5
+
+  def scan(self, body):
+    # Returns the exported names, in order, and where the objects that
+    # module.exports and export default are set to begin
+    names = []
+    main = None
+    default_object = None
+
+    for match in self.iterCode(JavascriptExportLexer.EXPORT_REGEX, body):
+      declared, exported_property, exported_list = match.group(
+        "declared",
+        "property",
+        "list"
+      )
+
+      if declared or exported_property:
+        names.append(declared or exported_property)
+      elif exported_list is not None:
+        if not self.es5:
+          names += self.parseList(exported_list)
+      elif match.group("main_object"):
+        main = match.end()
+      elif match.group("main"):
+        main = match.group("main")
+      elif match.group("default") is not None and default_object is None:
+        default_object = match.end()
+
+    if isinstance(main, str):
+      main = self.findAssignedObject(body, main)
+
+    return {
+      "names": names,
+      "main_object": main,
+      "default_object": default_object
+    }
+
+  def iterCode(self, regex, body):
+    # Matches of regex that are not in a comment, a string or a regex
+    # literal. The text before them is lexed once, from match to match
+    pos = 0
+    match = regex.search(body)
+    while match:
+      end = self.skipCode(body, pos, match.start())
+      if end == match.start():
+        yield match
+        end = match.end()
+      match = regex.search(body, end)
+      pos = end
+
+  def skipCode(self, body, pos, start):
+    # Returns start when it is in code, or else the end of the comment,
+    # string or regex literal it is in. The text from pos is code
+    while True:
+      code = JavascriptExportLexer.CODE_REGEX.match(body, pos, start)
+      pos = code.end()
+      if pos == start:
+        # Only a line comment still matches when cut at start
+        if code.end(1) == start and code.group(1).startswith("//"):
+          return JavascriptExportLexer.SKIP_REGEX.match(
+            body,
+            code.start(1)
+          ).end()
+        return start
+
+      token = JavascriptExportLexer.SKIP_REGEX.match(body, pos)
+      if token and token.end() > start:
+        return token.end()
+      # A quote or a "/" that starts nothing
+      pos = token.end() if token else pos + 1
+
+  def findAssignedObject(self, body, name):
+    # Where the first object assigned to name begins, or -1
+    # The name comes first, for the same reason as in EXPORT_REGEX
+    name = re.escape(name)
+    regex = re.compile(name + r"(?<![\w$.]" + name + r")\s*=\s*\{")
+    for match in self.iterCode(regex, body):
+      return match.end()
+    return -1
+
+  def parseList(self, body):
+    names = []
+    for item in body.split(","):
+      words = item.split()
+      # "a as b" is exported as b
+      if words and words[-1] != "default":
+        names.append(words[-1])
+    return names
+
+  def findExports(self, body):
+    if "export" not in body:
+      return []
+    return self.scan(body)["names"]
+
+  def findModuleExports(self, body):
+    # Named exports, or else the keys of the object module.exports is set
+    # to. Without module.exports, the keys of the default export object
+    if "export" not in body:
+      return []
+
+    result = self.scan(body)
+    names = [name for name in result["names"] if name != "default"]
+    if names:
+      return names
+
+    position = result["main_object"]
+    if position is None:
+      position = result["default_object"]
+
+    if position is None or position < 0:
+      return []
+
+    return self.findObjectKeys(body, position)
+
+  def findObjectKeys(self, body, position):
+    # Keys of the object literal whose "{" ends right before position
+    keys = []
+    depth = 1
+    expecting_key = True
+    key = None
+    pos = position
+    end = len(body)
+
+    while pos < end:
+      if depth > 1 or not expecting_key:
+        regex = (
+          JavascriptExportLexer.NESTED_TOKEN_REGEX if depth > 1
+          else JavascriptExportLexer.VALUE_TOKEN_REGEX
+        )
+        match = regex.match(body, pos)
+        pos = match.end()
+        if match.group("open"):
+          depth += 1
+        elif match.group("close"):
+          depth -= 1
+          if depth == 0:
+            break
+        elif depth == 1 and match.group("comma"):
+          expecting_key = True
+        continue
+
+      match = JavascriptExportLexer.KEY_TOKEN_REGEX.match(body, pos)
+      pos = match.end()
+      kind = match.lastgroup
+
+      if kind == "skip":
+        continue
+
+      if kind == "punctuation":
+        char = match.group(kind)
+        # A name right before ":", ",", "}" or "(" is a key
+        if key:
+          keys.append(key)
+
+        if char == "}" or char == "]" or char == ")":
+          break
+
+        key = None
+        expecting_key = char == ","
+        if char == "{" or char == "[" or char == "(":
+          depth += 1
+      elif kind == "name" or kind == "single" or kind == "double":
+        if key is None:
+          key = match.group(kind)
+        elif key in JavascriptExportLexer.KEY_MODIFIERS and kind == "name":
+          key = match.group(kind)
+        else:
+          key = None
+          expecting_key = False
+      elif kind == "spread" or key:
+        # "...spread", or a shorthand with a default value
+        key = None
+        expecting_key = False
+
+    return keys
+
+# Functions for worker pools, which can only run module level functions.
+# They return None when the file can not be read
+
+def readExports(file_path, es5=False, reader=None):
+  try:
+    body = (reader or SourceReader()).read(file_path, "export")
+  except (IOError, UnicodeDecodeError):
+    return None
+  return JavascriptExportLexer(es5).findExports(body)
+
+def readModuleExports(file_path, es5=False, reader=None):
+  try:
+    body = (reader or SourceReader()).read(file_path, "export")
+  except (IOError, UnicodeDecodeError):
+    return None
+  return JavascriptExportLexer(es5).findModuleExports(body)
@@ -0,0 +1,421 @@
+import re
+
+KEYWORDS = frozenset("""
+  await break case catch class const continue debugger default delete do
+  else enum export extends false finally for function if import in
+  instanceof let new null of return super switch this throw true try
+  typeof var void while with yield async static get set as from
+  arguments undefined NaN Infinity
+""".split())
+
+# Globals of the language, browsers, node and test runners
+GLOBALS = frozenset("""
+  Array ArrayBuffer Atomics BigInt BigInt64Array BigUint64Array Boolean
+  DataView Date Error EvalError Float32Array Float64Array Function
+  Int8Array Int16Array Int32Array Intl JSON Map Math Number Object
+  Promise Proxy RangeError ReferenceError Reflect RegExp Set
+  SharedArrayBuffer String Symbol SyntaxError TypeError URIError
+  Uint8Array Uint8ClampedArray Uint16Array Uint32Array WeakMap WeakRef
+  WeakSet globalThis decodeURI decodeURIComponent encodeURI
+  encodeURIComponent escape eval isFinite isNaN parseFloat parseInt
+  unescape
+  window self document navigator location history localStorage
+  sessionStorage console alert confirm prompt fetch Headers Request
+  Response URL URLSearchParams FormData Blob File FileReader WebSocket
+  XMLHttpRequest Event CustomEvent EventTarget Node Element HTMLElement
+  Image Audio Worker MutationObserver IntersectionObserver
+  ResizeObserver AbortController TextEncoder TextDecoder crypto
+  performance requestAnimationFrame cancelAnimationFrame setTimeout
+  clearTimeout setInterval clearInterval setImmediate clearImmediate
+  queueMicrotask structuredClone atob btoa getComputedStyle
+  matchMedia screen
+  require module exports process global Buffer __dirname __filename
+  describe it test expect jest beforeEach afterEach beforeAll afterAll
+""".split())
+
+class JavascriptIdentifierLexer:
+  # Finds the names a JavaScript file uses without declaring or importing
+  # them. Declarations are looked for in the whole file, whatever their
+  # scope, so a name is only reported when nothing in the file declares it
+
+  CODE_TOKEN_REGEX = re.compile(r"""
+    (?P<space>\s+)
+    |//[^\n]*|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/
+    |(?P<string>'[^'\\\n]*(?:\\.[^'\\\n]*)*'|"[^"\\\n]*(?:\\.[^"\\\n]*)*")
+    |(?P<name>[^\W\d][\w$]*|\$[\w$]*)
+    |(?P<number>\.?\d[\w.]*)
+    |(?P<punctuation>=>|\.\.\.|\?\.(?!\d)|[=!]==?|[<>]=|&&|\|\||\?\?|[\s\S])
+  """, re.VERBOSE)
+
+  REGEX_LITERAL = re.compile(
+    r"/(?![*/])(?:[^/\\\n\[]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[\w]*"
+  )
+  TEMPLATE_TEXT = re.compile(r"(?:[^`\\$]|\\[\s\S]|\$(?!\{))*")
+  JSX_NAME = re.compile(r"[\w$][\w$.:\-]*")
+  JSX_TEXT = re.compile(r"[^<{]*")
+  JSX_SKIP = re.compile(r"""\s+|'[^']*'|"[^"]*"|=""")
+  JSX_CLOSING_TAG = re.compile(r"</[^>]*>")
+
+  # After these a "/" starts a regex literal and a "<" an element
+  EXPRESSION_KEYWORDS = frozenset(
+    "return typeof case do else in of new delete void throw yield await default".split()
+  )
+  CLOSERS = frozenset(")]}")
+  OPENERS = { "(": ")", "[": "]", "{": "}" }
+  MODIFIERS = frozenset(["static", "get", "set", "async", "*"])
+
+  def isExpressionStart(self, tokens):
+    # True when an operand, not an operator, comes next
+    if not tokens:
+      return True
+
+    kind, value, newline = tokens[-1]
+    if kind == "punctuation":
+      return value not in JavascriptIdentifierLexer.CLOSERS
+    if kind == "name":
+      return value in JavascriptIdentifierLexer.EXPRESSION_KEYWORDS
+    return False
+
+  def tokenize(self, text):
+    # [(kind, value, newline before)] for the code of the file. Kinds are
+    # "name", "punctuation", "value" for literals, and "element" for the
+    # names of JSX components
+    tokens = []
+    # Frames of what is being read: ["code", open braces, started by],
+    # ["template"], ["tag"] or ["children"]
+    stack = [["code", 0, None]]
+    pos = 0
+    end = len(text)
+    newline = False
+
+    while pos < end:
+      frame = stack[-1]
+      mode = frame[0]
+
+      if mode == "template":
+        pos = JavascriptIdentifierLexer.TEMPLATE_TEXT.match(text, pos).end()
+        if text.startswith("${", pos):
+          stack.append(["code", 0, "template"])
+          pos += 2
+        else:
+          stack.pop()
+          tokens.append(("value", "`", newline))
+          newline = False
+          pos += 1
+        continue
+
+      if mode == "tag":
+        match = JavascriptIdentifierLexer.JSX_SKIP.match(text, pos)
+        if match:
+          pos = match.end()
+        elif text.startswith("/>", pos):
+          stack.pop()
+          pos += 2
+        elif text[pos] == ">":
+          frame[0] = "children"
+          pos += 1
+        elif text[pos] == "{":
+          stack.append(["code", 0, "element"])
+          pos += 1
+        else:
+          # Attribute names are not references
+          match = JavascriptIdentifierLexer.JSX_NAME.match(text, pos)
+          pos = match.end() if match else pos + 1
+        continue
+
+      if mode == "children":
+        pos = JavascriptIdentifierLexer.JSX_TEXT.match(text, pos).end()
+        if pos >= end:
+          break
+        if text[pos] == "{":
+          stack.append(["code", 0, "element"])
+          pos += 1
+        elif text.startswith("</", pos):
+          match = JavascriptIdentifierLexer.JSX_CLOSING_TAG.match(text, pos)
+          pos = match.end() if match else end
+          stack.pop()
+        else:
+          pos = self.readElement(text, pos, tokens, stack)
+        continue
+
+      char = text[pos]
+      if char == "`":
+        stack.append(["template"])
+        tokens.append(("value", "`", newline))
+        newline = False
+        pos += 1
+        continue
+
+      if char == "/" and self.isExpressionStart(tokens):
+        match = JavascriptIdentifierLexer.REGEX_LITERAL.match(text, pos)
+        if match:
+          tokens.append(("value", match.group(0), newline))
+          newline = False
+          pos = match.end()
+          continue
+
+      if (
+        char == "<" and
+        self.isExpressionStart(tokens) and
+        (text[pos + 1:pos + 2].isalpha() or text[pos + 1:pos + 2] == ">")
+      ):
+        pos = self.readElement(text, pos, tokens, stack)
+        continue
+
+      if char == "{":
+        frame[1] += 1
+      elif char == "}":
+        if not frame[1] and frame[2]:
+          # End of a ${} in a template or of a {} in an element
+          stack.pop()
+          pos += 1
+          continue
+        frame[1] -= 1
+
+      match = JavascriptIdentifierLexer.CODE_TOKEN_REGEX.match(text, pos)
+      pos = match.end()
+      kind = match.lastgroup
+      if kind == "space":
+        newline = newline or "\n" in match.group(0)
+      elif kind:
+        if kind in ("string", "number"):
+          kind = "value"
+        tokens.append((kind, match.group(0), newline))
+        newline = False
+
+    return tokens
+
+  def readElement(self, text, pos, tokens, stack):
+    # Reads "<Name" and returns the position after it. Components are
+    # referenced by the first part of their name, lowercase tags are HTML
+    if text.startswith("<>", pos):
+      stack.append(["children"])
+      return pos + 2
+
+    match = JavascriptIdentifierLexer.JSX_NAME.match(text, pos + 1)
+    if not match:
+      tokens.append(("punctuation", "<", False))
+      return pos + 1
+
+    name = match.group(0).split(".")[0]
+    if (name[0].isupper() or "." in match.group(0)) and re.match(r"[\w$]+$", name):
+      tokens.append(("element", name, False))
+
+    stack.append(["tag"])
+    return match.end()
+
+  def findBrackets(self, tokens):
+    # index of every bracket -> index of the bracket closing or opening it
+    brackets = {}
+    opened = []
+    for index, (kind, value, newline) in enumerate(tokens):
+      if kind != "punctuation":
+        continue
+      if value in JavascriptIdentifierLexer.OPENERS:
+        opened.append(index)
+      elif value in JavascriptIdentifierLexer.CLOSERS and opened:
+        start = opened.pop()
+        brackets[start] = index
+        brackets[index] = start
+    return brackets
+
+  def markPattern(self, tokens, brackets, start, end, bindings, skipped):
+    # Names bound by a destructuring pattern or a parameter list. Keys and
+    # default values are not bindings
+    index = start
+    while index < end:
+      kind, value, newline = tokens[index]
+      if kind == "punctuation" and value in JavascriptIdentifierLexer.OPENERS:
+        if index in brackets and value != "(":
+          self.markPattern(tokens, brackets, index + 1, brackets[index], bindings, skipped)
+          index = brackets[index] + 1
+          continue
+      elif kind == "punctuation" and value == "=":
+        # Skip the default value, its names are references
+        depth = 0
+        index += 1
+        while index < end:
+          kind, value, newline = tokens[index]
+          if kind == "punctuation":
+            if value in JavascriptIdentifierLexer.OPENERS:
+              depth += 1
+            elif value in JavascriptIdentifierLexer.CLOSERS:
+              depth -= 1
+            elif value == "," and not depth:
+              break
+          index += 1
+        continue
+      elif kind == "name":
+        following = tokens[index + 1][1] if index + 1 < end else None
+        if following == ":":
+          skipped.add(index)
+        elif value not in KEYWORDS:
+          bindings.add(index)
+      index += 1
+
+  def markBinding(self, tokens, brackets, index, bindings, skipped):
+    # A name or a pattern starting at index. Returns the index after it
+    if index >= len(tokens):
+      return index
+
+    kind, value, newline = tokens[index]
+    if kind == "name" and value not in KEYWORDS:
+      bindings.add(index)
+      return index + 1
+    if kind == "punctuation" and value in ("{", "[") and index in brackets:
+      self.markPattern(tokens, brackets, index + 1, brackets[index], bindings, skipped)
+      return brackets[index] + 1
+    return index
+
+  def markDeclarators(self, tokens, brackets, index, bindings, skipped):
+    # const a = 1, { b } = c, ... until the end of the statement
+    index = self.markBinding(tokens, brackets, index, bindings, skipped)
+    depth = 0
+    while index < len(tokens):
+      kind, value, newline = tokens[index]
+      if kind == "punctuation":
+        if value in JavascriptIdentifierLexer.OPENERS:
+          depth += 1
+        elif value in JavascriptIdentifierLexer.CLOSERS:
+          depth -= 1
+          if depth < 0:
+            return
+        elif not depth and value == ";":
+          return
+        elif not depth and value == ",":
+          index = self.markBinding(tokens, brackets, index + 1, bindings, skipped)
+          continue
+      elif not depth and kind == "name" and value in (
+        "const", "let", "var", "function", "class", "import", "export"
+      ):
+        return
+
+      if (
+        newline and not depth and value not in (",", "=") and
+        tokens[index - 1][1] not in (",", "=")
+      ):
+        return
+      index += 1
+
+  def markImport(self, tokens, index, bindings, skipped):
+    # import a, { b as c } from "d"
+    while index < len(tokens):
+      kind, value, newline = tokens[index]
+      if kind == "value" or value in ("from", ";"):
+        return
+      if kind == "name":
+        following = tokens[index + 1][1] if index + 1 < len(tokens) else None
+        if following == "as" or value in ("as", "type"):
+          skipped.add(index)
+        else:
+          bindings.add(index)
+      index += 1
+
+  def markExport(self, tokens, brackets, index, skipped):
+    # export { a as b } uses a. With a "from", it uses nothing
+    close = brackets.get(index, index)
+    reexport = close + 1 < len(tokens) and tokens[close + 1][1] == "from"
+    for inner in range(index + 1, close):
+      kind, value, newline = tokens[inner]
+      if kind == "name" and (reexport or tokens[inner - 1][1] == "as"):
+        skipped.add(inner)
+
+  def findMissing(self, text):
+    tokens = self.tokenize(text)
+    brackets = self.findBrackets(tokens)
+    bindings = set()
+    skipped = set()
+    class_bodies = set()
+    opened = []
+    length = len(tokens)
+
+    for index, (kind, value, newline) in enumerate(tokens):
+      previous = tokens[index - 1][1] if index else None
+      following = tokens[index + 1][1] if index + 1 < length else None
+
+      if kind == "punctuation":
+        if value in JavascriptIdentifierLexer.OPENERS:
+          opened.append(index)
+        elif value in JavascriptIdentifierLexer.CLOSERS and opened:
+          opened.pop()
+        elif value == "=>":
+          if previous == ")" and index - 1 in brackets:
+            self.markPattern(tokens, brackets, brackets[index - 1] + 1, index - 1, bindings, skipped)
+          elif index and tokens[index - 1][0] == "name":
+            bindings.add(index - 1)
+        continue
+
+      if kind != "name":
+        continue
+
+      if previous in (".", "?.", "break", "continue"):
+        skipped.add(index)
+      elif value in ("const", "let", "var"):
+        self.markDeclarators(tokens, brackets, index + 1, bindings, skipped)
+      elif value == "function":
+        name = index + 1
+        if following == "*":
+          name += 1
+        if name < length and tokens[name][0] == "name":
+          bindings.add(name)
+          name += 1
+        if name < length and tokens[name][1] == "(" and name in brackets:
+          self.markPattern(tokens, brackets, name + 1, brackets[name], bindings, skipped)
+      elif value == "class":
+        if following and following != "extends" and tokens[index + 1][0] == "name":
+          bindings.add(index + 1)
+        for body in range(index + 1, length):
+          if tokens[body][1] == "{":
+            class_bodies.add(body)
+            break
+      elif value == "catch" and following == "(" and index + 1 in brackets:
+        self.markPattern(tokens, brackets, index + 2, brackets[index + 1], bindings, skipped)
+      elif value == "import" and following not in ("(", "."):
+        self.markImport(tokens, index + 1, bindings, skipped)
+      elif value == "export" and following == "{":
+        self.markExport(tokens, brackets, index + 1, skipped)
+      elif value == "export" and following == "*":
+        if index + 3 < length and tokens[index + 2][1] == "as":
+          skipped.add(index + 3)
+      elif value in KEYWORDS:
+        continue
+      elif opened and opened[-1] in class_bodies and (
+        previous in ("{", ";", "}") or
+        previous in JavascriptIdentifierLexer.MODIFIERS or
+        newline
+      ):
+        # A field or a method of a class
+        skipped.add(index)
+        if following == "(" and index + 1 in brackets:
+          self.markPattern(tokens, brackets, index + 2, brackets[index + 1], bindings, skipped)
+      elif following == ":" and (
+        previous in ("{", ",", ";", "}", None) or newline
+      ):
+        # A key of an object or a label
+        skipped.add(index)
+      elif (
+        following == "(" and index + 1 in brackets and
+        brackets[index + 1] + 1 < length and
+        tokens[brackets[index + 1] + 1][1] == "{"
+      ):
+        # A method of an object
+        skipped.add(index)
+        self.markPattern(tokens, brackets, index + 2, brackets[index + 1], bindings, skipped)
+
+    declared = set(tokens[index][1] for index in bindings)
+    missing = []
+    for index, (kind, value, newline) in enumerate(tokens):
+      if kind == "element" or (
+        kind == "name" and
+        index not in bindings and
+        index not in skipped and
+        value not in KEYWORDS
+      ):
+        if (
+          value not in declared and
+          value not in GLOBALS and
+          value not in missing
+        ):
+          missing.append(value)
+
+    return missing
@@ -0,0 +1,86 @@
+import mmap, re
+from ..index import Stats
+
+class SourceReader:
+  # Reads source files for the lexers. Files over max_size are skipped,
+  # and so are minified or generated files when skip_generated is set.
+  # Files over mmap_threshold are mapped instead of read, and only
+  # decoded when they contain the keyword at all. Sizes are in bytes,
+  # 0 means no limit. Only the part of the path below root is checked
+  # for generated folders, the project itself may be in a "dist" folder
+  GENERATED_SUFFIXES = (".min.js", "-min.js", ".bundle.js")
+  GENERATED_DIRS = ("dist",)
+  # A file whose first lines are longer than this on average is minified
+  MAX_LINE_LENGTH = 500
+  SAMPLE_SIZE = 65536
+  PATH_SEPARATORS = re.compile(r"[\\/]")
+
+  def __init__(self, max_size=0, mmap_threshold=0, skip_generated=False, root=None):
+    self.max_size = max_size
+    self.mmap_threshold = mmap_threshold
+    self.skip_generated = skip_generated
+    self.root = root
+
+  def getKey(self):
+    return (self.max_size, self.mmap_threshold, self.skip_generated, self.root)
+
+  def isGeneratedPath(self, file_path):
+    if self.root and file_path.startswith(self.root):
+      file_path = file_path[len(self.root):]
+
+    if file_path.endswith(SourceReader.GENERATED_SUFFIXES):
+      return True
+
+    folders = SourceReader.PATH_SEPARATORS.split(file_path)[:-1]
+    for folder in SourceReader.GENERATED_DIRS:
+      if folder in folders:
+        return True
+    return False
+
+  def isMinified(self, sample, newline):
+    lines = sample.count(newline) + 1
+    return len(sample) / lines > SourceReader.MAX_LINE_LENGTH
+
+  def read(self, file_path, keyword):
+    # Returns the text of the file, or "" when it is skipped or does not
+    # contain keyword. Raises IOError or UnicodeDecodeError like open()
+    if self.skip_generated and self.isGeneratedPath(file_path):
+      return ""
+
+    with open(file_path, "rb") as file:
+      size = file.seek(0, 2)
+      if not size or (self.max_size and size > self.max_size):
+        return ""
+
+      Stats.count("files_read")
+      Stats.count("bytes_read", size)
+
+      if self.mmap_threshold and size > self.mmap_threshold:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+          if mapped.find(keyword.encode("utf-8")) < 0:
+            return ""
+
+          if self.skip_generated and self.isMinified(
+            mapped[:SourceReader.SAMPLE_SIZE],
+            b"\n"
+          ):
+            return ""
+
+          return mapped[:].decode("utf-8")
+        finally:
+          mapped.close()
+
+      file.seek(0)
+      body = file.read().decode("utf-8")
+
+    if keyword not in body:
+      return ""
+
+    if self.skip_generated and self.isMinified(
+      body[:SourceReader.SAMPLE_SIZE],
+      "\n"
+    ):
+      return ""
+
+    return body
@@ -0,0 +1,15 @@
+from .JavascriptExportLexer import (
+  JavascriptExportLexer,
+  readExports,
+  readModuleExports
+)
+from .JavascriptIdentifierLexer import JavascriptIdentifierLexer
+from .SourceReader import SourceReader
+
+__all__ = [
+  "JavascriptExportLexer",
+  "readExports",
+  "readModuleExports",
+  "JavascriptIdentifierLexer",
+  "SourceReader"
+]
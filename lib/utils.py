@@ -1,4 +1,4 @@
-import re
+import re, sys
 
 def joinStr(value, regex=None):
   words = re.split(regex if regex else r"_|-|\/|-|\.", value)
@@ -33,3 +33,27 @@ def flattenObjectToList(obj):
     result.append(obj[key])
   return result
 
+def orderEdits(edits, size):
+  # Edits are [start, end, characters] lists relative to the text before
+  # any of them is applied. Yields them from the end of the text to the
+  # start so no offset has to be adjusted. Edits at the same position end
+  # up in the order they were given
+  ordered = sorted(
+    enumerate(edits),
+    key=lambda item: (item[1][0], item[1][1], item[0]),
+    reverse=True
+  )
+  limit = size
+
+  for index, (start, end, characters) in ordered:
+    if end > limit:
+      print("SimpleImport: Skipped overlapping edit at", start, file=sys.stderr)
+      continue
+
+    yield start, end, characters
+    limit = start
+
+def applyEdits(text, edits):
+  for start, end, characters in orderEdits(edits, len(text)):
+    text = text[:start] + characters + text[end:]
+  return text
@@ -0,0 +1,221 @@
+import argparse, gc, json, os, re, sys, tempfile, time, types
+from os import path
+
+# Times the main phases of the plugin on synthetic projects, outside
+# Sublime. Every phase is run once for its time, then once more under
+# tracemalloc for its peak memory. Cold phases start from empty caches.
+#
+#   python test/bench/bench.py --sizes 1000 10000 --packages 300
+ROOT = path.dirname(path.dirname(path.dirname(path.abspath(__file__))))
+sys.path.insert(0, path.join(ROOT, "test", "stubs"))
+sys.path.insert(0, path.dirname(path.abspath(__file__)))
+
+try:
+  import tracemalloc
+except ImportError:
+  tracemalloc = None
+
+import sublime
+from generate import generate
+
+def loadPlugin():
+  # The plugin uses relative imports, load it as the package Sublime
+  # would create
+  package = types.ModuleType("SimpleImport")
+  package.__path__ = [ROOT]
+  sys.modules["SimpleImport"] = package
+  __import__("SimpleImport.SimpleImportCommand")
+  return sys.modules["SimpleImport.SimpleImportCommand"]
+
+plugin = loadPlugin()
+from SimpleImport.lib.index import FileIndex, ParseCache, ModuleCache
+from SimpleImport.lib.interpreter.SImport import SImport
+from SimpleImport.lib.interpreter.PendingImport import PendingImport
+from SimpleImport.lib.interpreters import JavascriptInterpreter
+from SimpleImport.lib.SIMode import SIMode
+
+def resetCaches():
+  FileIndex.clear()
+  ParseCache.clear()
+  JavascriptInterpreter.cachedModules.clear()
+  JavascriptInterpreter.projectModules = {}
+  plugin.SimpleImportCommand.imports_cache = {}
+
+def measure(run, setup=None, repeat=1):
+  # Returns (seconds per run, peak bytes)
+  total = 0
+  for _ in range(repeat):
+    if setup:
+      setup()
+    gc.collect()
+    started = time.perf_counter()
+    run()
+    total += time.perf_counter() - started
+
+  peak = None
+  if tracemalloc:
+    if setup:
+      setup()
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+  return total / repeat, peak
+
+def getPackages(project_path):
+  with open(path.join(project_path, "package.json")) as file:
+    return sorted(json.load(file)["dependencies"])
+
+def getQueries(project_path, packages):
+  source_path = path.join(project_path, "src")
+  source_file = sorted(
+    filename for filename in os.listdir(source_path)
+    if filename.endswith(".js") and filename != "index.js"
+  )[0]
+
+  with open(path.join(source_path, source_file)) as file:
+    export = re.search(r"export (?:const|function) (\w+)", file.read())
+
+  return [
+    # A file of the project and one of its exports
+    source_file[:-3],
+    export.group(1) if export else "zzzNoExport",
+    # A dependency and one of its exports
+    packages[len(packages) // 2].split("/")[-1],
+    "fn3",
+    # Nothing matches
+    "zzzNotFound"
+  ]
+
+def getView(project_path, packages, imports=50):
+  lines = [
+    "import {{ fn{0}, fn{1} }} from '{2}';".format(index, index + 1, package)
+    for index, package in enumerate(packages[:imports])
+  ]
+  lines.append("")
+  lines.append("fn3")
+  text = "\n".join(lines)
+  window = sublime.Window([project_path])
+  return sublime.View(text, path.join(project_path, "src", "app.js"), window)
+
+def benchProject(project_path, repeat):
+  interpreter = JavascriptInterpreter()
+  interpreter.setSettings(interpreter.settings)
+  packages = getPackages(project_path)
+  queries = getQueries(project_path, packages)
+  omit_files = [path.join("src", "app.js")]
+  results = []
+
+  def findAll():
+    for value in queries:
+      interpreter.findByValue(value, project_path, omit_files=omit_files)
+
+  results.append(("cacheModules (cold)", measure(
+    lambda: interpreter.cacheModules(project_path),
+    setup=resetCaches
+  )))
+  results.append(("cacheModules (warm)", measure(
+    lambda: interpreter.cacheModules(project_path),
+    repeat=repeat
+  )))
+  results.append(("findByValue (cold)", measure(findAll, setup=resetCaches)))
+  results.append(("findByValue (warm)", measure(findAll, repeat=repeat)))
+
+  view = getView(project_path, packages)
+  command = plugin.SimpleImportCommand(view)
+  command.interpreter = interpreter
+  command.mode = SIMode.REPLACE_MODE
+
+  def clearImports():
+    plugin.SimpleImportCommand.imports_cache = {}
+
+  results.append(("findAllImports", measure(
+    command.findAllImports,
+    setup=clearImports,
+    repeat=repeat
+  )))
+
+  # Import fn3 into a view that already has imports, choosing the first
+  # option like the command does
+  options = interpreter.findByValue("fn3", project_path, omit_files=omit_files)
+  state = {}
+
+  def prepareInsert():
+    point = view.size()
+    region = sublime.Region(point - 3, point)
+    interpreted = interpreter.interprete(
+      SImport("fn3", "fn3", region, view.line(region)),
+      mode=command.mode
+    )
+    option = interpreter.parseOptionItem(
+      PendingImport(interpreted, options).getOptionByIndex(0),
+      "src"
+    )
+    interpreter.onSearchResultChosen(
+      interpreted,
+      option["key"],
+      option["value"],
+      mode=command.mode
+    )
+    state["interpreted"] = interpreted
+    state["imports"] = command.findAllImports()
+
+  results.append(("parseBeforeInsert", measure(
+    lambda: interpreter.parseBeforeInsert(
+      state["interpreted"],
+      state["imports"],
+      mode=command.mode
+    ),
+    setup=prepareInsert,
+    repeat=repeat
+  )))
+
+  return results
+
+def formatResults(size, results):
+  lines = ["{0} files".format(size)]
+  for name, (seconds, peak) in results:
+    lines.append("  {0:<22} {1:>10.2f} ms {2:>12}".format(
+      name,
+      seconds * 1000,
+      "-" if peak is None else "{0:.1f} MB peak".format(peak / 1048576.0)
+    ))
+  return "\n".join(lines)
+
+def main():
+  parser = argparse.ArgumentParser(description="Benchmark Simple Import")
+  parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+  parser.add_argument("--packages", type=int, default=300)
+  parser.add_argument("--repeat", type=int, default=5)
+  parser.add_argument(
+    "--dir",
+    default=path.join(tempfile.gettempdir(), "simple-import-bench"),
+    help="Where the projects are built, and reused when they exist"
+  )
+  parser.add_argument("--json", help="Also write the results to this file")
+  args = parser.parse_args()
+
+  # Dependencies are scanned every time, not read from the disk cache
+  ModuleCache.setCacheDir(None)
+
+  report = {}
+  for size in args.sizes:
+    project_path = path.join(args.dir, "{0}-{1}".format(size, args.packages))
+    if not path.isfile(path.join(project_path, "package.json")):
+      generate(project_path, files=size, packages=args.packages)
+
+    results = benchProject(project_path, args.repeat)
+    print(formatResults(size, results))
+    report[size] = dict(
+      (name, {"ms": seconds * 1000, "peak_bytes": peak})
+      for name, (seconds, peak) in results
+    )
+
+  if args.json:
+    with open(args.json, "w") as file:
+      json.dump(report, file, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,147 @@
+import argparse, json, os, random, shutil
+from os import path
+
+# Builds a synthetic JavaScript project: source files spread over nested
+# folders, with named, default and CommonJS exports, some index files and
+# assets, and a node_modules folder with the dependencies of package.json.
+# The same arguments always build the same project
+
+WORDS = [
+  "user", "account", "button", "modal", "list", "item", "form", "input",
+  "table", "row", "cell", "header", "footer", "menu", "panel", "card",
+  "chart", "filter", "search", "order", "cart", "price", "layout", "theme"
+]
+ASSETS = [".css", ".svg", ".png", ".json"]
+FILES_PER_FOLDER = 40
+FOLDERS_PER_FOLDER = 8
+
+def getName(rand, index):
+  return "{0}{1}{2}".format(
+    rand.choice(WORDS),
+    rand.choice(WORDS).capitalize(),
+    index
+  )
+
+def writeFile(file_path, body):
+  folder = path.dirname(file_path)
+  if not path.isdir(folder):
+    os.makedirs(folder)
+  with open(file_path, "w") as file:
+    file.write(body)
+
+def getSourceFolder(index):
+  # src/d3/d17/... so that folders hold about FILES_PER_FOLDER files
+  parts = ["src"]
+  folder = index // FILES_PER_FOLDER
+  while folder:
+    parts.append("d{0}".format(folder % FOLDERS_PER_FOLDER))
+    folder //= FOLDERS_PER_FOLDER
+  return path.join(*parts)
+
+def getSourceBody(rand, index, packages):
+  lines = []
+  for package in rand.sample(packages, min(len(packages), rand.randint(0, 4))):
+    lines.append("import {{ fn0 }} from '{0}';".format(package))
+  lines.append("")
+
+  kind = index % 10
+  name = getName(rand, index)
+  if kind < 6:
+    for export in range(rand.randint(1, 5)):
+      lines.append("export const {0}{1} = ({{ value }}) => value;".format(
+        name,
+        export
+      ))
+    lines.append("export function {0}Helper(a, b) {{ return a + b; }}".format(name))
+  elif kind < 8:
+    lines.append("export default class {0} {{".format(name.capitalize()))
+    lines.append("  render() { return `<div>${this.props.value}</div>`; }")
+    lines.append("}")
+  else:
+    lines.append("module.exports = {")
+    for export in range(rand.randint(1, 5)):
+      lines.append("  {0}{1}: function () {{ return '{{}}'; }},".format(
+        name,
+        export
+      ))
+    lines.append("};")
+
+  # Code that is not an export, for the lexer to skip
+  for line in range(rand.randint(10, 60)):
+    lines.append("// {0} {1}".format(rand.choice(WORDS), line))
+    lines.append("const local{0} = /[a-z]+/g.test('{1}');".format(
+      line,
+      rand.choice(WORDS)
+    ))
+  return "\n".join(lines) + "\n"
+
+def generatePackage(rand, root, name, files):
+  package_path = path.join(root, "node_modules", name)
+  writeFile(path.join(package_path, "package.json"), json.dumps({
+    "name": name,
+    "version": "1.0.0",
+    "main": "lib/index.js"
+  }))
+
+  lines = []
+  for index in range(rand.randint(5, 200)):
+    lines.append("exports.fn{0} = function fn{0}(value) {{ return value; }};".format(
+      index
+    ))
+  writeFile(path.join(package_path, "lib", "index.js"), "\n".join(lines) + "\n")
+
+  for index in range(files):
+    writeFile(
+      path.join(package_path, "lib", "{0}.js".format(getName(rand, index))),
+      "module.exports = function () {};\n"
+    )
+  writeFile(path.join(package_path, "README.md"), "# {0}\n".format(name))
+
+def generate(root, files=1000, packages=300, package_files=10, seed=0):
+  rand = random.Random(seed)
+  if path.exists(root):
+    shutil.rmtree(root)
+
+  names = []
+  for index in range(packages):
+    name = "pkg-{0}-{1}".format(rand.choice(WORDS), index)
+    if index % 10 == 0:
+      name = "@scope/" + name
+    names.append(name)
+    generatePackage(rand, root, name, package_files)
+
+  writeFile(path.join(root, "package.json"), json.dumps({
+    "name": "synthetic",
+    "dependencies": dict((name, "^1.0.0") for name in names)
+  }, indent=2))
+
+  for index in range(files):
+    folder = getSourceFolder(index)
+    if index % FILES_PER_FOLDER == 0:
+      filename = "index.js"
+    else:
+      filename = getName(rand, index) + ".js"
+    writeFile(
+      path.join(root, folder, filename),
+      getSourceBody(rand, index, names)
+    )
+
+    if index % 20 == 0:
+      asset = getName(rand, index) + rand.choice(ASSETS)
+      writeFile(path.join(root, folder, asset), "\n")
+
+  return root
+
+def main():
+  parser = argparse.ArgumentParser(description="Build a synthetic project")
+  parser.add_argument("root")
+  parser.add_argument("--files", type=int, default=1000)
+  parser.add_argument("--packages", type=int, default=300)
+  parser.add_argument("--package-files", type=int, default=10)
+  parser.add_argument("--seed", type=int, default=0)
+  args = parser.parse_args()
+
+  generate(args.root, args.files, args.packages, args.package_files, args.seed)
+
+if __name__ == "__main__":
+  main()
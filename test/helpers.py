@@ -0,0 +1,33 @@
+import os, shutil, sys, tempfile, unittest
+from os import path
+
+# The tests import the plugin as the lib package
+ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+if ROOT not in sys.path:
+  sys.path.insert(0, ROOT)
+
+def writeFile(root, relpath, body=""):
+  file_path = path.join(root, relpath)
+  if not path.isdir(path.dirname(file_path)):
+    os.makedirs(path.dirname(file_path))
+  with open(file_path, "wb" if isinstance(body, bytes) else "w") as file:
+    file.write(body)
+  return file_path
+
+def readFile(root, relpath):
+  with open(path.join(root, relpath)) as file:
+    return file.read()
+
+class ProjectTestCase(unittest.TestCase):
+  # Each test gets its own temporary project folder
+  def setUp(self):
+    self.project = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.project)
+
+  def writeFile(self, relpath, body=""):
+    return writeFile(self.project, relpath, body)
+
+  def readFile(self, relpath):
+    return readFile(self.project, relpath)
@@ -0,0 +1,149 @@
+# Just enough of the Sublime Text API to load the plugin outside the
+# editor. Views hold their text in memory and callbacks run right away
+import re, tempfile
+from os import path
+
+def cache_path():
+  return path.join(tempfile.gettempdir(), "SimpleImportStub")
+
+def set_timeout(callback, delay=0):
+  callback()
+
+def set_timeout_async(callback, delay=0):
+  callback()
+
+def status_message(message):
+  pass
+
+class Region:
+  def __init__(self, a, b=None):
+    self.a = a
+    self.b = a if b is None else b
+
+  def begin(self):
+    return min(self.a, self.b)
+
+  def end(self):
+    return max(self.a, self.b)
+
+  def size(self):
+    return self.end() - self.begin()
+
+  def empty(self):
+    return self.a == self.b
+
+  def __eq__(self, other):
+    return isinstance(other, Region) and (self.a, self.b) == (other.a, other.b)
+
+  def __repr__(self):
+    return "Region({0}, {1})".format(self.a, self.b)
+
+class Settings:
+  def __init__(self, values=None):
+    self.values = dict(values or {})
+
+  def get(self, key, default=None):
+    return self.values.get(key, default)
+
+  def set(self, key, value):
+    self.values[key] = value
+
+class Window:
+  def __init__(self, folders):
+    self.project_folders = list(folders)
+
+  def folders(self):
+    return self.project_folders
+
+  def show_quick_panel(self, items, on_select, *args, **kwargs):
+    on_select(0 if items else -1)
+
+  def run_command(self, name, args=None):
+    pass
+
+class View:
+  last_id = 0
+
+  def __init__(self, text="", file_name=None, window=None, syntax="JavaScript"):
+    View.last_id += 1
+    self.view_id = View.last_id
+    self.text = text
+    self.view_file_name = file_name
+    self.view_window = window
+    self.view_settings = Settings({
+      "syntax": "Packages/{0}/{0}.sublime-syntax".format(syntax)
+    })
+    self.selection = []
+    self.changes = 0
+    self.status = {}
+
+  def id(self):
+    return self.view_id
+
+  def file_name(self):
+    return self.view_file_name
+
+  def window(self):
+    return self.view_window
+
+  def settings(self):
+    return self.view_settings
+
+  def sel(self):
+    return self.selection
+
+  def size(self):
+    return len(self.text)
+
+  def change_count(self):
+    return self.changes
+
+  def substr(self, region):
+    if isinstance(region, int):
+      return self.text[region:region + 1]
+    return self.text[region.begin():region.end()]
+
+  def word(self, region):
+    point = region.begin() if isinstance(region, Region) else region
+    begin = point
+    while begin > 0 and (self.text[begin - 1].isalnum() or self.text[begin - 1] == "_"):
+      begin -= 1
+    end = point
+    while end < len(self.text) and (self.text[end].isalnum() or self.text[end] == "_"):
+      end += 1
+    return Region(begin, end)
+
+  def line(self, region):
+    point = region.begin() if isinstance(region, Region) else region
+    end = self.text.find("\n", point)
+    return Region(
+      self.text.rfind("\n", 0, point) + 1,
+      len(self.text) if end < 0 else end
+    )
+
+  def find_all(self, pattern):
+    return [
+      Region(match.start(), match.end())
+      for match in re.finditer(pattern, self.text)
+    ]
+
+  def insert(self, edit, point, text):
+    self.text = self.text[:point] + text + self.text[point:]
+    self.changes += 1
+    return len(text)
+
+  def replace(self, edit, region, text):
+    self.text = self.text[:region.begin()] + text + self.text[region.end():]
+    self.changes += 1
+
+  def set_status(self, key, value):
+    self.status[key] = value
+
+  def erase_status(self, key):
+    self.status.pop(key, None)
+
+  def show_popup_menu(self, items, on_select):
+    on_select(0 if items else -1)
+
+  def run_command(self, name, args=None):
+    pass
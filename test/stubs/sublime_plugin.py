@@ -0,0 +1,10 @@
+class TextCommand:
+  def __init__(self, view):
+    self.view = view
+
+class WindowCommand:
+  def __init__(self, window):
+    self.window = window
+
+class EventListener:
+  pass
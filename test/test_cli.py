@@ -0,0 +1,79 @@
+import io, json, sys, unittest
+from os import path
+
+from helpers import ProjectTestCase
+from lib import cli
+
+class CliTest(ProjectTestCase):
+  def setUp(self):
+    ProjectTestCase.setUp(self)
+    self.writeFile("src/actions.js", b"export const helloThing = 1;\n")
+    self.writeFile("src/app.js", b"helloThing();\n")
+
+  def run_cli(self, *args):
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = io.StringIO(), io.StringIO()
+    try:
+      status = cli.main(list(args))
+      return status, sys.stdout.getvalue(), sys.stderr.getvalue()
+    finally:
+      sys.stdout, sys.stderr = stdout, stderr
+
+  def test_resolve(self):
+    status, out, err = self.run_cli(
+      "resolve",
+      "--project", self.project,
+      "--settings", '{"file_source": "walker"}',
+      path.join(self.project, "src", "app.js") + ":helloThing"
+    )
+    result = json.loads(out)
+    self.assertEqual(status, 0)
+    self.assertEqual(result["unresolved"], [])
+    self.assertEqual(len(result["edits"]), 1)
+
+  def test_diagnostics_go_to_stderr(self):
+    # Not UTF-8, so it can not be read
+    self.writeFile("src/broken.js", b"export const other = '\xff\xfe';\n")
+    status, out, err = self.run_cli(
+      "resolve",
+      "--project", self.project,
+      "--settings", '{"file_source": "walker"}',
+      path.join(self.project, "src", "app.js") + ":helloThing"
+    )
+    self.assertEqual(
+      [json.loads(line)["unresolved"] for line in out.splitlines()],
+      [[]]
+    )
+    self.assertIn("Could not read", err)
+
+  def resolveAndWrite(self, spec):
+    return self.run_cli(
+      "resolve",
+      "--project", self.project,
+      "--settings", '{"file_source": "walker"}',
+      "--write",
+      path.join(self.project, spec)
+    )
+
+  def test_write_python(self):
+    self.writeFile("pkg/foo/bar.py", "def bar(): pass\n")
+    self.writeFile("app.py", "import os\n\nbar()\n")
+    status, out, err = self.resolveAndWrite("app.py:bar")
+    self.assertEqual(status, 0)
+    self.assertEqual(
+      self.readFile("app.py"),
+      "from .pkg.foo.bar import bar\nimport os\n\nbar()\n"
+    )
+
+  def test_write_scss(self):
+    self.writeFile("styles/_colors.scss", "$red: red;\n")
+    self.writeFile("styles/main.scss", "@import 'base';\nbody {}\n")
+    status, out, err = self.resolveAndWrite("styles/main.scss:colors")
+    self.assertEqual(status, 0)
+    self.assertEqual(
+      self.readFile("styles/main.scss"),
+      "@import \"colors\";\n@import 'base';\nbody {}\n"
+    )
+
+if __name__ == "__main__":
+  unittest.main()
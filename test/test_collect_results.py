@@ -0,0 +1,114 @@
+import time, unittest
+
+import helpers
+from lib.index import SearchCancelled, SearchToken
+from lib.interpreters import JavascriptInterpreter
+
+class CollectResultsTest(unittest.TestCase):
+  def setUp(self):
+    self.interpreter = JavascriptInterpreter()
+    self.consumed = []
+    self.closed = False
+
+  def results(self, items):
+    try:
+      for item in items:
+        self.consumed.append(item)
+        yield item
+    finally:
+      self.closed = True
+
+  def collect(self, values, results, max_exact_matches=0):
+    self.interpreter.setSettings(dict(
+      self.interpreter.settings,
+      max_exact_matches=max_exact_matches
+    ))
+    return self.interpreter.collectResults(values, results)
+
+  def test_groups_options(self):
+    self.assertEqual(
+      self.collect(["a", "b"], self.results([
+        ("a", "files", "src/a.js"),
+        ("a", "module_exports", ("redux", ["a"])),
+        ("a", "module_exports", ("redux", ["A"]))
+      ])),
+      {
+        "a": {
+          "files": ["src/a.js"],
+          "module_exports": { "redux": ["a", "A"] }
+        },
+        "b": {}
+      }
+    )
+
+  def test_stops_after_max_exact_matches(self):
+    results = self.results([
+      ("button", "files", "src/my-button.js"),
+      ("button", "files", "src/Button.js"),
+      ("button", "files", "src/ui/button/index.js"),
+      ("button", "files", "src/other/Button.js")
+    ])
+    self.assertEqual(
+      self.collect(["button"], results, max_exact_matches=2),
+      { "button": { "files": [
+        "src/my-button.js",
+        "src/Button.js",
+        "src/ui/button/index.js"
+      ] } }
+    )
+    self.assertEqual(len(self.consumed), 3)
+    self.assertTrue(self.closed)
+
+  def test_keeps_collecting_other_values(self):
+    results = self.results([
+      ("a", "files", "src/a.js"),
+      ("a", "files", "lib/a.js"),
+      ("b", "files", "src/b.js")
+    ])
+    self.assertEqual(
+      self.collect(["a", "b"], results, max_exact_matches=1),
+      { "a": { "files": ["src/a.js"] }, "b": { "files": ["src/b.js"] } }
+    )
+    self.assertEqual(len(self.consumed), 3)
+
+  def assertStopsWithPartialResults(self, token, stop):
+    def results():
+      yield "a", "files", "src/a.js"
+      stop()
+      token.check()
+      yield "a", "files", "lib/a.js"
+
+    self.assertEqual(
+      self.collect(["a", "b"], results()),
+      { "a": { "files": ["src/a.js"] }, "b": {} }
+    )
+
+  def test_cancelled_search_keeps_partial_results(self):
+    token = SearchToken()
+    self.assertStopsWithPartialResults(token, token.cancel)
+
+  def test_expired_search_keeps_partial_results(self):
+    self.assertStopsWithPartialResults(
+      SearchToken(0.01),
+      lambda: time.sleep(0.02)
+    )
+
+class SearchTokenTest(unittest.TestCase):
+  def test_cancel(self):
+    token = SearchToken()
+    token.check()
+    token.cancel()
+    self.assertTrue(token.isStopped())
+    self.assertRaises(SearchCancelled, token.check)
+
+  def test_deadline(self):
+    self.assertFalse(SearchToken(0).isExpired())
+    token = SearchToken(0.01)
+    self.assertFalse(token.isExpired())
+    time.sleep(0.02)
+    self.assertTrue(token.isExpired())
+    self.assertFalse(token.cancelled)
+    self.assertRaises(SearchCancelled, token.check)
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,81 @@
+import io, os, sys, time, unittest
+from os import path
+
+from helpers import ProjectTestCase
+from lib.index import ExportIndex, FileIndex, ParseCache
+from lib.lexers import readExports
+
+class ExportIndexTest(ProjectTestCase):
+  def setUp(self):
+    ProjectTestCase.setUp(self)
+    FileIndex.clear()
+    self.writeFile("src/a.js", "export const one = 1;\nexport const two = 2;\n")
+    self.writeFile("src/b.js", "export function two() {}\n")
+    self.writeFile("src/logo.png", "export const one = 1;\n")
+    self.parsed = []
+
+  def extract(self, file_path):
+    self.parsed.append(path.relpath(file_path, self.project))
+    return readExports(file_path)
+
+  def getIndex(self, cache=None):
+    file_index = FileIndex.get(self.project, refresh_interval=0)
+    file_index.refresh()
+    return ExportIndex.get(
+      file_index,
+      ("test",),
+      self.extract,
+      lambda filename: filename.endswith(".js"),
+      cache
+    )
+
+  def find(self, value, omit_files=None, cache=None):
+    return self.getIndex(cache).find(value, omit_files=omit_files)
+
+  def test_find(self):
+    a = path.join("src", "a.js")
+    b = path.join("src", "b.js")
+    self.assertEqual(self.find("one"), [(a, ["one"])])
+    self.assertEqual(self.find("two"), [(a, ["two"]), (b, ["two"])])
+    self.assertEqual(self.find("two", omit_files=[a]), [(b, ["two"])])
+    self.assertEqual(self.find("three"), [])
+    # Every file is parsed once
+    self.assertEqual(sorted(self.parsed), [a, b])
+
+  def test_saved_files(self):
+    self.find("one")
+    self.writeFile("src/a.js", "export const three = 3;\n")
+    FileIndex.onFileChanged(path.join(self.project, "src", "a.js"))
+    self.assertEqual(self.find("one"), [])
+    self.assertEqual(self.find("three"), [(path.join("src", "a.js"), ["three"])])
+
+  def test_removed_files(self):
+    self.find("one")
+    os.remove(path.join(self.project, "src", "a.js"))
+    FileIndex.onFileChanged(path.join(self.project, "src", "a.js"))
+    self.assertEqual(self.find("one"), [])
+    self.assertEqual(self.find("two"), [(path.join("src", "b.js"), ["two"])])
+
+  def test_files_edited_outside(self):
+    # Only found with a parse cache, by their mtime and size
+    cache = ParseCache()
+    self.find("one", cache=cache)
+    file_path = self.writeFile("src/b.js", "export const one = 1;\n")
+    future = time.time() + 10
+    os.utime(file_path, (future, future))
+    self.assertEqual(self.find("one", cache=cache), [
+      (path.join("src", "a.js"), ["one"]),
+      (path.join("src", "b.js"), ["one"])
+    ])
+
+  def test_unreadable_files(self):
+    self.writeFile("src/c.js", b"export const one = '\xff';\n")
+    stderr, sys.stderr = sys.stderr, io.StringIO()
+    try:
+      self.assertEqual(self.find("one"), [(path.join("src", "a.js"), ["one"])])
+      self.assertIn("Could not read", sys.stderr.getvalue())
+    finally:
+      sys.stderr = stderr
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,136 @@
+import shutil, tempfile, unittest
+from os import path
+
+from helpers import writeFile
+from lib.lexers import JavascriptExportLexer, readModuleExports
+
+class ExportLexerTest(unittest.TestCase):
+  def setUp(self):
+    self.lexer = JavascriptExportLexer()
+
+  def test_declarations(self):
+    self.assertEqual(
+      self.lexer.findExports(
+        "export const a = 1;\nexport let b;\nexport var c;\n"
+        "export class D {}\nexport function e() {}\n"
+        "export async function f() {}\nexport function* g() {}\n"
+      ),
+      ["a", "b", "c", "D", "e", "f", "g"]
+    )
+
+  def test_list(self):
+    self.assertEqual(
+      self.lexer.findExports(
+        "const a = 1, b = 2, c = 3;\n"
+        "export { a, b as renamed,\n  c as default };\n"
+      ),
+      ["a", "renamed"]
+    )
+
+  def test_es5_skips_lists(self):
+    self.assertEqual(
+      JavascriptExportLexer(es5=True).findExports(
+        "export { a };\nexports.b = 1;\n"
+      ),
+      ["b"]
+    )
+
+  def test_exports_properties(self):
+    self.assertEqual(
+      self.lexer.findModuleExports(
+        "exports.a = 1;\nmodule.exports.b = 2;\n"
+        "if (exports.c == 3) {}\nreexports.d = 4;\n"
+      ),
+      ["a", "b"]
+    )
+
+  def test_module_exports_object(self):
+    self.assertEqual(
+      self.lexer.findModuleExports(
+        "module.exports = {\n"
+        "  a: 1,\n"
+        "  'b-c': 2,\n"
+        "  \"d\": { nested: [1, 2] },\n"
+        "  e() { return { x: 1 }; },\n"
+        "  get f() {},\n"
+        "  async g() {},\n"
+        "  h,\n"
+        "  ...rest,\n"
+        "  // i: 1,\n"
+        "  j: function (a, b) { return '}'; }\n"
+        "};\n"
+      ),
+      ["a", "b-c", "d", "e", "f", "g", "h", "j"]
+    )
+
+  def test_module_exports_variable(self):
+    self.assertEqual(
+      self.lexer.findModuleExports(
+        "var text = 'api = { fake: 1 }';\n"
+        "var myapi = { other: 1 };\n"
+        "var api = {\n  Editor: Editor,\n  Block: Block\n};\n"
+        "module.exports = api;\n"
+      ),
+      ["Editor", "Block"]
+    )
+
+  def test_module_exports_unknown_variable(self):
+    self.assertEqual(
+      self.lexer.findModuleExports("module.exports = require('./a');\n"),
+      []
+    )
+
+  def test_default_object(self):
+    self.assertEqual(
+      self.lexer.findModuleExports("export default {\n  a,\n  b: 2\n};\n"),
+      ["a", "b"]
+    )
+
+  def test_named_exports_first(self):
+    self.assertEqual(
+      self.lexer.findModuleExports(
+        "export const a = 1;\nexport default { b: 2 };\n"
+      ),
+      ["a"]
+    )
+
+  def test_ignores_comments_strings_and_regexes(self):
+    self.assertEqual(
+      self.lexer.findExports(
+        "// export const a = 1;\n"
+        "/* export const b = 1;\n   export const c = 1; */\n"
+        "var d = 'export const d = 1';\n"
+        "var e = \"it's\\\" export const e\";\n"
+        "var f = `\nexport const f = 1;\n${g}`;\n"
+        "var h = /export const h/g;\n"
+        "run(); // export const i\n"
+        "export const j = 1;\n"
+      ),
+      ["j"]
+    )
+
+  def test_division_is_not_a_regex(self):
+    self.assertEqual(
+      self.lexer.findExports(
+        "var half = total / 2;\nexport const a = 1;\nvar b = a / half;\n"
+        "export const c = 2;\n"
+      ),
+      ["a", "c"]
+    )
+
+  def test_no_exports(self):
+    self.assertEqual(self.lexer.findExports("var a = 1;\n"), [])
+    self.assertEqual(self.lexer.findModuleExports("var a = { b: 1 };\n"), [])
+
+  def test_read_module_exports(self):
+    folder = tempfile.mkdtemp()
+    try:
+      file_path = writeFile(folder, "index.js",
+        "module.exports = { parse: parse, stringify };\n")
+      self.assertEqual(readModuleExports(file_path), ["parse", "stringify"])
+      self.assertIsNone(readModuleExports(path.join(folder, "missing.js")))
+    finally:
+      shutil.rmtree(folder)
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,108 @@
+import os, subprocess, time, unittest
+from os import path
+
+from helpers import ProjectTestCase
+from lib.index import FileIndex, GitFiles
+
+def hasGit():
+  try:
+    return subprocess.call(
+      ["git", "--version"],
+      stdout=subprocess.PIPE,
+      stderr=subprocess.PIPE
+    ) == 0
+  except OSError:
+    return False
+
+class FileIndexTest(ProjectTestCase):
+  SOURCE = "walker"
+
+  def setUp(self):
+    ProjectTestCase.setUp(self)
+    self.writeFile("src/a.js")
+    self.writeFile("src/b.js")
+    FileIndex.clear()
+
+  def touchDir(self, relpath):
+    # Folder mtimes may not change within the same clock tick
+    future = time.time() + 10
+    os.utime(path.join(self.project, relpath), (future, future))
+
+  def getFiles(self):
+    index = FileIndex.get(
+      self.project,
+      [".git"],
+      refresh_interval=0,
+      exclude={ "use_gitignore": True },
+      file_source=self.SOURCE
+    )
+    index.refresh()
+    return sorted(
+      path.join(relative_dir, filename)
+      for relative_dir, filename in index.iterFiles()
+      if filename != ".gitignore"
+    )
+
+  def test_lists_files(self):
+    self.assertEqual(self.getFiles(), [
+      path.join("src", "a.js"),
+      path.join("src", "b.js")
+    ])
+
+  def test_finds_files_created_outside(self):
+    self.getFiles()
+    self.writeFile("src/c.js")
+    self.touchDir("src")
+    self.assertIn(path.join("src", "c.js"), self.getFiles())
+
+  def test_forgets_files_deleted_outside(self):
+    self.getFiles()
+    os.remove(path.join(self.project, "src", "a.js"))
+    self.touchDir("src")
+    self.assertEqual(self.getFiles(), [path.join("src", "b.js")])
+
+  def test_saved_files(self):
+    self.getFiles()
+    self.writeFile("lib/d.js")
+    FileIndex.onFileChanged(path.join(self.project, "lib", "d.js"))
+    self.assertIn(path.join("lib", "d.js"), self.getFiles())
+
+@unittest.skipUnless(hasGit(), "git is not installed")
+class GitFileIndexTest(FileIndexTest):
+  SOURCE = "git"
+
+  def setUp(self):
+    FileIndexTest.setUp(self)
+    self.writeFile("build/out.js")
+    self.writeFile(".gitignore", "build\n")
+    self.git("init", "-q")
+    self.git("add", ".")
+    self.git(
+      "-c", "user.name=test",
+      "-c", "user.email=test@example.com",
+      "commit", "-q", "-m", "init"
+    )
+
+  def git(self, *args):
+    subprocess.check_call(["git"] + list(args), cwd=self.project)
+
+  def test_lists_from_git(self):
+    self.getFiles()
+    index = FileIndex.get(
+      self.project,
+      [".git"],
+      0,
+      { "use_gitignore": True },
+      file_source="git"
+    )
+    self.assertIsNotNone(index.git)
+
+  def test_deleted_tracked_files(self):
+    os.remove(path.join(self.project, "src", "a.js"))
+    self.assertNotIn(
+      path.join("src", "a.js"),
+      GitFiles(self.project).listFiles()
+    )
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,70 @@
+import json, unittest
+from os import path
+from unittest import mock
+
+from helpers import ProjectTestCase
+from lib.index import FileIndex
+from lib.interpreters import JavascriptInterpreter
+
+class FindByValuesTest(ProjectTestCase):
+  def setUp(self):
+    ProjectTestCase.setUp(self)
+    FileIndex.clear()
+    self.writeFile("package.json", json.dumps({
+      "dependencies": { "react-dom": "1.0.0" }
+    }))
+    self.writeFile("src/Button.js", "export const Button = 1;\n")
+    self.writeFile("src/actions.js", "export const SHOW_ALL = 1;\n")
+    self.writeFile("src/ui/button/index.js", "export default 1;\n")
+    self.interpreter = JavascriptInterpreter()
+    self.interpreter.setSettings(dict(
+      self.interpreter.settings,
+      file_source="walker"
+    ))
+
+  def test_same_as_one_value_at_a_time(self):
+    values = ["Button", "SHOW_ALL", "reactDom", "missing"]
+    expected = dict(
+      (value, self.interpreter.findByValue(value, self.project))
+      for value in values
+    )
+    self.assertEqual(
+      self.interpreter.findByValues(values + ["Button"], self.project),
+      expected
+    )
+    self.assertEqual(expected["Button"], {
+      "files": [
+        path.join("src", "Button.js"),
+        path.join("src", "ui", "button", "index.js")
+      ],
+      "exports": { path.join("src", "Button.js"): ["Button"] }
+    })
+
+  def test_one_pass_for_every_value(self):
+    getFileIndex = self.interpreter.getFileIndex
+    with mock.patch.object(
+      self.interpreter,
+      "getFileIndex",
+      side_effect=getFileIndex
+    ) as spy:
+      self.interpreter.findByValues(
+        ["Button", "SHOW_ALL", "reactDom", "missing"],
+        self.project
+      )
+
+    # Once for the files and once for the exports, whatever the number
+    # of values
+    self.assertEqual(spy.call_count, 2)
+
+  def test_omit_files(self):
+    self.assertEqual(
+      self.interpreter.findByValues(
+        ["SHOW_ALL"],
+        self.project,
+        omit_files=[path.join("src", "actions.js")]
+      ),
+      { "SHOW_ALL": {} }
+    )
+
+if __name__ == "__main__":
+  unittest.main()
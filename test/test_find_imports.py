@@ -0,0 +1,87 @@
+import shutil, tempfile, unittest
+from os import path
+
+from helpers import writeFile
+from lib.BatchResolver import BatchResolver
+from lib.interpreters import JavascriptInterpreter
+
+IMPORT = "import { a } from './a';"
+
+class FindImportsTest(unittest.TestCase):
+  def setUp(self):
+    self.interpreter = JavascriptInterpreter()
+
+  def findImports(self, text):
+    return [
+      statement for begin, end, statement in
+        self.interpreter.findImportsInText(text)
+    ]
+
+  def test_header(self):
+    self.assertEqual(
+      self.findImports(IMPORT + "\nimport b from 'b'\n\nrun();\n"),
+      [IMPORT, "import b from 'b'"]
+    )
+
+  def test_directives(self):
+    for directive in ["'use strict';", "'use client';", '"use server"']:
+      self.assertEqual(
+        self.findImports(directive + "\n" + IMPORT + "\n"),
+        [IMPORT]
+      )
+
+  def test_comments_and_side_effects(self):
+    self.assertEqual(
+      self.findImports(
+        "#!/usr/bin/env node\n// comment\n/* block */\n"
+        "import './polyfill';\nexport * from './c';\n"
+        "const d = require('d');\n" + IMPORT + "\n"
+      ),
+      [IMPORT]
+    )
+
+  def test_imports_after_code(self):
+    self.assertEqual(
+      self.findImports("run();\n\n" + IMPORT + "\n"),
+      [IMPORT]
+    )
+
+  def test_no_imports(self):
+    self.assertEqual(self.findImports("run();\n"), [])
+
+  def test_regions(self):
+    text = "'use client';\n" + IMPORT + "\n"
+    begin, end, statement = self.interpreter.findImportsInText(text)[0]
+    self.assertEqual(text[begin:end], statement)
+
+  def test_merges_after_directive(self):
+    project = tempfile.mkdtemp()
+    try:
+      writeFile(project, "src/actions.js",
+        "export const SHOW_ALL = 1;\nexport const SHOW_NONE = 2;\n")
+      app = writeFile(project, "src/app.js",
+        "'use client';\nimport { SHOW_ALL } from './actions';\n")
+
+      result = BatchResolver(project).resolve(app, ["SHOW_NONE"])
+      self.assertEqual(result["edits"], [
+        [14, 51, "import { SHOW_ALL, SHOW_NONE } from './actions';"]
+      ])
+    finally:
+      shutil.rmtree(project)
+
+  def test_merges_imports_of_the_same_module(self):
+    project = tempfile.mkdtemp()
+    try:
+      writeFile(project, "src/greek.js",
+        "export const alpha = 1;\nexport const beta = 2;\n")
+      app = writeFile(project, "src/app.js", "alpha(beta);\n")
+
+      result = BatchResolver(project).resolve(app, ["alpha", "beta"])
+      self.assertEqual(result["edits"], [
+        [0, 0, "import { alpha, beta } from './greek';\n"]
+      ])
+    finally:
+      shutil.rmtree(project)
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,67 @@
+import json, os, time, unittest
+from unittest import mock
+
+from helpers import ProjectTestCase
+from lib.index import Fingerprint
+from lib.interpreters import JavascriptInterpreter
+
+class FingerprintTest(ProjectTestCase):
+  def setUp(self):
+    ProjectTestCase.setUp(self)
+    self.writeFile("package.json", "{}")
+    self.mtime = time.time()
+
+  def getFingerprint(self):
+    return Fingerprint.get(self.project, ["package.json", "yarn.lock"])
+
+  def touch(self, relpath, body):
+    # A new mtime, even within the same clock tick
+    file_path = self.writeFile(relpath, body)
+    self.mtime += 10
+    os.utime(file_path, (self.mtime, self.mtime))
+
+  def test_shared_by_root_and_files(self):
+    self.assertIs(self.getFingerprint(), self.getFingerprint())
+    self.assertIsNot(
+      self.getFingerprint(),
+      Fingerprint.get(self.project, ["package.json"])
+    )
+
+  def test_changes_with_the_files(self):
+    fingerprint = self.getFingerprint()
+    value = fingerprint.check()
+    self.assertEqual(fingerprint.check(), value)
+
+    self.touch("package.json", "[]")
+    changed = fingerprint.check()
+    self.assertNotEqual(changed, value)
+
+    # A file that appears counts too, even empty
+    self.writeFile("yarn.lock", "")
+    self.assertNotEqual(fingerprint.check(), changed)
+
+  def test_hashes_only_when_stats_change(self):
+    fingerprint = self.getFingerprint()
+    fingerprint.check()
+    with mock.patch.object(fingerprint, "hashFiles") as hashFiles:
+      fingerprint.check()
+      self.assertFalse(hashFiles.called)
+      self.touch("package.json", "{}")
+      fingerprint.check()
+      self.assertTrue(hashFiles.called)
+
+  def test_same_contents_same_value(self):
+    fingerprint = self.getFingerprint()
+    value = fingerprint.check()
+    self.touch("package.json", "{}")
+    self.assertEqual(fingerprint.check(), value)
+
+  def test_modules_are_read_again_when_it_changes(self):
+    interpreter = JavascriptInterpreter()
+    self.touch("package.json", json.dumps({ "dependencies": { "a": "1" } }))
+    self.assertEqual(interpreter.findAllModules(self.project), ["a"])
+    self.touch("package.json", json.dumps({ "dependencies": { "b": "1" } }))
+    self.assertEqual(interpreter.findAllModules(self.project), ["b"])
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,46 @@
+import re, unittest
+
+import helpers
+from lib.index import GitIgnore
+
+class GitIgnoreTest(unittest.TestCase):
+  def assertTranslates(self, pattern, matched, unmatched):
+    regex = re.compile("\\A" + GitIgnore.translate(pattern) + "\\Z")
+    for relative_path in matched:
+      self.assertTrue(regex.match(relative_path), (pattern, relative_path))
+    for relative_path in unmatched:
+      self.assertFalse(regex.match(relative_path), (pattern, relative_path))
+
+  def test_translate_wildcards(self):
+    self.assertTranslates("*.js", ["a.js", ".js"], ["a/b.js", "a.jsx"])
+    self.assertTranslates("a?c", ["abc"], ["ac", "a/c"])
+
+  def test_translate_double_stars(self):
+    self.assertTranslates("**/foo", ["foo", "a/b/foo"], ["afoo", "foo/a"])
+    self.assertTranslates("a/**", ["a/b", "a/b/c"], ["b/a/c"])
+    self.assertTranslates("a/**/b", ["a/b", "a/x/y/b"], ["a/xb"])
+    self.assertTranslates("a**b", ["ab", "axxb"], ["a/b"])
+
+  def test_translate_brackets_and_escapes(self):
+    self.assertTranslates("[ab].js", ["a.js", "b.js"], ["c.js"])
+    self.assertTranslates("[!ab].js", ["c.js"], ["a.js"])
+    self.assertTranslates("[a", ["[a"], ["a"])
+    self.assertTranslates("\\*.js", ["*.js"], ["a.js"])
+    self.assertTranslates("a+b(c).js", ["a+b(c).js"], ["aab(c).js"])
+
+  def test_match(self):
+    ignore = GitIgnore(["# comment", "", "*.log", "build/", "/root.js"])
+    self.assertTrue(ignore.match("a/b.log", False))
+    self.assertTrue(ignore.match("a/build", True))
+    self.assertIsNone(ignore.match("a/build", False))
+    self.assertTrue(ignore.match("root.js", False))
+    self.assertIsNone(ignore.match("a/root.js", False))
+
+  def test_negated_rules(self):
+    ignore = GitIgnore(["*.log", "!keep.log", "keep.log.d/"])
+    self.assertTrue(ignore.match("a.log", False))
+    self.assertFalse(ignore.match("keep.log", False))
+    self.assertIsNone(ignore.match("a.js", False))
+
+if __name__ == "__main__":
+  unittest.main()
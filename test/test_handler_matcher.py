@@ -0,0 +1,77 @@
+import unittest
+
+import helpers
+from lib.interpreter.Handler import Handler
+from lib.interpreter.HandlerMatcher import HandlerMatcher
+from lib.interpreters import JavascriptInterpreter
+
+CONTEXTS = [
+  "import * as utils from 'utils'",
+  "utils.*",
+  "imp lodash",
+  "import { a, b } from 'c'",
+  "import d, { e } from 'f';",
+  "connect::react-redux",
+  "import React from 'react'",
+  "React.Component",
+  "import x",
+  "require lodash.map",
+  "req react",
+  "require redux",
+  "const store = redux",
+  "let y",
+  "plainValue",
+  ""
+]
+
+def searchEach(handlers, context):
+  # What HandlerMatcher replaces: each matcher searched one after the other
+  for handler in handlers:
+    for matcher in handler.matchers:
+      match = matcher.search(context)
+      if match:
+        return handler, match.span(), match.groupdict()
+  return None
+
+class HandlerMatcherTest(unittest.TestCase):
+  def setUp(self):
+    self.handlers = JavascriptInterpreter().handlers
+
+  def test_same_as_searching_each_matcher(self):
+    matcher = HandlerMatcher(self.handlers)
+    self.assertIsNotNone(matcher.regex)
+    for context in CONTEXTS:
+      self.assertEqual(
+        matcher.match(context),
+        searchEach(self.handlers, context),
+        context
+      )
+
+  def test_without_combined_regex(self):
+    matcher = HandlerMatcher(self.handlers)
+    matcher.regex = None
+    for context in CONTEXTS:
+      self.assertEqual(
+        matcher.match(context),
+        searchEach(self.handlers, context),
+        context
+      )
+
+  def test_handler_order(self):
+    keys = { "name": "\\w+" }
+    first = Handler("first", ["b{name}"], keys)
+    second = Handler("second", ["a{name}", "(?P<name>x)"], keys)
+    matcher = HandlerMatcher([first, second])
+
+    handler, span, groups = matcher.match("abc")
+    self.assertIs(handler, first)
+    self.assertEqual((span, groups), ((1, 3), { "name": "c" }))
+
+    handler, span, groups = matcher.match("ax")
+    self.assertIs(handler, second)
+    self.assertEqual((span, groups), ((0, 2), { "name": "x" }))
+
+    self.assertIsNone(matcher.match("zzz"))
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+
+import helpers
+from lib.lexers import JavascriptIdentifierLexer
+
+class IdentifierLexerTest(unittest.TestCase):
+  def setUp(self):
+    self.lexer = JavascriptIdentifierLexer()
+
+  def assertMissing(self, text, names):
+    self.assertEqual(self.lexer.findMissing(text), names)
+
+  def test_declarations(self):
+    self.assertMissing(
+      "const a = 1; let b = a; var c = b;\n"
+      "function d(e, f = g) { return e + f; }\n"
+      "class H extends I {}\n"
+      "d(a, b, c, new H(), J);\n",
+      ["g", "I", "J"]
+    )
+
+  def test_destructuring(self):
+    self.assertMissing(
+      "const { a, b: { c }, d = e, ...f } = obj;\n"
+      "const [g, [h], i = j] = arr;\n"
+      "use(a, c, d, f, g, h, i);\n",
+      ["e", "obj", "j", "arr", "use"]
+    )
+
+  def test_arrow_functions_and_catch(self):
+    self.assertMissing(
+      "const f = (a, { b }) => a + b + c;\nconst g = x => x * y;\n"
+      "try { f() } catch (err) { log(err) }\n",
+      ["c", "y", "log"]
+    )
+
+  def test_imports(self):
+    self.assertMissing(
+      "import A, { B as C, D } from 'e';\nimport * as F from 'g';\n"
+      "A(C, D, F, B);\n",
+      ["B"]
+    )
+
+  def test_exports(self):
+    self.assertMissing(
+      "export { a as b, c };\nexport * as ns from 'x';\nexport default d;\n",
+      ["a", "c", "d"]
+    )
+
+  def test_jsx(self):
+    self.assertMissing(
+      "const x = <Button onClick={handle} disabled>\n"
+      "  {label}<span className='a' /><Foo.Bar />\n"
+      "</Button>;\n",
+      ["Button", "handle", "label", "Foo"]
+    )
+
+  def test_templates(self):
+    self.assertMissing(
+      "const s = `hello ${name} and ${`nested ${deep}`} ${obj.prop}`;\n"
+      "const t = 'plain ${notAName}';\n",
+      ["name", "deep", "obj"]
+    )
+
+  def test_labels(self):
+    self.assertMissing(
+      "outer: for (const i of list) { if (i) continue outer; break outer; }\n",
+      ["list"]
+    )
+
+  def test_members_and_keys(self):
+    self.assertMissing(
+      "a.b.c(); obj?.prop;\n"
+      "const o = { key: value, method() { return inner; }, [computed]: 1 };\n",
+      ["a", "obj", "value", "inner", "computed"]
+    )
+
+  def test_class_members(self):
+    self.assertMissing(
+      "class K {\n  field = 1;\n  static s = 2;\n"
+      "  method(p) { return this.field + p + q; }\n  get g() {}\n}\n",
+      ["q"]
+    )
+
+  def test_globals(self):
+    self.assertMissing(
+      "console.log(window, document, Math.max(1, 2), require('x'));\n"
+      "process.env; Promise; setTimeout; Missing;\n",
+      ["Missing"]
+    )
+
+  def test_comments_strings_and_regexes(self):
+    self.assertMissing(
+      "// Commented\n/* Block */\nconst s = 'Quoted';\n"
+      "const r = /Pattern/g;\nconst n = a / b;\n",
+      ["a", "b"]
+    )
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,131 @@
+import os, unittest
+from os import path
+
+from helpers import ProjectTestCase
+from lib.ImportCodemod import ImportCodemod
+
+class ImportCodemodTest(ProjectTestCase):
+  def setUp(self):
+    ProjectTestCase.setUp(self)
+    self.writeFile("src/components/Button.js", "export default 1;\n")
+    self.writeFile("src/components/index.js", "export * from './Button';\n")
+
+  def run_codemod(self, moves, write=True):
+    codemod = ImportCodemod(self.project, moves, write=write)
+    results = [codemod.rewrite(relpath) for relpath in codemod.listFiles()]
+    return dict((relpath, count) for relpath, count, diff in results if count)
+
+  def assertRewrites(self, before, after):
+    self.writeFile("src/app.js", before)
+    self.run_codemod([("src/components", "src/ui")])
+    self.assertEqual(self.readFile("src/app.js"), after)
+
+  def test_import(self):
+    self.assertRewrites(
+      "import Button from './components/Button';\n",
+      "import Button from './ui/Button';\n"
+    )
+
+  def test_import_after_code(self):
+    self.assertRewrites(
+      "const a = 1;\n\nimport { Button,\n  Other } from \"./components/Button\"\n",
+      "const a = 1;\n\nimport { Button,\n  Other } from \"./ui/Button\"\n"
+    )
+
+  def test_export_from(self):
+    self.assertRewrites(
+      "export * from './components/Button';\n"
+      "export { default as Button } from './components/Button';\n",
+      "export * from './ui/Button';\n"
+      "export { default as Button } from './ui/Button';\n"
+    )
+
+  def test_side_effect_import(self):
+    self.assertRewrites(
+      "import './components/Button';\n",
+      "import './ui/Button';\n"
+    )
+
+  def test_require(self):
+    self.assertRewrites(
+      "const Button = require('./components/Button');\n",
+      "const Button = require('./ui/Button');\n"
+    )
+
+  def test_dynamic_import(self):
+    self.assertRewrites(
+      "load(() => import('./components/Button.js'));\n",
+      "load(() => import('./ui/Button.js'));\n"
+    )
+
+  def test_index_folder(self):
+    self.assertRewrites(
+      "import { Button } from './components';\n",
+      "import { Button } from './ui';\n"
+    )
+
+  def test_other_strings_are_kept(self):
+    source = (
+      "const name = './components/Button';\n"
+      "Array.from('./components/Button');\n"
+    )
+    self.assertRewrites(source, source)
+
+  def test_strings_and_comments_are_kept(self):
+    source = (
+      "const s = \"from './components/Button'\";\n"
+      "// import y from './components/Button';\n"
+      "/* require('./components/Button') */\n"
+      "const t = `import('./components/Button')`;\n"
+    )
+    self.assertRewrites(
+      source + "import Button from './components/Button';\n",
+      source + "import Button from './ui/Button';\n"
+    )
+
+  def test_moved_file_relative_imports(self):
+    self.writeFile("src/deep/a.js", "import x from '../components/Button';\n")
+    self.writeFile("src/other.js", "export default 2;\n")
+    self.writeFile("src/deep/b.js", "import other from '../other';\n")
+    self.run_codemod([("src/deep", "src/lib/deep")])
+    self.assertEqual(
+      self.readFile("src/deep/b.js"),
+      "import other from '../../other';\n"
+    )
+
+  def test_after_the_move(self):
+    self.writeFile("src/app.js", "import Button from './components/Button';\n")
+    os.rename(
+      path.join(self.project, "src", "components"),
+      path.join(self.project, "src", "ui")
+    )
+    self.run_codemod([("src/components", "src/ui")])
+    self.assertEqual(
+      self.readFile("src/app.js"),
+      "import Button from './ui/Button';\n"
+    )
+    self.assertEqual(
+      self.readFile("src/ui/index.js"),
+      "export * from './Button';\n"
+    )
+
+  def test_package(self):
+    self.writeFile("src/app.js", "import fp from 'lodash/fp';\nimport x from 'lodashx';\n")
+    self.run_codemod([("lodash", "lodash-es")])
+    self.assertEqual(
+      self.readFile("src/app.js"),
+      "import fp from 'lodash-es/fp';\nimport x from 'lodashx';\n"
+    )
+
+  def test_dry_run(self):
+    source = "import Button from './components/Button';\n"
+    self.writeFile("src/app.js", source)
+    codemod = ImportCodemod(self.project, [("src/components", "src/ui")])
+    relpath, count, diff = codemod.rewrite(path.join("src", "app.js"))
+
+    self.assertEqual(count, 1)
+    self.assertIn("+import Button from './ui/Button';", diff)
+    self.assertEqual(self.readFile("src/app.js"), source)
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,92 @@
+import json, shutil, tempfile, unittest
+from os import path
+
+from helpers import writeFile
+from lib.index import ModuleCache
+from lib.interpreters import JavascriptInterpreter
+
+class ModuleCacheTest(unittest.TestCase):
+  def setUp(self):
+    self.tmp = tempfile.mkdtemp()
+    self.project = path.join(self.tmp, "project")
+    self.writeFile("package.json", json.dumps({
+      "dependencies": { "pkg": "1.0.0" }
+    }))
+    self.writeFile("node_modules/pkg/package.json", json.dumps({
+      "name": "pkg",
+      "version": "1.0.0"
+    }))
+    self.writeFile("node_modules/pkg/lib/deepThing.js", "")
+    self.interpreter = JavascriptInterpreter()
+
+  def tearDown(self):
+    ModuleCache.setCacheDir(None)
+    shutil.rmtree(self.tmp)
+
+  def writeFile(self, relpath, body):
+    writeFile(self.project, relpath, body)
+
+  def findValue(self, project, value, cache=None):
+    self.interpreter.setSettings(dict(
+      self.interpreter.settings,
+      file_source="walker",
+      cache=cache or {}
+    ))
+    return self.interpreter.findByValue(value, project)
+
+  def findDeepThing(self, project, cache):
+    return self.findValue(project, "deepThing", cache)
+
+  def test_rescans_when_include_changes(self):
+    self.assertEqual(self.findDeepThing(self.project, {}), {})
+    self.assertEqual(
+      self.findDeepThing(self.project, { "pkg": { "include": ["lib"] } }),
+      { "module_files": ["pkg/deepThing.js"] }
+    )
+    self.assertEqual(self.findDeepThing(self.project, {}), {})
+
+  def test_module_files(self):
+    self.writeFile("node_modules/pkg/my-thing.js", "")
+    self.writeFile("node_modules/pkg/logo.png", "")
+    self.assertEqual(
+      self.findValue(self.project, "myThing"),
+      { "module_files": ["pkg/my-thing.js"] }
+    )
+    self.assertEqual(
+      self.findValue(self.project, "logo"),
+      { "module_extra_files": ["pkg/logo.png"] }
+    )
+
+  def test_module_names(self):
+    self.writeFile("package.json", json.dumps({
+      "dependencies": { "pkg": "1.0.0", "lodash.map": "1.0.0" },
+      "devDependencies": { "react-dom": "1.0.0", "a+b": "1.0.0" }
+    }))
+    self.assertEqual(
+      self.findValue(self.project, "lodashMap"),
+      { "modules": ["lodash.map"] }
+    )
+    self.assertEqual(
+      self.findValue(self.project, "ReactDom"),
+      { "modules": ["react-dom"] }
+    )
+    self.assertEqual(self.findValue(self.project, "a+b"), { "modules": ["a+b"] })
+    self.assertEqual(self.findValue(self.project, "map"), {})
+
+  def test_persistent_cache(self):
+    ModuleCache.setCacheDir(path.join(self.tmp, "cache"))
+    include = { "pkg": { "include": ["lib"] } }
+    self.findDeepThing(self.project, include)
+
+    # Another project with the same modules reads them from the cache
+    other = path.join(self.tmp, "other")
+    shutil.copytree(self.project, other)
+    shutil.rmtree(path.join(other, "node_modules", "pkg", "lib"))
+    self.assertEqual(
+      self.findDeepThing(other, include),
+      { "module_files": ["pkg/deepThing.js"] }
+    )
+    self.assertEqual(self.findDeepThing(other, {}), {})
+
+if __name__ == "__main__":
+  unittest.main()
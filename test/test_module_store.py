@@ -0,0 +1,70 @@
+import unittest
+
+import helpers
+from lib.index import ModuleStore
+
+class ModuleStoreTest(unittest.TestCase):
+  def setUp(self):
+    self.store = ModuleStore(max_entries=3)
+
+  def names(self, project_path):
+    return [ name for name, module in self.store.modules(project_path) ]
+
+  def test_evicts_least_recently_used(self):
+    for name in ["a", "b", "c", "d"]:
+      self.store.set("project", name, { "exports": [name] })
+
+    self.assertEqual(self.names("project"), ["b", "c", "d"])
+    self.assertIsNone(self.store.get("project", "a"))
+    self.assertEqual(self.store.getEvictions("project"), 1)
+
+  def test_access_promotes(self):
+    for name in ["a", "b", "c"]:
+      self.store.set("project", name, {})
+
+    self.assertEqual(self.store.get("project", "a"), {})
+    self.store.set("project", "d", {})
+    self.assertEqual(self.names("project"), ["c", "a", "d"])
+
+  def test_least_recently_used_project_goes_first(self):
+    self.store.set("one", "a", {})
+    self.store.set("one", "b", {})
+    self.store.set("two", "c", {})
+    self.store.setFingerprint("one", "1")
+    self.store.setFingerprint("two", "2")
+
+    # Looking into a project promotes it with its modules
+    self.store.modules("one")
+    self.store.set("three", "d", {})
+    self.assertEqual(self.names("one"), ["a", "b"])
+    self.assertEqual(self.names("two"), [])
+    self.assertEqual(self.names("three"), ["d"])
+    self.assertEqual(self.store.getEvictions("two"), 1)
+    # It is scanned again on the next lookup
+    self.assertIsNone(self.store.getFingerprint("two"))
+    self.assertEqual(self.store.getFingerprint("one"), "1")
+
+  def test_size_budget(self):
+    self.store = ModuleStore(max_size=ModuleStore.ENTRY_OVERHEAD * 5)
+    for name in ["a", "b", "c"]:
+      self.store.set("project", name, { "files": [name + ".js"] })
+
+    self.assertEqual(self.names("project"), ["b", "c"])
+    self.assertLessEqual(self.store.size, self.store.max_size)
+
+  def test_lower_budget_evicts(self):
+    for name in ["a", "b", "c"]:
+      self.store.set("project", name, {})
+
+    self.store.setBudget(max_entries=1)
+    self.assertEqual(self.names("project"), ["c"])
+    self.assertEqual(self.store.stats()["entries"], 1)
+
+  def test_replacing_a_module(self):
+    self.store.set("project", "a", { "exports": ["x"] })
+    self.store.set("project", "a", { "exports": ["x", "y"] })
+    self.assertEqual(self.store.stats()["entries"], 1)
+    self.assertEqual(self.store.get("project", "a"), { "exports": ["x", "y"] })
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from os import path
+
+import helpers
+from lib.index import NameIndex
+from lib.interpreters import PythonInterpreter
+
+def normalize(value):
+  return value.replace("-", "").replace(".", "").lower()
+
+class NameIndexTest(unittest.TestCase):
+  def setUp(self):
+    self.index = NameIndex([".js", ".jsx"], [".png"], "index", normalize)
+    self.index.onFilesChanged([
+      ("src", "Button.js"),
+      (path.join("src", "ui"), "button.jsx"),
+      (path.join("src", "my-list"), "index.js"),
+      ("src", "logo.png"),
+      ("src", "readme.md")
+    ], [], [])
+
+  def test_exact_names_first(self):
+    self.assertEqual(self.index.find("files", "button"), [
+      path.join("src", "Button.js"),
+      path.join("src", "ui", "button.jsx")
+    ])
+
+  def test_index_files(self):
+    self.assertEqual(self.index.find("files", "mylist"), [
+      path.join("src", "my-list", "index.js")
+    ])
+    self.assertEqual(self.index.find("files", "mylist/index"), [
+      path.join("src", "my-list", "index.js")
+    ])
+
+  def test_path_suffixes(self):
+    self.assertEqual(self.index.find("files", "ui/button"), [
+      path.join("src", "ui", "button.jsx")
+    ])
+    self.assertEqual(self.index.find("files", "ton"), [
+      path.join("src", "Button.js"),
+      path.join("src", "ui", "button.jsx")
+    ])
+
+  def test_extra_files(self):
+    self.assertEqual(self.index.find("extra_files", "logo"), [
+      path.join("src", "logo.png")
+    ])
+    self.assertEqual(self.index.find("files", "logo"), [])
+    self.assertEqual(self.index.find("files", "readme"), [])
+
+  def test_matches(self):
+    self.assertTrue(self.index.matches("files", "pkg", "my-list.js", "mylist"))
+    self.assertTrue(self.index.matches("files", "pkg", "my-list.js", "pkg/mylist"))
+    self.assertTrue(self.index.matches("extra_files", "pkg", "logo.png", "logo"))
+    self.assertFalse(self.index.matches("files", "pkg", "logo.png", "logo"))
+    self.assertFalse(self.index.matches("files", "pkg", "list.js", "mylist"))
+
+  def test_removed_files(self):
+    self.index.onFilesChanged([], [("src", "Button.js")], [])
+    self.assertEqual(self.index.find("files", "button"), [
+      path.join("src", "ui", "button.jsx")
+    ])
+
+class PythonFileQueryTest(unittest.TestCase):
+  def setUp(self):
+    self.interpreter = PythonInterpreter()
+    self.index = NameIndex(
+      [".py"],
+      [],
+      self.interpreter.index_file_name,
+      self.interpreter.normalizeValue
+    )
+    self.index.onFilesChanged([
+      (path.join("pkg", "foo"), "bar.py"),
+      (path.join("lib", "foo", "bar"), "__init__.py"),
+      ("pkg", "foobar.py")
+    ], [], [])
+
+  def find(self, value):
+    return self.index.find("files", self.interpreter.getFileQueryKey(value))
+
+  def test_dotted_modules(self):
+    self.assertEqual(self.find("foo.bar"), [
+      path.join("lib", "foo", "bar", "__init__.py"),
+      path.join("pkg", "foo", "bar.py")
+    ])
+    self.assertEqual(self.find("Foobar"), [path.join("pkg", "foobar.py")])
+
+if __name__ == "__main__":
+  unittest.main()
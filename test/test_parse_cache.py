@@ -0,0 +1,76 @@
+import os, unittest
+from os import path
+
+from helpers import ProjectTestCase
+from lib.index import ParseCache, WorkerPool
+
+class ParseCacheTest(ProjectTestCase):
+  def setUp(self):
+    ProjectTestCase.setUp(self)
+    self.cache = ParseCache()
+    self.parsed = []
+    self.a = self.writeFile("a.js", "a")
+    self.b = self.writeFile("b.js", "b")
+
+  def extract(self, file_path):
+    self.parsed.append(path.basename(file_path))
+    try:
+      with open(file_path) as file:
+        return file.read()
+    except IOError:
+      return None
+
+  def map(self, *file_paths):
+    self.parsed = []
+    return list(self.cache.map(WorkerPool.get(), self.extract, list(file_paths)))
+
+  def test_parses_files_once(self):
+    self.assertEqual(self.map(self.a, self.b), ["a", "b"])
+    self.assertEqual(self.map(self.a, self.b), ["a", "b"])
+    self.assertEqual(self.parsed, [])
+    self.assertTrue(self.cache.isFresh(self.a))
+
+  def test_size_change(self):
+    self.map(self.a, self.b)
+    stat = os.stat(self.a)
+    self.writeFile("a.js", "aa")
+    os.utime(self.a, (stat.st_atime, stat.st_mtime))
+    self.assertFalse(self.cache.isFresh(self.a))
+    self.assertEqual(self.map(self.a, self.b), ["aa", "b"])
+    self.assertEqual(self.parsed, ["a.js"])
+
+  def test_mtime_change(self):
+    self.map(self.a, self.b)
+    self.writeFile("a.js", "c")
+    mtime = os.stat(self.a).st_mtime + 10
+    os.utime(self.a, (mtime, mtime))
+    self.assertEqual(self.map(self.a, self.b), ["c", "b"])
+    self.assertEqual(self.parsed, ["a.js"])
+
+  def test_unreadable_files_are_not_kept(self):
+    missing = path.join(self.project, "missing.js")
+    self.assertEqual(self.map(missing), [None])
+    self.assertEqual(self.map(missing), [None])
+    self.assertEqual(self.parsed, ["missing.js"])
+
+  def test_discard(self):
+    self.map(self.a)
+    self.cache.discard(self.a)
+    self.assertFalse(self.cache.isFresh(self.a))
+    self.map(self.a)
+    self.assertEqual(self.parsed, ["a.js"])
+
+  def test_max_entries(self):
+    self.cache = ParseCache(max_entries=2)
+    c = self.writeFile("c.js", "c")
+    self.map(self.a, self.b)
+    # Used last, so b goes first
+    self.map(self.a)
+    self.map(c)
+    self.assertEqual(list(self.cache.entries), [self.a, c])
+    self.assertEqual(self.map(self.a, self.b, c), ["a", "b", "c"])
+    self.assertEqual(self.parsed, ["b.js"])
+    self.assertEqual(len(self.cache.entries), 2)
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,70 @@
+import io, pstats, sys, unittest
+from os import path
+
+from helpers import ProjectTestCase
+from lib.index import Profiler
+
+def slowStage(value):
+  return sum(range(1000)) and value
+
+class ProfilerTest(ProjectTestCase):
+  def setUp(self):
+    ProjectTestCase.setUp(self)
+    Profiler.armed = False
+
+  def test_arm_profiles_the_next_invocation(self):
+    self.assertIsNone(Profiler.start())
+    Profiler.arm()
+    self.assertIsInstance(Profiler.start(), Profiler)
+    self.assertIsNone(Profiler.start())
+    self.assertIsInstance(Profiler.start(always=True), Profiler)
+
+  def test_runcall(self):
+    profiler = Profiler.start(always=True)
+    # Stages called from a profiled stage are part of it
+    self.assertEqual(
+      profiler.runcall(profiler.runcall, slowStage, "a"),
+      "a"
+    )
+    self.assertFalse(profiler.running)
+    self.assertRaises(ZeroDivisionError, profiler.runcall, lambda: 1 / 0)
+    self.assertFalse(profiler.running)
+
+  def test_save(self):
+    profiler = Profiler.start(always=True)
+    profiler.runcall(slowStage, "a")
+    prof_path = profiler.save(
+      self.project,
+      "/home/me/my app",
+      "connect, Button",
+      "javascript",
+      top=5
+    )
+
+    self.assertEqual(path.dirname(prof_path), path.join(self.project, "profiles"))
+    self.assertTrue(
+      path.basename(prof_path).endswith("-my_app-javascript-connect_Button.prof")
+    )
+    self.assertIn("slowStage", str(pstats.Stats(prof_path).stats))
+
+    with open(prof_path[:-len(".prof")] + ".txt") as file:
+      summary = file.read()
+    self.assertTrue(summary.startswith(
+      "Project: /home/me/my app\nQuery: connect, Button\nInterpreter: javascript\n"
+    ))
+    self.assertIn("Top 5 by cumulative time", summary)
+    self.assertIn("slowStage", summary)
+
+  def test_save_fails(self):
+    # A file where the folder should be
+    cache_dir = path.dirname(self.writeFile("cache/profiles", ""))
+    profiler = Profiler.start(always=True)
+    stderr, sys.stderr = sys.stderr, io.StringIO()
+    try:
+      self.assertIsNone(profiler.save(cache_dir, "project", "a", "javascript"))
+      self.assertIn("could not write the profile", sys.stderr.getvalue())
+    finally:
+      sys.stderr = stderr
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,62 @@
+import io, json, os, sys, time, unittest
+
+from helpers import ProjectTestCase
+from lib.ProjectSettings import ProjectSettings
+
+class ProjectSettingsTest(ProjectTestCase):
+  def writeSettings(self, settings):
+    return self.writeFile(ProjectSettings.FILE_NAME, json.dumps(settings))
+
+  def getSettings(self, relpath="src/app.js", syntax="javascript"):
+    return ProjectSettings.get(self.project).getSettings(syntax, relpath)
+
+  def test_syntax_settings(self):
+    self.writeSettings({ "javascript": { "add_semicolon": False } })
+    self.assertEqual(self.getSettings(), { "add_semicolon": False })
+    self.assertIsNone(self.getSettings(syntax="python"))
+
+  def test_path_rules(self):
+    self.writeSettings({
+      "javascript": {
+        "$path": [
+          [{ "a": 1 }],
+          ["src/", "lib/", { "b": 2 }],
+          ["src/legacy/", { "a": 3 }]
+        ]
+      }
+    })
+    self.assertEqual(self.getSettings("src/app.js"), { "a": 1, "b": 2 })
+    self.assertEqual(self.getSettings("lib/app.js"), { "a": 1, "b": 2 })
+    self.assertEqual(self.getSettings("src/legacy/app.js"), { "a": 3, "b": 2 })
+    self.assertEqual(self.getSettings("test/app.js"), { "a": 1 })
+
+  def test_reloads_when_the_file_changes(self):
+    self.writeSettings({ "javascript": { "a": 1 } })
+    self.assertEqual(self.getSettings(), { "a": 1 })
+    version = ProjectSettings.get(self.project).version
+
+    # Checked again only once notified, or after CHECK_INTERVAL. The
+    # mtime may not change within the same clock tick
+    file_path = self.writeSettings({ "javascript": { "a": 2 } })
+    future = time.time() + 10
+    os.utime(file_path, (future, future))
+    self.assertEqual(self.getSettings(), { "a": 1 })
+
+    ProjectSettings.onFileChanged(file_path)
+    self.assertEqual(self.getSettings(), { "a": 2 })
+    self.assertEqual(ProjectSettings.get(self.project).version, version + 1)
+
+  def test_invalid_file(self):
+    self.writeFile(ProjectSettings.FILE_NAME, "{")
+    stderr, sys.stderr = sys.stderr, io.StringIO()
+    try:
+      self.assertIsNone(self.getSettings())
+      self.assertIn(".simple-import.json", sys.stderr.getvalue())
+    finally:
+      sys.stderr = stderr
+
+  def test_missing_file(self):
+    self.assertIsNone(self.getSettings())
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,59 @@
+import shutil, tempfile, unittest
+from os import path
+
+from helpers import writeFile
+from lib.lexers import SourceReader
+from lib.interpreters import JavascriptInterpreter
+
+class SourceReaderTest(unittest.TestCase):
+  def setUp(self):
+    self.tmp = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.tmp)
+
+  def writeFile(self, relpath, body):
+    return writeFile(self.tmp, relpath, body)
+
+  def test_generated_paths(self):
+    reader = SourceReader(skip_generated=True)
+    self.assertTrue(reader.isGeneratedPath("src/app.min.js"))
+    self.assertTrue(reader.isGeneratedPath("src/app.bundle.js"))
+    self.assertTrue(reader.isGeneratedPath("dist/app.js"))
+    self.assertFalse(reader.isGeneratedPath("src/distance.js"))
+
+  def test_only_checks_below_root(self):
+    root = path.join(self.tmp, "dist", "project")
+    reader = SourceReader(skip_generated=True, root=root)
+    self.assertFalse(reader.isGeneratedPath(path.join(root, "src", "a.js")))
+    self.assertTrue(reader.isGeneratedPath(path.join(root, "dist", "a.js")))
+
+  def test_read_skips_generated_and_missing_keyword(self):
+    reader = SourceReader(skip_generated=True, root=self.tmp)
+    source = self.writeFile("src/a.js", "export const a = 1;\n")
+    built = self.writeFile("dist/a.js", "export const a = 1;\n")
+    plain = self.writeFile("src/b.js", "const b = 1;\n")
+
+    self.assertEqual(reader.read(source, "export"), "export const a = 1;\n")
+    self.assertEqual(reader.read(built, "export"), "")
+    self.assertEqual(reader.read(plain, "export"), "")
+
+  def test_read_skips_big_files(self):
+    reader = SourceReader(max_size=10)
+    file_path = self.writeFile("a.js", "export const a = 1;\n")
+    self.assertEqual(reader.read(file_path, "export"), "")
+
+  def test_project_in_dist_folder(self):
+    project = path.join(self.tmp, "dist", "project")
+    self.writeFile("dist/project/src/a.js", "export const helloThing = 1;\n")
+    self.writeFile("dist/project/dist/b.js", "export const helloThing = 1;\n")
+
+    interpreter = JavascriptInterpreter()
+    interpreter.setSettings(dict(interpreter.settings, file_source="walker"))
+    self.assertEqual(
+      interpreter.findByValue("helloThing", project),
+      { "exports": { path.join("src", "a.js"): ["helloThing"] } }
+    )
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,94 @@
+import io, sys, unittest
+from unittest import mock
+
+from helpers import ProjectTestCase
+from lib.index import Stats, Walker
+
+class StatsTest(unittest.TestCase):
+  def setUp(self):
+    Stats.clear()
+
+  def tearDown(self):
+    Stats.clear()
+
+  def invoke(self, timings, counters=None, **finish_options):
+    Stats.start()
+    for phase, seconds in timings.items():
+      Stats.add(phase, seconds)
+    for name, amount in (counters or {}).items():
+      Stats.count(name, amount)
+    return Stats.finish({ "query": "a" }, **finish_options)
+
+  def getRow(self, kind, name):
+    for row in Stats.report()[kind]:
+      if row["name"] == name:
+        return row
+
+  def test_invocation(self):
+    Stats.start()
+    Stats.add("search", 0.5)
+    Stats.add("search", 0.25)
+    Stats.count("files_visited", 3)
+    Stats.count("files_visited")
+    with Stats.timer("insert"):
+      pass
+    Stats.mark("total")
+
+    invocation = Stats.finish({ "query": "a" })
+    self.assertEqual(invocation["tags"], { "query": "a" })
+    self.assertEqual(invocation["timings"]["search"], 0.75)
+    self.assertIn("insert", invocation["timings"])
+    self.assertIn("total", invocation["timings"])
+    self.assertEqual(invocation["counters"], { "files_visited": 4 })
+    # Nothing is recorded outside of an invocation
+    self.assertIsNone(Stats.finish())
+
+  def test_percentiles(self):
+    for seconds in range(1, 101):
+      self.invoke({ "search": seconds })
+    self.invoke({}, { "cache_hits": 2 })
+
+    self.assertEqual(Stats.report()["invocations"], 101)
+    search = self.getRow("timings", "search")
+    # Phases missing from an invocation count as 0
+    self.assertEqual(search["last"], 0)
+    self.assertEqual(search["samples"], Stats.HISTORY_SIZE)
+    self.assertEqual(search["p50"], 51)
+    self.assertEqual(search["p95"], 96)
+    self.assertEqual(self.getRow("counters", "cache_hits")["samples"], 1)
+
+  def test_history_size(self):
+    with mock.patch.object(Stats, "HISTORY_SIZE", 3):
+      Stats.clear()
+      for seconds in range(10):
+        self.invoke({ "search": seconds })
+    self.assertEqual(self.getRow("timings", "search")["samples"], 3)
+
+  def test_slow_queries(self):
+    stderr, sys.stderr = sys.stderr, io.StringIO()
+    try:
+      self.invoke({ "total": 0.1 }, slow_threshold=200)
+      self.invoke({ "total": 0.3, "search": 0.2 }, slow_threshold=200)
+      self.invoke({ "total": 0.5 })
+      output = sys.stderr.getvalue()
+    finally:
+      sys.stderr = stderr
+
+    slow = Stats.report()["slow"]
+    self.assertEqual([ item["timings"]["total"] for item in slow ], [0.3])
+    self.assertEqual(
+      output,
+      "SimpleImport: slow query 'a' in  (): total 300ms, search 200ms\n"
+    )
+
+class StatsCountersTest(ProjectTestCase):
+  def test_files_visited(self):
+    self.writeFile("src/a.js")
+    self.writeFile("src/b.js")
+    Stats.start()
+    list(Walker(self.project).walk())
+    self.assertEqual(Stats.finish()["counters"]["files_visited"], 3)
+    Stats.clear()
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+import helpers
+from lib.utils import applyEdits, orderEdits
+
+class OrderEditsTest(unittest.TestCase):
+  def test_from_the_end(self):
+    self.assertEqual(
+      list(orderEdits([[0, 1, "a"], [4, 6, "b"], [2, 2, "c"]], 10)),
+      [(4, 6, "b"), (2, 2, "c"), (0, 1, "a")]
+    )
+
+  def test_same_position_keeps_order(self):
+    self.assertEqual(
+      applyEdits("text", [[0, 0, "a"], [0, 0, "b"], [4, 4, "c"]]),
+      "abtextc"
+    )
+
+  def test_replacements(self):
+    self.assertEqual(
+      applyEdits("import a;\nrun();\n", [[0, 9, "import a, b;"], [17, 17, "done();\n"]]),
+      "import a, b;\nrun();\ndone();\n"
+    )
+
+  def test_overlapping_edits_are_skipped(self):
+    self.assertEqual(
+      list(orderEdits([[0, 5, "x"], [3, 8, "y"], [8, 20, "z"]], 10)),
+      [(3, 8, "y")]
+    )
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,51 @@
+import os, unittest
+from os import path
+
+from helpers import ProjectTestCase
+from lib.index import Walker
+
+class WalkerTest(ProjectTestCase):
+  def walk(self, **options):
+    return sorted(
+      path.join(relative_dir, filename)
+      for relative_dir, dirs, files in Walker(self.project, **options).walk()
+      for filename in files
+    )
+
+  def test_exclude_patterns_and_gitignore(self):
+    self.writeFile(".gitignore", "*.log\nbuild/\n")
+    self.writeFile("src/a.js")
+    self.writeFile("src/a.log")
+    self.writeFile("src/a.pyc")
+    self.writeFile("build/a.js")
+    self.writeFile("cache/a.js")
+    self.assertEqual(
+      self.walk(
+        ignored_paths=["cache"],
+        file_exclude_patterns=["*.pyc"],
+        use_gitignore=True
+      ),
+      [path.join(".", ".gitignore"), path.join("src", "a.js")]
+    )
+
+  @unittest.skipUnless(hasattr(os, "symlink"), "no symlinks")
+  def test_symlink_loops(self):
+    self.writeFile("a/a.js")
+    self.writeFile("b/b.js")
+    os.symlink(path.join("..", "b"), path.join(self.project, "a", "linkb"))
+    os.symlink(path.join("..", "a"), path.join(self.project, "b", "linka"))
+    os.symlink("..", path.join(self.project, "a", "up"))
+
+    self.assertEqual(self.walk(), [
+      path.join("a", "a.js"),
+      path.join("b", "b.js")
+    ])
+    self.assertEqual(self.walk(follow_symlinks=True), [
+      path.join("a", "a.js"),
+      path.join("a", "linkb", "b.js"),
+      path.join("b", "b.js"),
+      path.join("b", "linka", "a.js")
+    ])
+
+if __name__ == "__main__":
+  unittest.main()
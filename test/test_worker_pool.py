@@ -0,0 +1,81 @@
+import unittest
+from concurrent import futures
+from unittest import mock
+
+import helpers
+from lib.index import WorkerPool
+
+def double(item):
+  return item * 2
+
+class BrokenExecutor:
+  def __init__(self, workers):
+    pass
+
+  def submit(self, fn, *args):
+    future = futures.Future()
+    future.set_exception(OSError("no subprocesses"))
+    return future
+
+  def shutdown(self, wait=True):
+    pass
+
+def failToStart(workers):
+  raise OSError("no subprocesses")
+
+class WorkerPoolTest(unittest.TestCase):
+  ITEMS = list(range(100))
+  EXPECTED = [item * 2 for item in ITEMS]
+
+  def setUp(self):
+    WorkerPool.shutdown()
+    WorkerPool.broken.clear()
+
+  def tearDown(self):
+    WorkerPool.shutdown()
+    WorkerPool.broken.clear()
+
+  def map(self, pool):
+    return list(pool.map(double, self.ITEMS, batch_size=8))
+
+  def getThreadPool(self):
+    return WorkerPool.pools.get(("thread", 2))
+
+  def test_serial(self):
+    pool = WorkerPool.get(0, "process")
+    self.assertTrue(pool.isSerial())
+    self.assertEqual(self.map(pool), self.EXPECTED)
+
+  def test_threads_keep_order(self):
+    pool = WorkerPool.get(2)
+    self.assertEqual(self.map(pool), self.EXPECTED)
+    self.assertIsNotNone(pool.executor)
+
+  def test_threads_when_processes_can_not_start(self):
+    with mock.patch.object(futures, "ProcessPoolExecutor", failToStart):
+      pool = WorkerPool.get(2, "process")
+      self.assertEqual(self.map(pool), self.EXPECTED)
+
+    self.assertIn("process", WorkerPool.broken)
+    self.assertIsNotNone(self.getThreadPool().executor)
+
+  def test_threads_when_processes_fail(self):
+    with mock.patch.object(futures, "ProcessPoolExecutor", BrokenExecutor):
+      pool = WorkerPool.get(2, "process")
+      # The batches left run serially, the next calls in threads
+      self.assertEqual(self.map(pool), self.EXPECTED)
+      self.assertIsNone(self.getThreadPool())
+      self.assertEqual(self.map(pool), self.EXPECTED)
+
+    self.assertIn("process", WorkerPool.broken)
+    self.assertIsNotNone(self.getThreadPool().executor)
+
+  def test_serial_when_threads_fail(self):
+    with mock.patch.object(futures, "ThreadPoolExecutor", BrokenExecutor):
+      pool = WorkerPool.get(2, "thread")
+      self.assertEqual(self.map(pool), self.EXPECTED)
+      self.assertTrue(pool.isSerial())
+      self.assertEqual(self.map(pool), self.EXPECTED)
+
+if __name__ == "__main__":
+  unittest.main()